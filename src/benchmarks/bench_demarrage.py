@@ -0,0 +1,99 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Modules graphiques : aucun ne doit etre charge par le chemin sans rendu
+MODULES_GRAPHIQUES = ("PyQt5", "panda3d", "direct", "matplotlib", "seaborn")
+
+DOSSIER_SRC = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _modules_graphiques_charges() -> list:
+    return sorted({nom.split(".")[0] for nom in sys.modules} & set(MODULES_GRAPHIQUES))
+
+
+def mesurer_sans_rendu() -> dict:
+    """Import du chemin sans rendu puis premier pas de simulation, dans le processus courant."""
+    debut = time.perf_counter()
+    from simulation.sans_rendu import SimulateurSansRendu
+    import controle.controleur  # noqa: F401
+    import utiles.export  # noqa: F401
+    import_s = time.perf_counter() - debut
+
+    simulateur = SimulateurSansRendu()
+    simulateur.etape()
+    return {
+        "import_s": import_s,
+        "premiere_trame_s": time.perf_counter() - debut,
+        "modules_graphiques": _modules_graphiques_charges(),
+    }
+
+
+def mesurer_interface() -> dict:
+    """Import des modules graphiques puis fenetre complete jusqu'a la premiere trame Panda3D rendue."""
+    debut = time.perf_counter()
+    from PyQt5.QtWidgets import QApplication
+    from interface.fenetre import FenetrePrincipale
+    import main
+    import_s = time.perf_counter() - debut
+
+    app = QApplication([sys.argv[0]])
+    scene, simulateur = main.build_simulation()
+    fenetre = FenetrePrincipale(scene, simulateur)
+    fenetre.show()
+    app.processEvents()
+    scene.taskMgr.step()
+    premiere_trame_s = time.perf_counter() - debut
+
+    simulateur.arreter()
+    fenetre.close()
+    return {
+        "import_s": import_s,
+        "premiere_trame_s": premiere_trame_s,
+        "modules_graphiques": _modules_graphiques_charges(),
+    }
+
+
+CHEMINS = {"sans_rendu": mesurer_sans_rendu, "interface": mesurer_interface}
+
+
+def mesurer_processus_neuf(chemin: str) -> dict:
+    """Mesure `chemin` dans un interpreteur neuf (imports a froid) ; {"erreur": ...} s'il echoue."""
+    processus = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_demarrage", "--mesurer", chemin],
+        cwd=DOSSIER_SRC, capture_output=True, text=True
+    )
+    if processus.returncode != 0:
+        lignes = processus.stderr.strip().splitlines()
+        return {"erreur": lignes[-1] if lignes else f"code de sortie {processus.returncode}"}
+    return json.loads(processus.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Temps d'import et de premiere trame, sans rendu et avec interface.")
+    parser.add_argument("--repetitions", type=int, default=5, help="processus neufs par chemin (mediane)")
+    parser.add_argument("--mesurer", choices=tuple(CHEMINS), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # Processus fils : une mesure, en JSON sur la derniere ligne
+    if args.mesurer is not None:
+        print(json.dumps(CHEMINS[args.mesurer]()))
+        return
+
+    for chemin in CHEMINS:
+        mesures = [mesurer_processus_neuf(chemin) for _ in range(args.repetitions)]
+        if "erreur" in mesures[0]:
+            print(f"{chemin:<11} : indisponible ({mesures[0]['erreur']})")
+            continue
+        import_ms = 1e3 * statistics.median(m["import_s"] for m in mesures)
+        trame_ms = 1e3 * statistics.median(m["premiere_trame_s"] for m in mesures)
+        graphiques = ", ".join(mesures[0]["modules_graphiques"]) or "aucun"
+        print(f"{chemin:<11} : import {import_ms:7.1f} ms, premiere trame {trame_ms:7.1f} ms, modules graphiques : {graphiques}")
+
+
+if __name__ == "__main__":
+    main()
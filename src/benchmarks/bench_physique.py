@@ -0,0 +1,38 @@
+import argparse
+import time
+
+from simulation.physique import PhysiqueDrone
+from utiles.constantes import specifications_simulation as spec_sim
+
+
+def mesurer_pas_par_seconde(mode_noyau: bool, nb_pas: int, dt: float) -> float:
+    """Retourne le nombre de pas PhysiqueDrone.etape_simulation par seconde."""
+    physique = PhysiqueDrone(mode_noyau=mode_noyau)
+    vitesses = list(spec_sim["VITESSES_ROTATION_HELICES"])
+
+    # Echauffement
+    for _ in range(min(1000, nb_pas)):
+        physique.etape_simulation(vitesses, dt)
+
+    debut = time.perf_counter()
+    for _ in range(nb_pas):
+        physique.etape_simulation(vitesses, dt)
+    return nb_pas / (time.perf_counter() - debut)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare le pipeline historique et le noyau sans allocation.")
+    parser.add_argument("--pas", type=int, default=50_000, help="nombre de pas mesures")
+    parser.add_argument("--dt", type=float, default=spec_sim["PAS_FIXE"])
+    args = parser.parse_args()
+
+    historique = mesurer_pas_par_seconde(False, args.pas, args.dt)
+    noyau = mesurer_pas_par_seconde(True, args.pas, args.dt)
+
+    print(f"Pipeline historique : {historique:10.0f} pas/s")
+    print(f"Noyau sans allocation : {noyau:8.0f} pas/s")
+    print(f"Gain : x{noyau / historique:.2f}")
+
+
+if __name__ == "__main__":
+    main()
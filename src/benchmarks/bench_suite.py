@@ -0,0 +1,321 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import numpy as np
+
+from utiles.constantes import (
+    physique as phys,
+    specifications_simulation as spec_sim,
+    specifications_interface as spec_ui,
+    specifications_benchmarks as spec_bench
+)
+from utiles.memoire_tampon import MemoireTamponPid
+from utiles.transformations import matrice_rotation, matrices_rotation
+from controle.pid import PID, CoefficientsPID
+from controle.banc_pid import BancPID
+from controle.controleur import Controleur
+from controle.controleur_essaim import ControleurEssaim
+from simulation.physique import PhysiqueDrone
+from simulation.physique_essaim import PhysiqueEssaim
+from simulation.ordonnanceur import Ordonnanceur
+from simulation.sans_rendu import SimulateurSansRendu
+
+DOSSIER_SRC = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAS_PHYSIQUE: float = 1.0 / phys["FREQUENCE_PHYSIQUE"]
+PAS_CONTROLE: float = 1.0 / spec_sim["FREQUENCE_CONTROLE"]
+
+
+def mesurer_debit(appel: Callable[[], Any], duree_min: float) -> float:
+    """Appels par seconde de `appel`, mesures sur au moins `duree_min` secondes apres un appel d'echauffement."""
+    appel()
+    nb_appels = 1
+    while True:
+        debut = time.perf_counter()
+        for _ in range(nb_appels):
+            appel()
+        ecoule = time.perf_counter() - debut
+        if ecoule >= duree_min:
+            return nb_appels / ecoule
+        nb_appels *= 2 if ecoule < duree_min / 8 else max(2, int(np.ceil(duree_min / max(ecoule, 1e-9))))
+
+
+# ============================
+# Preparation des appels mesures
+# ============================
+# Chaque fonction construit l'etat de N drones et retourne l'appel a mesurer,
+# qui fait avancer les N drones d'un pas ; None si la variante ne s'applique pas a N.
+
+def _physique(mode_noyau: bool) -> Callable[[int], Callable[[], None]]:
+    def preparer(nb_drones: int) -> Callable[[], None]:
+        drones = [PhysiqueDrone(mode_noyau=mode_noyau) for _ in range(nb_drones)]
+        vitesses = list(spec_sim["VITESSES_ROTATION_HELICES"])
+
+        def appel() -> None:
+            for drone in drones:
+                drone.etape_simulation(vitesses, PAS_PHYSIQUE)
+        return appel
+    return preparer
+
+
+def _physique_essaim(nb_drones: int) -> Callable[[], None]:
+    essaim = PhysiqueEssaim(nb_drones)
+    vitesses = np.tile(np.asarray(spec_sim["VITESSES_ROTATION_HELICES"], dtype=float), (nb_drones, 1))
+    return lambda: essaim.etape_simulation(vitesses, PAS_PHYSIQUE)
+
+
+def _pid(nb_drones: int) -> Callable[[], None]:
+    pids = [PID(CoefficientsPID(**spec_sim["PID"]["Z"]), consigne=spec_sim["CONSIGNE"][2]) for _ in range(nb_drones)]
+    mesure = float(phys["POSITION_INITIALE"][2])
+
+    def appel() -> None:
+        for pid in pids:
+            pid(mesure, PAS_CONTROLE)
+    return appel
+
+
+def _banc_pid(nb_drones: int) -> Callable[[], None]:
+    pid = PID(CoefficientsPID(**spec_sim["PID"]["Z"]), consigne=spec_sim["CONSIGNE"][2])
+    banc = BancPID.depuis_pids([pid], nb_drones)
+    mesures = np.full((nb_drones, 1), float(phys["POSITION_INITIALE"][2]))
+    return lambda: banc(mesures, PAS_CONTROLE)
+
+
+def _controleur(nb_drones: int) -> Callable[[], None]:
+    controleurs = [Controleur(spec_sim["CONSIGNE"], CoefficientsPID(**spec_sim["PID"]["Z"])) for _ in range(nb_drones)]
+    position = np.asarray(phys["POSITION_INITIALE"], dtype=float)
+    orientation = np.zeros(3)
+    vitesses = list(spec_sim["VITESSES_ROTATION_HELICES"])
+    forces = [False] * 4
+
+    def appel() -> None:
+        for controleur in controleurs:
+            controleur.appliquer_controle(
+                altitude_mesuree=float(position[2]),
+                orientation_rpy=orientation,
+                position_xyz=position,
+                dt=PAS_CONTROLE,
+                pid_actif=True,
+                moteurs_forces_utilisateur=forces,
+                vitesses_angulaires_actuelles=vitesses,
+            )
+    return appel
+
+
+def _controleur_essaim(nb_drones: int) -> Callable[[], None]:
+    controleur = ControleurEssaim(nb_drones)
+    positions = np.tile(np.asarray(phys["POSITION_INITIALE"], dtype=float), (nb_drones, 1))
+    controleur.reinitialiser(positions)
+    vitesses = np.tile(np.asarray(spec_sim["VITESSES_ROTATION_HELICES"], dtype=float), (nb_drones, 1))
+    forces = np.zeros((nb_drones, 4), dtype=bool)
+    return lambda: controleur.appliquer_controle(positions, PAS_CONTROLE, True, forces, vitesses)
+
+
+def _memoire_ajouter(nb_drones: int) -> Optional[Callable[[], None]]:
+    if nb_drones != 1:
+        return None
+    memoire = MemoireTamponPid(spec_ui["GRAPHIQUE_FENETRE_MEMOIRE_S"])
+    compteur = [0]
+
+    def appel() -> None:
+        compteur[0] += 1
+        memoire.ajouter(compteur[0] * PAS_CONTROLE, 1.0, 0.5, 0.1, 2.2, 2.0)
+    return appel
+
+
+def _memoire_lire(nb_drones: int) -> Optional[Callable[[], None]]:
+    """Lecture d'une fenetre pleine, echantillonnee a la frequence de controle."""
+    if nb_drones != 1:
+        return None
+    fenetre = float(spec_ui["GRAPHIQUE_FENETRE_MEMOIRE_S"])
+    memoire = MemoireTamponPid(fenetre)
+    for k in range(int(fenetre / PAS_CONTROLE)):
+        memoire.ajouter(k * PAS_CONTROLE, 1.0, 0.5, 0.1, 2.2, 2.0)
+    return memoire.lire_series
+
+
+def _matrice_rotation(nb_drones: int) -> Callable[[], None]:
+    angles = np.random.default_rng(0).uniform(-0.3, 0.3, (nb_drones, 3))
+
+    def appel() -> None:
+        for a in angles:
+            matrice_rotation(a)
+    return appel
+
+
+def _matrices_rotation(nb_drones: int) -> Callable[[], None]:
+    angles = np.random.default_rng(0).uniform(-0.3, 0.3, (nb_drones, 3))
+    sortie = np.empty((nb_drones, 3, 3))
+    return lambda: matrices_rotation(angles, out=sortie)
+
+
+def _bout_en_bout(nb_drones: int) -> Optional[Callable[[], None]]:
+    """Une periode de controle simulee : SimulateurSansRendu ordonnance, comme le fil de simulation."""
+    if nb_drones != 1:
+        return None
+    simulateur = SimulateurSansRendu(ordonnanceur=Ordonnanceur())
+    return lambda: simulateur.avancer(PAS_CONTROLE)
+
+
+def _bout_en_bout_pas_fixe(nb_drones: int) -> Optional[Callable[[], None]]:
+    """Une periode de controle simulee : SimulateurSansRendu a un pas physique par PAS_FIXE, comme main.py --headless."""
+    if nb_drones != 1:
+        return None
+    frequence = 1.0 / spec_sim["PAS_FIXE"]
+    simulateur = SimulateurSansRendu(ordonnanceur=Ordonnanceur(frequence, frequence))
+    return lambda: simulateur.avancer(PAS_CONTROLE)
+
+
+def _bout_en_bout_essaim(nb_drones: int) -> Callable[[], None]:
+    """Une periode de controle simulee : ControleurEssaim puis PhysiqueEssaim aux cadences de l'ordonnanceur."""
+    ordonnanceur = Ordonnanceur()
+    essaim = PhysiqueEssaim(nb_drones)
+    controleur = ControleurEssaim(nb_drones)
+    controleur.reinitialiser(essaim.position_xyz)
+    forces = np.zeros((nb_drones, 4), dtype=bool)
+    etat = {"vitesses": essaim.vitesses_helices_reelles.copy()}
+
+    def controle(dt: float) -> None:
+        etat["vitesses"], _ = controleur.appliquer_controle(essaim.position_xyz, dt, True, forces, etat["vitesses"])
+
+    def physique(dt: float) -> None:
+        essaim.etape_simulation(etat["vitesses"], dt)
+
+    return lambda: ordonnanceur.avancer(PAS_CONTROLE, controle, physique)
+
+
+# Banc -> variante -> preparation ; `unite` decrit ce que compte un appel
+BANCS: Dict[str, Dict[str, Any]] = {
+    "physique.etape_simulation": {
+        "unite": "pas/s",
+        "variantes": {"historique": _physique(False), "noyau": _physique(True), "essaim": _physique_essaim},
+    },
+    "pid.__call__": {
+        "unite": "appels/s",
+        "variantes": {"PID": _pid, "BancPID": _banc_pid},
+    },
+    "controleur.appliquer_controle": {
+        "unite": "appels/s",
+        "variantes": {"Controleur": _controleur, "ControleurEssaim": _controleur_essaim},
+    },
+    "memoire_tampon.ajouter": {
+        "unite": "appels/s",
+        "variantes": {"MemoireTamponPid": _memoire_ajouter},
+    },
+    "memoire_tampon.lire_series": {
+        "unite": "appels/s",
+        "variantes": {"MemoireTamponPid": _memoire_lire},
+    },
+    "transformations.matrice_rotation": {
+        "unite": "appels/s",
+        "variantes": {"matrice_rotation": _matrice_rotation, "matrices_rotation": _matrices_rotation},
+    },
+    "bout_en_bout.sans_rendu": {
+        "unite": "s simulees/s",
+        "echelle": PAS_CONTROLE,  # un appel = une periode de controle simulee
+        "variantes": {"SimulateurSansRendu": _bout_en_bout, "pas_fixe": _bout_en_bout_pas_fixe, "essaim": _bout_en_bout_essaim},
+    },
+}
+
+
+# ============================
+# Execution et rapport
+# ============================
+
+def informations_machine() -> Dict[str, Any]:
+    """Description de la machine et du code mesure, pour comparer des executions dans le temps."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=DOSSIER_SRC, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "plateforme": platform.platform(),
+        "processeur": platform.processor() or platform.machine(),
+        "nb_coeurs": os.cpu_count(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "numpy": np.__version__,
+    }
+
+
+def executer_bancs(
+    noms: Sequence[str],
+    nb_drones: Sequence[int] = spec_bench["NB_DRONES"],
+    duree_min: float = spec_bench["DUREE_MESURE"]
+) -> List[Dict[str, Any]]:
+    """Mesure chaque variante des bancs `noms` pour chaque nombre de drones ; une ligne par mesure."""
+    lignes = []
+    for nom in noms:
+        banc = BANCS[nom]
+        for variante, preparer in banc["variantes"].items():
+            for n in nb_drones:
+                appel = preparer(n)
+                if appel is None:
+                    continue
+                appels_par_s = mesurer_debit(appel, duree_min)
+                ligne = {
+                    "banc": nom,
+                    "variante": variante,
+                    "nb_drones": n,
+                    "unite": banc["unite"],
+                    "valeur": appels_par_s * banc.get("echelle", 1.0),
+                    "debit_drones": appels_par_s * banc.get("echelle", 1.0) * n,  # valeur cumulee sur les N drones
+                    "latence_us": 1e6 / appels_par_s,
+                }
+                lignes.append(ligne)
+                print(
+                    f"{nom:<33} {variante:<19} N = {n:<5} {ligne['valeur']:>12.4g} {banc['unite']:<13}"
+                    f" ({ligne['debit_drones']:.4g} x N drones, {ligne['latence_us']:.4g} us par appel)"
+                )
+    return lignes
+
+
+def comparer(lignes: List[Dict[str, Any]], chemin_reference: str) -> None:
+    """Affiche le rapport valeur / valeur de reference pour les mesures presentes dans les deux executions."""
+    with open(chemin_reference, "r", encoding="utf-8") as f:
+        reference = json.load(f)
+    anciennes = {(l["banc"], l["variante"], l["nb_drones"]): l["valeur"] for l in reference["resultats"]}
+    print(f"\nComparaison avec {chemin_reference} (commit {reference['machine'].get('commit')}) :")
+    for ligne in lignes:
+        ancienne = anciennes.get((ligne["banc"], ligne["variante"], ligne["nb_drones"]))
+        if ancienne:
+            print(f"{ligne['banc']:<33} {ligne['variante']:<19} N = {ligne['nb_drones']:<5} x{ligne['valeur'] / ancienne:.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Debit des chemins critiques a 1, 10, 100 et 1000 drones, resultats en JSON.")
+    parser.add_argument("--bancs", nargs="+", choices=tuple(BANCS), default=list(BANCS), help="bancs a executer (tous par defaut)")
+    parser.add_argument("--drones", nargs="+", type=int, default=list(spec_bench["NB_DRONES"]))
+    parser.add_argument("--duree", type=float, default=spec_bench["DUREE_MESURE"], help="duree minimale de chaque mesure (s)")
+    parser.add_argument("--sortie", default=None, help="fichier JSON (par defaut DOSSIER_SORTIE/bench_<date>.json)")
+    parser.add_argument("--comparer", default=None, help="fichier JSON d'une execution precedente")
+    args = parser.parse_args()
+
+    machine = informations_machine()
+    print(f"{machine['processeur']}, {machine['nb_coeurs']} coeurs, Python {machine['python']}, NumPy {machine['numpy']}, commit {machine['commit']}")
+    lignes = executer_bancs(args.bancs, args.drones, args.duree)
+
+    chemin = args.sortie
+    if chemin is None:
+        horodatage = machine["date"].replace("-", "").replace(":", "").replace("T", "_")
+        chemin = os.path.join(spec_bench["DOSSIER_SORTIE"], f"bench_{horodatage}.json")
+    os.makedirs(os.path.dirname(chemin) or ".", exist_ok=True)
+    with open(chemin, "w", encoding="utf-8") as f:
+        json.dump({"machine": machine, "parametres": {"duree_mesure": args.duree}, "resultats": lignes}, f, indent=2)
+    print(f"Resultats ecrits dans {chemin}")
+
+    if args.comparer is not None:
+        comparer(lignes, args.comparer)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+from typing import Optional, Sequence, Union
+import numpy as np
+from controle.pid import PID, CoefficientsPID
+
+
+# Bornes appliquees par PID.__call__ : chaque terme, puis la somme
+BORNE_TERME: float = 100.0
+BORNE_SORTIE: float = 30.0
+# En dessous de ce pas, PID.__call__ ignore le terme derive
+DT_MIN_DERIVEE: float = 1e-2
+
+Indices = Union[slice, np.ndarray]
+
+
+class BancPID:
+    """N x K PID (N drones, K boucles) evalues en un seul appel vectorise.
+
+    Gains, limites, integrales et memoires sont des tableaux (N, K). Les semantiques
+    sont exactement celles de PID.__call__ : integrale bornee (anti-windup), derivee
+    sur la mesure ou sur l'erreur, nulle au premier appel et pour dt <= 0.01 s,
+    termes bornes a +-BORNE_TERME puis somme bornee a +-BORNE_SORTIE.
+    """
+
+    def __init__(
+        self,
+        coefficients: Sequence[CoefficientsPID],
+        consignes: Sequence[float],
+        limites_integrale: Sequence[tuple],
+        derivee_sur_mesure: Sequence[bool],
+        nb_drones: int = 1
+    ) -> None:
+        """Initialise K boucles, identiques pour les N drones (modifiables ensuite drone par drone)."""
+        self.nb_drones: int = int(nb_drones)
+        self.nb_boucles: int = len(coefficients)
+        forme = (self.nb_drones, self.nb_boucles)
+
+        def tableau(valeurs) -> np.ndarray:
+            t = np.empty(forme)
+            t[:] = np.asarray(valeurs, dtype=float)
+            return t
+
+        # Parametres
+        self.kp: np.ndarray = tableau([c.proportionnel for c in coefficients])
+        self.ki: np.ndarray = tableau([c.integral for c in coefficients])
+        self.kd: np.ndarray = tableau([c.derive for c in coefficients])
+        self.integrale_min: np.ndarray = tableau([-np.inf if b is None else b for b, _ in limites_integrale])
+        self.integrale_max: np.ndarray = tableau([np.inf if b is None else b for _, b in limites_integrale])
+        self.derivee_sur_mesure: np.ndarray = np.empty(forme, dtype=bool)
+        self.derivee_sur_mesure[:] = np.asarray(derivee_sur_mesure, dtype=bool)
+
+        # Etat
+        self.consigne: np.ndarray = tableau(consignes)
+        self.integrale: np.ndarray = np.zeros(forme)
+        self.erreur_precedente: np.ndarray = np.zeros(forme)
+        self.mesure_precedente: np.ndarray = np.zeros(forme)
+        self.initialise: np.ndarray = np.zeros(forme, dtype=bool)  # False : mesure_precedente inconnue
+
+        # Sauvegarde : termes P, I, D (N, K, 3) et sorties (N, K) du dernier appel
+        self.derniers_termes: np.ndarray = np.zeros(forme + (3,))
+        self.sorties: np.ndarray = np.zeros(forme)
+
+    @classmethod
+    def depuis_pids(cls, pids: Sequence[PID], nb_drones: int = 1) -> "BancPID":
+        """Construit un banc dont la boucle k reprend la configuration et l'etat de pids[k], pour chaque drone."""
+        banc = cls(
+            [pid.coeff for pid in pids],
+            [pid.consigne for pid in pids],
+            [(pid.integrale_min, pid.integrale_max) for pid in pids],
+            [pid.derivee_sur_mesure for pid in pids],
+            nb_drones
+        )
+        for k, pid in enumerate(pids):
+            banc.integrale[:, k] = pid.integrale
+            banc.erreur_precedente[:, k] = pid.erreur_precedente
+            if pid.mesure_precedente is not None:
+                banc.mesure_precedente[:, k] = pid.mesure_precedente
+                banc.initialise[:, k] = True
+        return banc
+
+    def reinitialiser(self, valeurs_initiales, drones: Indices = slice(None), boucles: Indices = slice(None)) -> None:
+        """Equivalent de PID.reinitialiser pour les drones et boucles selectionnes."""
+        selection = np.ix_(np.arange(self.nb_drones)[drones], np.arange(self.nb_boucles)[boucles])
+        self.erreur_precedente[selection] = self.consigne[selection] - valeurs_initiales
+        self.mesure_precedente[selection] = valeurs_initiales
+        self.integrale[selection] = 0.0
+        self.initialise[selection] = True
+
+    def __call__(
+        self,
+        mesures,
+        dt: float,
+        boucles: slice = slice(None),
+        actifs: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Met a jour les boucles `boucles` de tous les drones et retourne leurs sorties (N, k).
+
+        mesures : (N, k), ou diffusable vers cette forme.
+        actifs : booleens (N, k) ; une boucle inactive garde son etat et sort 0,
+        comme un PID qui n'est pas appele.
+        """
+        consigne = self.consigne[:, boucles]
+        mesures = np.broadcast_to(np.asarray(mesures, dtype=float), consigne.shape)
+        erreur = consigne - mesures
+
+        # Terme integral, borne
+        integrale = self.integrale[:, boucles] + erreur * dt
+        np.maximum(integrale, self.integrale_min[:, boucles], out=integrale)
+        np.minimum(integrale, self.integrale_max[:, boucles], out=integrale)
+
+        # Terme derive, sur la mesure ou sur l'erreur
+        if dt <= DT_MIN_DERIVEE:
+            derivee = np.zeros_like(erreur)
+        else:
+            derivee = np.where(
+                self.derivee_sur_mesure[:, boucles],
+                -(mesures - self.mesure_precedente[:, boucles]) / dt,
+                (erreur - self.erreur_precedente[:, boucles]) / dt
+            )
+            derivee[~self.initialise[:, boucles]] = 0.0
+
+        # Termes bornes puis sortie bornee
+        termes = self.derniers_termes[:, boucles]
+        np.clip(self.kp[:, boucles] * erreur, -BORNE_TERME, BORNE_TERME, out=termes[..., 0])
+        np.clip(self.ki[:, boucles] * integrale, -BORNE_TERME, BORNE_TERME, out=termes[..., 1])
+        np.clip(self.kd[:, boucles] * derivee, -BORNE_TERME, BORNE_TERME, out=termes[..., 2])
+        sorties = self.sorties[:, boucles]
+        np.clip(termes[..., 0] + termes[..., 1] + termes[..., 2], -BORNE_SORTIE, BORNE_SORTIE, out=sorties)
+
+        # Mise a jour de l'etat
+        if actifs is None:
+            self.integrale[:, boucles] = integrale
+            self.erreur_precedente[:, boucles] = erreur
+            self.mesure_precedente[:, boucles] = mesures
+            self.initialise[:, boucles] = True
+        else:
+            actifs = np.broadcast_to(actifs, consigne.shape)
+            np.copyto(self.integrale[:, boucles], integrale, where=actifs)
+            np.copyto(self.erreur_precedente[:, boucles], erreur, where=actifs)
+            np.copyto(self.mesure_precedente[:, boucles], mesures, where=actifs)
+            self.initialise[:, boucles] |= actifs
+            termes[~actifs] = 0.0
+            sorties[~actifs] = 0.0
+
+        return sorties.copy()
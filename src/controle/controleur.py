@@ -1,22 +1,32 @@
 import math
 import numpy as np
-from typing import List, Tuple
-from utiles.constantes import physique as phys, specifications_drone as spec_drone
+from typing import Dict, List, Optional, Tuple
+from utiles.constantes import specifications_simulation as spec_sim
+from utiles.export import ecrire_lignes_csv
+from utiles.parametres import GRAVITE, ParametresDrone
 from controle.pid import PID, CoefficientsPID
 
 
 class Controleur:
     """Controle l'altitude via feedforward (mg) + PID (correction en Newton)."""
 
-    def __init__(self, consigne: float, coefficients: CoefficientsPID) -> None:
-        """Initialise le PID, les limites, et les constantes physiques du drone."""
-        self.masse: float = phys["MASSE"]
-        self.g: float = 9.81
-        self.factor_poussee: float = phys["POUSSEE"]
-        self.nb_helices: int = spec_drone["NB_HELICES"]
+    def __init__(self, consigne: float, coefficients: CoefficientsPID, parametres: Optional[ParametresDrone] = None) -> None:
+        """Initialise le PID, les limites, et les constantes physiques du drone (modele du controleur).
 
-        self.vmin: float = phys["VITESSE_HELICE_MIN"]
-        self.vmax: float = phys["VITESSE_HELICE_MAX"]
+        parametres : ParametresDrone que le controleur croit piloter ; ceux des constantes par defaut.
+        """
+        parametres = parametres if parametres is not None else ParametresDrone()
+        self.masse: float = parametres.masse
+        self.g: float = GRAVITE
+        self.factor_poussee: float = parametres.poussee
+        self.nb_helices: int = len(parametres.sens_helices)
+
+        self.vmin: float = parametres.vitesse_helice_min
+        self.vmax: float = parametres.vitesse_helice_max
+
+        # Mixage : (u_t, L, M, N) -> vitesses des helices, et gain des moments d'attitude
+        self.matrice_mixage: np.ndarray = parametres.matrice_mixage
+        self.k_att: float = spec_sim["GAIN_MIXAGE_ATTITUDE"]
 
         # Limites du PID pour Z (en Newton)
         limite_sortie = 0.6 * self.masse * self.g
@@ -33,11 +43,7 @@ class Controleur:
         )
 
         # PID position pour x et y (m -> rad)
-        coefficients_position = CoefficientsPID(
-            proportionnel=1,
-            integral=0.03,
-            derive=0.3
-        )
+        coefficients_position = CoefficientsPID(**spec_sim["PID"]["POSITION"])
 
         self.pid_pos_x = PID(
             coefficients_position,
@@ -56,11 +62,7 @@ class Controleur:
         )
 
         # PID attitude pour roll/pitch (rad -> moment)
-        coefficients_attitude = CoefficientsPID(
-            proportionnel=1.2,
-            integral=0.0,
-            derive=0.05
-        )
+        coefficients_attitude = CoefficientsPID(**spec_sim["PID"]["ATTITUDE"])
 
         self.pid_att_pitch = PID(
             coefficients_attitude,
@@ -89,9 +91,43 @@ class Controleur:
         self.pid_pos_y.reinitialiser(position_initiale[1])
         self.pid_z.reinitialiser(position_initiale[2])
 
+    def fixer_consigne(self, consigne: List[float]) -> None:
+        """Change la consigne de position (x, y, z) des PID position et altitude."""
+        self.pid_pos_x.consigne = float(consigne[0])
+        self.pid_pos_y.consigne = float(consigne[1])
+        self.pid_z.consigne = float(consigne[2])
+
+    def pids(self) -> Dict[str, PID]:
+        """Retourne les PID du controleur, par nom d'attribut."""
+        return {
+            "pid_z": self.pid_z,
+            "pid_pos_x": self.pid_pos_x,
+            "pid_pos_y": self.pid_pos_y,
+            "pid_att_pitch": self.pid_att_pitch,
+            "pid_att_roll": self.pid_att_roll,
+        }
+
+    def activer_traces(self, capacite: int = spec_sim["TRACE_PID_CAPACITE"]) -> None:
+        """Active la trace de chaque PID (tampon circulaire de `capacite` appels)."""
+        for pid in self.pids().values():
+            pid.activer_trace(capacite)
+
+    def desactiver_traces(self) -> None:
+        """Desactive la trace de chaque PID."""
+        for pid in self.pids().values():
+            pid.desactiver_trace()
+
+    def exporter_traces(self, chemin_dossier: str) -> List[str]:
+        """Ecrit la trace de chaque PID active dans <chemin_dossier>/<nom du pid>.csv."""
+        chemins = []
+        for nom, pid in self.pids().items():
+            if pid.trace is not None:
+                chemins.append(ecrire_lignes_csv(chemin_dossier, f"{nom}.csv", pid.trace.lignes()))
+        return chemins
+
     def _mixeur_quad(self, u_t: float, L: float, M: float, N: float) -> Tuple[float, float, float, float]:
         """
-        Mixeur reproduisant exactement l'ancien comportement :
+        Mixeur par matrice_mixage (ParametresDrone) :
         0 : arriere
         1 : gauche
         2 : avant
@@ -102,12 +138,7 @@ class Controleur:
         M   = corr_pitch  (rad/s)
         N   = corr_yaw (pour l'instant 0)
         """
-
-        u0 = u_t - M + N      # arriere
-        u1 = u_t + L - N      # gauche
-        u2 = u_t + M + N      # avant
-        u3 = u_t - L - N      # droite
-
+        u0, u1, u2, u3 = (self.matrice_mixage @ np.array([u_t, L, M, N])).tolist()
         return u0, u1, u2, u3
 
     def _stabiliser_attitude(self, orientation_rpy: np.ndarray) -> Tuple[float, float]:
@@ -181,9 +212,8 @@ class Controleur:
         moment_L = self.pid_att_roll(angle_mesure_y, dt)
 
         # gain faible pour eviter des valeurs trop violentes
-        k_att: float = 0.03
-        L: float = -k_att * moment_L
-        M: float = -k_att * moment_M
+        L: float = -self.k_att * moment_L
+        M: float = -self.k_att * moment_M
         N: float = 0.0
 
         # --- 3. Mixage quad ---
@@ -0,0 +1,87 @@
+from typing import Optional, Tuple, Union
+import numpy as np
+from utiles.constantes import specifications_simulation as spec_sim
+from controle.pid import CoefficientsPID
+from controle.banc_pid import BancPID
+from controle.controleur import Controleur
+
+
+# Colonnes du banc de PID
+Z, POS_X, POS_Y, ATT_PITCH, ATT_ROLL = range(5)
+
+
+class ControleurEssaim:
+    """Loi de commande de Controleur appliquee a N drones, avec un BancPID de 5 boucles.
+
+    La cascade demande deux appels au banc : altitude et position d'abord,
+    puis attitude, dont les consignes sont les sorties des PID position.
+    """
+
+    def __init__(self, nb_drones: int, controleur: Optional[Controleur] = None) -> None:
+        """Reprend gains, limites et constantes de `controleur` (un Controleur par defaut) pour chaque drone."""
+        if controleur is None:
+            controleur = Controleur(spec_sim["CONSIGNE"], CoefficientsPID(**spec_sim["PID"]["Z"]))
+
+        self.nb_drones: int = int(nb_drones)
+        self.banc: BancPID = BancPID.depuis_pids(
+            [controleur.pid_z, controleur.pid_pos_x, controleur.pid_pos_y, controleur.pid_att_pitch, controleur.pid_att_roll],
+            self.nb_drones
+        )
+        self.masse: float = controleur.masse
+        self.g: float = controleur.g
+        self.factor_poussee: float = controleur.factor_poussee
+        self.nb_helices: int = controleur.nb_helices
+        self.vmin: float = controleur.vmin
+        self.vmax: float = controleur.vmax
+        self.k_att: float = controleur.k_att
+        self.matrice_mixage: np.ndarray = controleur.matrice_mixage
+
+    def reinitialiser(self, positions_initiales: np.ndarray, drones: Union[slice, np.ndarray] = slice(None)) -> None:
+        """Reinitialise les PID altitude et position des drones selectionnes."""
+        positions = np.asarray(positions_initiales, dtype=float).reshape(-1, 3)
+        self.banc.reinitialiser(positions[:, [2, 0, 1]], drones=drones, boucles=slice(Z, POS_Y + 1))
+
+    def appliquer_controle(
+        self,
+        position_xyz: np.ndarray,
+        dt: float,
+        pid_actif: Union[bool, np.ndarray],
+        moteurs_forces_utilisateur: np.ndarray,
+        vitesses_angulaires_actuelles: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Retourne les vitesses moteur (N, 4) et les termes P, I, D du PID altitude (N, 3)."""
+        banc = self.banc
+        actuelles = np.asarray(vitesses_angulaires_actuelles, dtype=float)
+        pid_actif = np.broadcast_to(np.asarray(pid_actif, dtype=bool), (self.nb_drones,))
+
+        # 1. Altitude et position (le PID altitude n'avance que si le PID est actif)
+        actifs = np.ones((self.nb_drones, 3), dtype=bool)
+        actifs[:, 0] = pid_actif
+        sorties = banc(position_xyz[:, [2, 0, 1]], dt, slice(Z, POS_Y + 1), actifs)
+
+        f_total = np.maximum(0.0, self.masse * self.g + sorties[:, Z])
+        if self.factor_poussee > 0.0:
+            vitesse_commune = np.sqrt(f_total / float(self.nb_helices) / self.factor_poussee)
+        else:
+            vitesse_commune = np.zeros(self.nb_drones)
+        np.clip(vitesse_commune, self.vmin, self.vmax, out=vitesse_commune)
+        u_t = np.where(pid_actif, vitesse_commune, actuelles.sum(axis=1) / 4.0)
+
+        # 2. Attitude : consignes = angles cibles, mesures nulles comme dans Controleur
+        banc.consigne[:, ATT_PITCH] = sorties[:, POS_X]
+        banc.consigne[:, ATT_ROLL] = sorties[:, POS_Y]
+        moments = banc(0.0, dt, slice(ATT_PITCH, ATT_ROLL + 1))
+        M = -self.k_att * moments[:, 0]
+        L = -self.k_att * moments[:, 1]
+
+        # 3. Mixage quad (0 arriere, 1 gauche, 2 avant, 3 droite) : (u_t, L, M, N = 0) -> vitesses
+        commandes = np.zeros((self.nb_drones, 4))
+        commandes[:, 0] = u_t
+        commandes[:, 1] = L
+        commandes[:, 2] = M
+        vitesses = commandes @ self.matrice_mixage.T
+        np.clip(vitesses, self.vmin, self.vmax, out=vitesses)
+
+        # 4. Moteurs forces par l'utilisateur
+        vitesses = np.where(moteurs_forces_utilisateur, actuelles, vitesses)
+        return vitesses, banc.derniers_termes[:, Z].copy()
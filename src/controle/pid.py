@@ -1,5 +1,7 @@
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
+import numpy as np
+from utiles.memoire_tampon import TamponCirculaire
 
 
 @dataclass
@@ -36,6 +38,10 @@ class PID:
         # Sauvegarde
         self.derniers_termes: Tuple[float, float, float] = (0.0, 0.0, 0.0)
 
+        # Trace optionnelle des derniers appels (None = desactivee, aucun cout)
+        self.trace: Optional[TamponCirculaire] = None
+        self.t_trace: float = 0.0  # temps simule cumule (somme des dt) depuis l'activation
+
     def reinitialiser(self, valeur_initiale: float = 0.0) -> None:
         """Reinitialise l'etat interne du PID a partir d'une valeur initiale."""
         self.erreur_precedente = self.consigne - valeur_initiale
@@ -45,7 +51,6 @@ class PID:
     def __call__(self, mesure: float, dt: float) -> float:
         """Calcule la sortie PID pour une mesure et un pas de temps donnes."""
         erreur = self.consigne - mesure
-        print(f"Erreur : {erreur} = {self.consigne} (consigne) - {mesure} (mesure)")
 
         # Terme integral (avec saturation anti‑windup simple)
         self.integrale += erreur * dt
@@ -88,13 +93,28 @@ class PID:
         sortie = terme_p + terme_i + terme_d
         # borne derivee pour eviter les pics
         sortie = max(-30.0, min(30.0, sortie))
-        print("Sortie PID : ", sortie, " = ", terme_p, " + ", terme_i, " + ", terme_d, "\n")
 
         # Sauvegarde pour l'interface
         self.derniers_termes = (terme_p, terme_i, terme_d)
+        if self.trace is not None:
+            self.t_trace += dt
+            self.trace.ajouter(self.t_trace, erreur, terme_p, terme_i, terme_d, sortie)
 
         return sortie
     
     def lire_derniers_termes(self) -> Tuple[float, float, float]:
         """Retourne les derniers termes P, I, D."""
-        return self.derniers_termes
\ No newline at end of file
+        return self.derniers_termes
+
+    def activer_trace(self, capacite: int) -> None:
+        """Enregistre temps simule, erreur, P, I, D et sortie des `capacite` derniers appels."""
+        self.trace = TamponCirculaire(capacite, ("t", "erreur", "p", "i", "d", "sortie"))
+        self.t_trace = 0.0
+
+    def desactiver_trace(self) -> None:
+        """Arrete l'enregistrement et libere le tampon."""
+        self.trace = None
+
+    def lire_trace(self) -> Dict[str, np.ndarray]:
+        """Retourne la trace, de l'appel le plus ancien au plus recent (vide si desactivee)."""
+        return self.trace.lire() if self.trace is not None else {}
\ No newline at end of file
@@ -4,8 +4,13 @@ from pathlib import Path
 from PyQt5.QtCore import QSize, QTimer, Qt
 from PyQt5.QtWidgets import QHBoxLayout, QPushButton, QWidget, QVBoxLayout, QGridLayout, QGroupBox, QSizePolicy
 
-from interface.widgets import GrapheAltitude, GraphePid, WidgetPanda, BoutonPid, CurseurCamera, JaugeAltitude, ZoneControleMoteurs
-from utiles.constantes import specifications_interface as spec_int, physique as phys
+from interface.widgets import GrapheAltitude, GraphePid, WidgetPanda, BoutonPid, CurseurCamera, JaugeAltitude, PanneauProfilage, SelecteurEchelleTemps, ZoneControleMoteurs
+from utiles.constantes import (
+    specifications_interface as spec_int,
+    specifications_simulation as spec_sim,
+    specifications_profileur as spec_prof,
+    physique as phys
+)
 
 class FenetrePrincipale(QWidget):
     """Fenetre principale de l'interface."""
@@ -31,10 +36,10 @@ class FenetrePrincipale(QWidget):
 
         # Connexions
         self.bouton_pid.clicked.connect(self._basculer_pid)  # type: ignore[arg-type]
-        # self.simulateur.altitude_changee.connect(self.jauge_altitude.mettre_a_jour)  # type: ignore[attr-defined]
-        self.simulateur.pid_mis_a_jour.connect(self.graphe_altitude.recevoir_pid)  # type: ignore[attr-defined]
-        self.simulateur.pid_mis_a_jour.connect(self.graphe_pid.recevoir_pid)  # type: ignore[attr-defined]
-        self.simulateur.vitesses_moteurs_mises_a_jour.connect(self.zone_controle_moteurs.mettre_a_jour_affichage_moteurs)
+        # self.simulateur.telemetrie_publiee.connect(self.jauge_altitude.recevoir_telemetrie)  # type: ignore[attr-defined]
+        self.simulateur.telemetrie_publiee.connect(self.graphe_altitude.recevoir_telemetrie)  # type: ignore[attr-defined]
+        self.simulateur.telemetrie_publiee.connect(self.graphe_pid.recevoir_telemetrie)  # type: ignore[attr-defined]
+        self.simulateur.telemetrie_publiee.connect(self.zone_controle_moteurs.recevoir_telemetrie)  # type: ignore[attr-defined]
         
         # Style
         self._charger_style_qss(chemin_style)
@@ -91,7 +96,7 @@ class FenetrePrincipale(QWidget):
 
     def _creer_zone_3d(self, scene: Any) -> None:
         """Zone gauche: rendu panda3d dans un widget Qt."""
-        self.widget_3d = WidgetPanda(scene, self)
+        self.widget_3d = WidgetPanda(scene, self, horloge=self.simulateur.horloge)
         self.widget_3d.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
 
     def _creer_zone_controles(self) -> None:
@@ -117,6 +122,15 @@ class FenetrePrincipale(QWidget):
         # Ajout dans la verticale
         vbox.addLayout(hbox_boutons)
 
+        # Echelle de temps
+        self.selecteur_echelle = SelecteurEchelleTemps(
+            echelles=spec_int["ECHELLES_TEMPS"],
+            echelle_initiale=spec_sim["ECHELLE_TEMPS"],
+            simulateur=self.simulateur,
+            parent=conteneur,
+        )
+        vbox.addWidget(self.selecteur_echelle)
+
         # Camera
         self.curseur_camera = CurseurCamera(
             amplitude=spec_int["CAMERA_AMPLITUDE"],
@@ -146,6 +160,15 @@ class FenetrePrincipale(QWidget):
         )
         vbox.addWidget(self.zone_controle_moteurs, 1)
 
+        # Profilage des etapes
+        self.panneau_profilage = PanneauProfilage(
+            simulateur=self.simulateur,
+            periode_ms=spec_prof["PERIODE_AFFICHAGE_MS"],
+            dossier_export=spec_prof["DOSSIER_EXPORT"],
+            parent=conteneur,
+        )
+        vbox.addWidget(self.panneau_profilage)
+
         self.conteneur_controles = conteneur
         self.conteneur_controles.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Expanding)
 
@@ -154,8 +177,6 @@ class FenetrePrincipale(QWidget):
         self.graphe_pid = GraphePid(spec_int, parent=self)
         self.graphe_altitude = GrapheAltitude(spec_int, parent=self)
 
-        self.simulateur.pid_mis_a_jour.connect(self.graphe_pid.recevoir_pid)
-        self.simulateur.pid_mis_a_jour.connect(self.graphe_altitude.recevoir_pid)
         self.graphe_pid.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
         self.graphe_altitude.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
 
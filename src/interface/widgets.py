@@ -1,25 +1,38 @@
+import os
+import time
 from typing import Any, Callable, Optional, List
 from functools import partial
-import time
 from panda3d.core import WindowProperties
 
 from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtWidgets import QWidget, QSlider, QProgressBar, QLabel, QVBoxLayout, QGridLayout, QGroupBox, QPushButton
+from PyQt5.QtGui import QFontDatabase
+from PyQt5.QtWidgets import QWidget, QSlider, QProgressBar, QLabel, QVBoxLayout, QHBoxLayout, QGridLayout, QGroupBox, QPushButton, QComboBox, QCheckBox
 
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
 
 from utiles.memoire_tampon import MemoireTamponPid
+from utiles.logger import log
+
+_theme_applique = False
+
 
-import seaborn as sns
-sns.set_theme(style="whitegrid", palette="Set2")
+def appliquer_theme_graphes() -> None:
+    """Applique le theme seaborn aux graphes, une seule fois, a la creation du premier graphe."""
+    global _theme_applique
+    if not _theme_applique:
+        import seaborn as sns
+        sns.set_theme(style="whitegrid", palette="Set2")
+        _theme_applique = True
 
 # ---------- Widget d'integration Panda3D ----------
 class WidgetPanda(QWidget):
     """Conteneur Qt pour afficher la fenetre Panda3D dans un widget."""
-    def __init__(self, scene: Any, parent: Optional[QWidget] = None) -> None:
+    def __init__(self, scene: Any, parent: Optional[QWidget] = None, horloge: Any = None) -> None:
         super().__init__(parent)
         self.scene: Any = scene
+        # Horloge de simulation : plus vite que le temps reel, des trames sont sautees
+        self.horloge: Any = horloge
 
         # Rattacher la fenetre Panda3D à ce widget
         proprietes = WindowProperties()
@@ -32,6 +45,10 @@ class WidgetPanda(QWidget):
         self._minuterie.start(16)
 
     def _avancer_panda(self) -> None:
+        # Trame sautee : taches et evenements avancent, seule la fenetre n'est pas dessinee
+        rendre = self.horloge is None or self.horloge.trame_a_rendre()
+        if rendre != self.scene.win.isActive():
+            self.scene.win.setActive(rendre)
         # 'base' est l'instance ShowBase globale fournissant taskMgr
         base.taskMgr.step()  # type: ignore[name-defined]
 
@@ -130,6 +147,10 @@ class JaugeAltitude(QProgressBar):
         self.setValue(int(round((metres_clampe - self._min_m) * 100)))
         self.setFormat(f"{metres_clampe:.2f}")
 
+    def recevoir_telemetrie(self, lot: Any) -> None:
+        """Affiche la derniere altitude d'un LotTelemetrie."""
+        self.mettre_a_jour(lot.altitude[-1])
+
 
 class BoutonPid(QPushButton):
     """Bouton à bascule pour activer/desactiver le PID."""
@@ -152,6 +173,78 @@ class BoutonPid(QPushButton):
         self.setText("PID : ON" if self._actif else "PID : OFF")
 
 
+class SelecteurEchelleTemps(QComboBox):
+    """Liste deroulante de l'echelle de temps (ralenti, accelere, aussi vite que possible)."""
+    def __init__(self, echelles: List[Optional[float]], echelle_initiale: Optional[float], simulateur: Any, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self._simulateur: Any = simulateur
+        self._echelles: List[Optional[float]] = list(echelles)
+        for echelle in self._echelles:
+            self.addItem("Max" if echelle is None else f"x{echelle:g}")
+        if echelle_initiale in self._echelles:
+            self.setCurrentIndex(self._echelles.index(echelle_initiale))
+        self.currentIndexChanged.connect(self._changer_echelle)  # type: ignore[arg-type]
+
+    def _changer_echelle(self, index: int) -> None:
+        self._simulateur.fixer_echelle_temps(self._echelles[index])
+
+
+class PanneauProfilage(QGroupBox):
+    """Panneau de profilage : p50 / p99 par etape et frequences obtenues, export des histogrammes."""
+    def __init__(self, simulateur: Any, periode_ms: int, dossier_export: str, parent: Optional[QWidget] = None) -> None:
+        super().__init__("Profilage", parent)
+        self._simulateur: Any = simulateur
+        self._dossier_export: str = dossier_export
+
+        self.case_active = QCheckBox("Mesurer", self)
+        self.case_active.setChecked(simulateur.profileur is not None)
+        self.case_active.toggled.connect(self._basculer)  # type: ignore[arg-type]
+        self.bouton_exporter = QPushButton("Exporter", self)
+        self.bouton_exporter.setCursor(Qt.PointingHandCursor)
+        self.bouton_exporter.clicked.connect(self._exporter)  # type: ignore[arg-type]
+
+        self.texte = QLabel(self)
+        self.texte.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        self.texte.setTextInteractionFlags(Qt.TextSelectableByMouse)
+
+        hbox = QHBoxLayout()
+        hbox.addWidget(self.case_active)
+        hbox.addWidget(self.bouton_exporter)
+        vbox = QVBoxLayout(self)
+        vbox.addLayout(hbox)
+        vbox.addWidget(self.texte)
+        self._basculer(self.case_active.isChecked())
+
+        self._minuterie = QTimer(self)
+        self._minuterie.timeout.connect(self._rafraichir)  # type: ignore[arg-type]
+        self._minuterie.start(int(periode_ms))
+
+    def _basculer(self, actif: bool) -> None:
+        if actif:
+            self._simulateur.activer_profilage()
+        else:
+            self._simulateur.desactiver_profilage()
+        self.texte.setVisible(actif)
+        self.bouton_exporter.setEnabled(actif)
+
+    def _rafraichir(self) -> None:
+        profileur = self._simulateur.profileur
+        if profileur is None:
+            return
+        profileur.mesurer_frequences(self._simulateur.compteurs_profilage())
+        self.texte.setText(profileur.formater())
+
+    def _exporter(self) -> None:
+        profileur = self._simulateur.profileur
+        if profileur is None:
+            return
+        chemin = os.path.join(self._dossier_export, time.strftime("profilage_%Y%m%d_%H%M%S.json"))
+        try:
+            log(f"Histogrammes de profilage exportes dans {profileur.exporter(chemin)}")
+        except OSError as err:
+            log(f"Export du profilage impossible : {err}")
+
+
 class ZoneControleMoteurs(QGroupBox):
     """Zone regroupant les sliders des moteurs + libelles."""
     def __init__(
@@ -209,6 +302,10 @@ class ZoneControleMoteurs(QGroupBox):
             slider.blockSignals(True)
             slider.setValue(int(vitesses[i]))
             slider.blockSignals(False)
+
+    def recevoir_telemetrie(self, lot: Any) -> None:
+        """Affiche les dernieres vitesses reelles d'un LotTelemetrie."""
+        self.mettre_a_jour_affichage_moteurs(lot.vitesses_helices_reelles[-1])
     
     def notifier_moteur_utilisateur(self, index: int, actif: bool) -> None:
         self._simulateur.moteurs_forces_utilisateur[index] = actif
@@ -226,9 +323,9 @@ class GrapheBase(QWidget):
         self.epaisseur = float(ui["GRAPHIQUE_EPAISSEUR_TRAIT"])
 
         self.memoire = MemoireTamponPid(self.fenetre_s)
-        self.t0 = time.monotonic()
 
         # Figure
+        appliquer_theme_graphes()
         self.figure = Figure(figsize=(6, 2.5), tight_layout=True)
         self.canvas = FigureCanvasQTAgg(self.figure)
 
@@ -245,6 +342,16 @@ class GrapheBase(QWidget):
         self._minuterie.timeout.connect(self._rafraichir)  # type: ignore[arg-type]
         self._minuterie.start(self.periode_ms)
 
+    def recevoir_telemetrie(self, lot: Any) -> None:
+        """Ajoute les echantillons d'un LotTelemetrie, dates en temps simule.
+
+        Si le temps recule (reinitialisation), le graphe repart de zero.
+        """
+        if self.memoire.deque_donnees and lot.t[0] < self.memoire.deque_donnees[-1][0]:
+            self.memoire.vider()
+        p, i, d = lot.termes_pid.T
+        self.memoire.ajouter_lot(lot.t.tolist(), p.tolist(), i.tolist(), d.tolist(), lot.consigne.tolist(), lot.altitude.tolist())
+
     # Methode commune appelee par le timer
     def _rafraichir(self) -> None:
         self._rafraichir_graphe()
@@ -270,10 +377,6 @@ class GraphePid(GrapheBase):
 
         self.ax.legend(loc="upper left", ncol=3, fontsize=8)
 
-    def recevoir_pid(self, p: float, i: float, d: float, consigne: float, mesure: float) -> None:
-        t = time.monotonic() - self.t0
-        self.memoire.ajouter(t, p, i, d, consigne, mesure)
-
     def _rafraichir_graphe(self) -> None:
         t, p, i, d, _, _ = self.memoire.lire_series()
         if not t:
@@ -306,10 +409,6 @@ class GrapheAltitude(GrapheBase):
         lignes = [self.courbe_consigne, self.courbe_mesure]
         self.ax.legend(lignes, [l.get_label() for l in lignes], loc="upper right", fontsize=8)
 
-    def recevoir_pid(self, p: float, i: float, d: float, consigne: float, mesure: float) -> None:
-        t = time.monotonic() - self.t0
-        self.memoire.ajouter(t, p, i, d, consigne, mesure)
-
     def _rafraichir_graphe(self) -> None:
         t, _, _, _, c, m = self.memoire.lire_series()
         if not t:
@@ -1,41 +1,193 @@
+import argparse
+import glob
 import sys
+import time
 
-from PyQt5.QtWidgets import QApplication
-
-from simulation.scene import Scene
-from simulation.drone import ModeleDrone
-from simulation.physique import PhysiqueDrone
-from simulation.simulateur import Simulateur
-from interface.fenetre import FenetrePrincipale
+from utiles.constantes import (
+    specifications_simulation as spec_sim,
+    specifications_reseau as spec_res,
+    specifications_scenario as spec_scn
+)
 from utiles.logger import log
 
 
-def build_simulation() -> tuple[Scene, Simulateur]:
+def build_simulation(reseau: bool = False):
+    """Instancie la scene, le modele 3d, la physique et le simulateur Panda3D."""
+    from simulation.scene import Scene
+    from simulation.drone import ModeleDrone
+    from simulation.physique import creer_physique_drone
+    from simulation.simulateur import Simulateur
+
     log("Demarrage du programme")
     scene = Scene()
     log("Chargement du modele drone")
     modele = ModeleDrone(scene)
     log("Initialisation de la physique")
-    physique = PhysiqueDrone()
+    physique = creer_physique_drone()
     log("Lancement simulateur Panda3D")
-    simulateur = Simulateur(scene, modele, physique)
+    simulateur = Simulateur(scene, modele, physique, reseau=reseau)
     return scene, simulateur
 
 
+def main_headless(
+    duree: float,
+    dt: float,
+    dossier_trace: str | None = None,
+    fichier_vol: str | None = None,
+    fichier_export: str | None = None,
+    fichier_profilage: str | None = None,
+    mode_noyau: bool | None = None,
+    cadences: bool = False
+) -> int:
+    """Simule `duree` secondes a pas fixe, sans fenetre, et affiche un resume.
+
+    mode_noyau : physique en noyau sans allocation, phys["MODE_NOYAU"] si None.
+    cadences : physique et controle aux cadences de l'ordonnanceur ; sinon un pas physique
+    et un pas de controle par dt.
+    """
+    from simulation.physique import creer_physique_drone
+    from simulation.ordonnanceur import Ordonnanceur
+    from simulation.sans_rendu import SimulateurSansRendu
+
+    options = {} if mode_noyau is None else {"mode_noyau": mode_noyau}
+    ordonnanceur = None if cadences else Ordonnanceur(1.0 / dt, 1.0 / dt)
+    simulateur = SimulateurSansRendu(creer_physique_drone(**options), dt=dt, ordonnanceur=ordonnanceur)
+    ordonnanceur = simulateur.ordonnanceur
+    log(
+        f"Simulation sans rendu : {duree} s, physique a {1 / ordonnanceur.pas_physique:.0f} Hz, "
+        f"controle a {1 / ordonnanceur.pas_controle:.0f} Hz, echantillons tous les {dt} s"
+    )
+    if dossier_trace is not None:
+        simulateur.controleur.activer_traces()
+    if fichier_vol is not None:
+        from utiles.enregistreur import EnregistreurVol
+        simulateur.enregistreur = EnregistreurVol(fichier_vol)
+    elif fichier_export is not None:
+        from utiles.export import ExportateurEtat
+        simulateur.enregistreur = ExportateurEtat(fichier_export, compression=fichier_export.endswith(".gz"))
+    if fichier_profilage is not None:
+        from utiles.profileur import Profileur
+        simulateur.profileur = Profileur()
+
+    debut = time.perf_counter()
+    resultat = simulateur.executer(duree)
+    ecoule = time.perf_counter() - debut
+
+    x, y, z = resultat.position_xyz[-1]
+    log(f"Position finale : x = {x:.3f} m, y = {y:.3f} m, z = {z:.3f} m")
+    log(
+        f"{simulateur.ordonnanceur.nb_pas_physique} pas physiques, {len(resultat.t)} echantillons "
+        f"en {ecoule:.3f} s ({duree / ecoule:.1f} x temps reel)"
+    )
+
+    if dossier_trace is not None:
+        for chemin in simulateur.controleur.exporter_traces(dossier_trace):
+            log(f"Trace PID ecrite dans {chemin}")
+    if fichier_vol is not None:
+        simulateur.enregistreur.fermer()
+        log(f"{simulateur.enregistreur.nb_enregistrements} pas enregistres dans {fichier_vol}")
+    elif fichier_export is not None:
+        simulateur.enregistreur.fermer()
+        log(f"{simulateur.enregistreur.nb_lignes} pas exportes dans {', '.join(simulateur.enregistreur.fichiers)}")
+    if fichier_profilage is not None:
+        print(simulateur.profileur.formater())
+        log(f"Histogrammes de profilage ecrits dans {simulateur.profileur.exporter(fichier_profilage)}")
+    return 0
+
+
+def main_rejeu(fichier_vol: str, vitesse: float) -> int:
+    """Rejoue un enregistrement de vol dans la scene Panda3D, sans physique."""
+    from utiles.enregistreur import LecteurVol
+
+    try:
+        lecteur = LecteurVol(fichier_vol)
+    except (OSError, ValueError) as err:
+        log(f"Rejeu impossible : {err}")
+        return 1
+
+    from simulation.scene import Scene
+    from simulation.drone import ModeleDrone
+    log(f"Rejeu de {fichier_vol} : {len(lecteur)} pas, {lecteur.duree:.1f} s")
+    scene = Scene()
+    modele = ModeleDrone(scene)
+    scene.taskMgr.add(lecteur.tache_rejeu(modele, vitesse), "tacheRejeu")
+    scene.run()
+    return 0
+
+
+def main_batch(argv: list[str]) -> int:
+    """Execute des scenarios sans rendu sur un pool de processus : `main.py batch scenarios/*.toml`."""
+    from simulation.scenario import executer_lot
+
+    parser = argparse.ArgumentParser(prog="main.py batch", description="Execute des scenarios sans rendu")
+    parser.add_argument("scenarios", nargs="+", help="fichiers de scenario .toml ou .json (motifs glob acceptes)")
+    parser.add_argument("--sortie", default=spec_scn["DOSSIER_SORTIE"], help="dossier des metriques et enregistrements")
+    parser.add_argument("--enregistrer", action="store_true", help="enregistre chaque vol (fichier .enr par scenario)")
+    parser.add_argument("--processus", type=int, default=None, help="par defaut : tous les coeurs")
+    args = parser.parse_args(argv)
+
+    # Les motifs ne sont pas developpes par tous les shells (Windows)
+    chemins = [chemin for motif in args.scenarios for chemin in (sorted(glob.glob(motif)) or [motif])]
+    debut = time.perf_counter()
+    try:
+        lignes = executer_lot(chemins, args.sortie, args.enregistrer, args.processus)
+    except (OSError, ValueError) as err:
+        log(f"Erreur : {err}")
+        return 1
+
+    for ligne in lignes:
+        log(
+            f"{ligne['scenario']} : erreur RMS = {ligne['erreur_rms']:.3f} m, "
+            f"depassement = {ligne['depassement']:.3f} m, etablissement = {ligne['temps_etablissement']:.2f} s"
+            + (" (crash)" if ligne["crash"] else "")
+        )
+    log(f"{len(lignes)} scenarios en {time.perf_counter() - debut:.1f} s")
+    return 0
+
+
 def main(argv: list[str] | None = None) -> int:
     argv = argv if argv is not None else sys.argv
-    app = QApplication(argv)
+    if argv[1:2] == ["batch"]:
+        return main_batch(argv[2:])
+
+    parser = argparse.ArgumentParser(description="Simulation de drone")
+    parser.add_argument("--headless", action="store_true", help="simule sans Panda3D ni Qt, a pas fixe")
+    parser.add_argument("--duree", type=float, default=spec_sim["DUREE_SANS_RENDU"], help="duree simulee en mode --headless (s)")
+    parser.add_argument("--dt", type=float, default=spec_sim["PAS_FIXE"], help="pas de temps en mode --headless (s)")
+    parser.add_argument("--trace-pid", metavar="DOSSIER", default=None, help="en mode --headless, ecrit la trace des PID dans DOSSIER")
+    sortie = parser.add_mutually_exclusive_group()
+    sortie.add_argument("--enregistrer", metavar="FICHIER", default=None, help="en mode --headless, enregistre chaque pas dans FICHIER")
+    sortie.add_argument("--exporter", metavar="FICHIER", default=None, help="en mode --headless, exporte chaque pas en CSV (compresse si FICHIER finit par .gz)")
+    parser.add_argument("--profiler", metavar="FICHIER", default=None, help="en mode --headless, mesure controle et physique et exporte les histogrammes en JSON")
+    parser.add_argument("--noyau", action=argparse.BooleanOptionalAction, default=None, help="en mode --headless, physique en noyau sans allocation (MODE_NOYAU par defaut)")
+    parser.add_argument("--cadences", action="store_true", help="en mode --headless, physique et controle aux cadences de l'ordonnanceur au lieu d'un pas par --dt")
+    parser.add_argument("--rejouer", metavar="FICHIER", default=None, help="rejoue un enregistrement dans la scene 3D, sans physique")
+    parser.add_argument("--reseau", action="store_true", help="publie l'etat et recoit les commandes en UDP local")
+    parser.add_argument("--vitesse-rejeu", type=float, default=1.0, help="facteur de vitesse du rejeu")
+    args, argv_qt = parser.parse_known_args(argv[1:])
+
+    if args.headless:
+        return main_headless(args.duree, args.dt, args.trace_pid, args.enregistrer, args.exporter, args.profiler, args.noyau, args.cadences)
+    if args.rejouer is not None:
+        return main_rejeu(args.rejouer, args.vitesse_rejeu)
+
+    from PyQt5.QtWidgets import QApplication
+    from interface.fenetre import FenetrePrincipale
+
+    app = QApplication([argv[0]] + argv_qt)
     app.setApplicationName("Simulation Drone")
     app.setOrganizationName("SII")
 
-    scene, simulateur = build_simulation()
+    scene, simulateur = build_simulation(args.reseau or spec_res["ACTIF"])
 
     fenetre = FenetrePrincipale(scene, simulateur)
     fenetre.show()
 
     print("\nBienvenue dans la simulation.\nAppuyez sur la croix de l'interface pour quitter.\n")
-    return app.exec_()
+    code = app.exec_()
+    simulateur.arreter()
+    return code
 
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,353 @@
+import argparse
+import hashlib
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+from utiles.constantes import (
+    physique as phys,
+    specifications_simulation as spec_sim,
+    specifications_autoreglage as spec_auto
+)
+from utiles.logger import log
+from utiles.parametres import ParametresDrone
+from simulation.physique import creer_physique_drone
+from simulation.ordonnanceur import Ordonnanceur
+from simulation.balayage import PARAMETRES_PID, appliquer_parametres, calculer_metriques, valeurs_nominales
+from simulation.perturbations import Perturbations, Rafale
+from simulation.sans_rendu import SimulateurSansRendu, ResultatSimulation
+
+
+# ============================
+# Cout d'un jeu de gains
+# ============================
+
+def configuration_cout(
+    duree: float = spec_auto["DUREE"],
+    dt: float = spec_sim["PAS_FIXE"],
+    parametres: Optional[ParametresDrone] = None
+) -> Dict[str, Any]:
+    """Scenario, modele simule et ponderations du cout, sous forme serialisable (aussi utilisee dans la cle de cache).
+
+    Tout ce dont depend le cout y figure : un changement de drone, de consigne,
+    d'integrateur ou de cadences invalide les evaluations en cache.
+    ValueError si la rafale ne commence pas strictement apres le debut et avant la fin du vol :
+    les metriques de l'echelon et du rejet de rafale porteraient sur une fenetre vide.
+    """
+    rafale = spec_auto["RAFALE"]
+    if not duree > 0.0 or not dt > 0.0:
+        raise ValueError(f"duree et dt doivent etre positifs : {duree}, {dt}.")
+    if not 0.0 < rafale["DEBUT"] < duree or not rafale["DUREE"] > 0.0:
+        raise ValueError(f"RAFALE : DEBUT doit etre dans ]0, {duree}[ et DUREE positive : {rafale}.")
+    return {
+        "duree": duree,
+        "dt": dt,
+        "rafale": rafale,
+        "poids": spec_auto["POIDS"],
+        "penalite_crash": spec_auto["PENALITE_CRASH"],
+        "parametres": (parametres if parametres is not None else ParametresDrone()).vers_dict(),
+        "consigne": list(spec_sim["CONSIGNE"]),
+        "integrateur": phys["INTEGRATEUR"],
+        "attitude": phys["ATTITUDE"],
+        "mode_noyau": phys["MODE_NOYAU"],
+        "frequence_physique": phys["FREQUENCE_PHYSIQUE"],
+        "frequence_controle": spec_sim["FREQUENCE_CONTROLE"],
+    }
+
+
+def evaluer_gains(tache: Tuple[Dict[str, List[float]], Dict[str, Any]]) -> float:
+    """Simule l'echelon de consigne puis la rafale, et retourne le cout des gains (plus petit = meilleur).
+
+    Fonction de module, pour etre executee dans un processus du pool.
+    """
+    gains, config = tache
+    poids = config["poids"]
+    rafale = config["rafale"]
+    dt = config["dt"]
+
+    physique = creer_physique_drone(
+        integrateur=config["integrateur"],
+        mode_noyau=config["mode_noyau"] and config["attitude"] == "euler",
+        parametres=ParametresDrone.depuis_dict(config["parametres"])
+    )
+    # Comme l'ordonnanceur par defaut : un integrateur adaptatif recoit une periode de controle entiere
+    frequence_physique = config["frequence_controle"] if physique.integrateur.adaptatif else config["frequence_physique"]
+    ordonnanceur = Ordonnanceur(frequence_physique, config["frequence_controle"])
+    simulateur = SimulateurSansRendu(physique, dt=dt, ordonnanceur=ordonnanceur)
+    simulateur.fixer_consigne(config["consigne"])
+    appliquer_parametres(simulateur, gains)
+    simulateur.physique_drone.perturbations = Perturbations(
+        pas=simulateur.ordonnanceur.pas_physique, vent_constant=(0.0, 0.0, 0.0), turbulence=None,
+        rafales=[Rafale(rafale["DEBUT"], rafale["DUREE"], rafale["AMPLITUDE"])],
+        parametres=simulateur.physique_drone.parametres
+    )
+    position_initiale = simulateur.physique_drone.position_xyz.copy()
+    consigne_xyz = np.array([0.0, 0.0, simulateur.controleur.pid_z.consigne])
+    resultat = simulateur.executer(config["duree"])
+
+    if not np.all(np.isfinite(resultat.position_xyz)):
+        return float(config["penalite_crash"]) * 10.0
+
+    # Echelon : metriques avant la rafale
+    k = int(np.searchsorted(resultat.t, rafale["DEBUT"]))
+    echelon = ResultatSimulation(*(getattr(resultat, champ.name)[:k] for champ in fields(ResultatSimulation)))
+    metriques = calculer_metriques(echelon, position_initiale, consigne_xyz)
+    temps_etablissement = metriques["temps_etablissement"]
+    if math.isnan(temps_etablissement):
+        temps_etablissement = rafale["DEBUT"]
+    depassement_relatif = metriques["depassement_relatif"]
+    if math.isnan(depassement_relatif):
+        depassement_relatif = 0.0  # consigne a l'altitude de depart : pas d'echelon, l'erreur RMS suffit
+
+    # Rejet de la rafale : ecart maximal a la consigne apres son debut
+    ecart_rafale = float(np.max(np.linalg.norm(resultat.position_xyz[k:] - consigne_xyz, axis=1)))
+
+    cout = (
+        poids["ERREUR_RMS"] * metriques["erreur_rms"] +
+        poids["DEPASSEMENT_RELATIF"] * depassement_relatif +
+        poids["TEMPS_ETABLISSEMENT"] * temps_etablissement +
+        poids["ECART_RAFALE"] * ecart_rafale
+    )
+    if resultat.crash.any():
+        cout += config["penalite_crash"]
+    return float(cout)
+
+
+# ============================
+# Optimiseur
+# ============================
+
+class CMAES:
+    """CMA-ES (mu/mu_w, lambda) sans derivee, dans [0, 1]^n (gains normalises par leurs bornes).
+
+    demander() propose une population, informer() la met a jour avec les couts.
+    """
+
+    def __init__(self, x0: np.ndarray, sigma: float, taille_population: int, rng: np.random.Generator) -> None:
+        """Initialise la moyenne, le pas, la covariance et les constantes d'adaptation."""
+        n = len(x0)
+        self.n: int = n
+        self.moyenne: np.ndarray = np.array(x0, dtype=float)
+        self.sigma: float = float(sigma)
+        self.taille_population: int = int(taille_population)
+        self.rng: np.random.Generator = rng
+
+        # Poids de recombinaison
+        mu = self.taille_population // 2
+        poids = np.log(mu + 0.5) - np.log(np.arange(1, mu + 1))
+        self.poids: np.ndarray = poids / poids.sum()
+        self.mu_eff: float = 1.0 / float(np.sum(self.poids**2))
+
+        # Constantes d'adaptation
+        m = self.mu_eff
+        self.cc: float = (4 + m / n) / (n + 4 + 2 * m / n)
+        self.cs: float = (m + 2) / (n + m + 5)
+        self.c1: float = 2 / ((n + 1.3)**2 + m)
+        self.cmu: float = min(1 - self.c1, 2 * (m - 2 + 1 / m) / ((n + 2)**2 + m))
+        self.amortissement: float = 1 + 2 * max(0.0, math.sqrt((m - 1) / (n + 1)) - 1) + self.cs
+        self.chi_n: float = math.sqrt(n) * (1 - 1 / (4 * n) + 1 / (21 * n * n))
+
+        # Etat
+        self.pc: np.ndarray = np.zeros(n)
+        self.ps: np.ndarray = np.zeros(n)
+        self.C: np.ndarray = np.eye(n)
+        self.B: np.ndarray = np.eye(n)
+        self.D: np.ndarray = np.ones(n)
+        self.generation: int = 0
+
+    def demander(self) -> np.ndarray:
+        """Tire une population (lambda, n), non bornee : l'appelant la ramene dans [0, 1] pour l'evaluer."""
+        z = self.rng.standard_normal((self.taille_population, self.n))
+        return self.moyenne + self.sigma * (z * self.D) @ self.B.T
+
+    def informer(self, population: np.ndarray, couts: Sequence[float]) -> None:
+        """Met a jour moyenne, chemins d'evolution, covariance et pas a partir des couts.
+
+        `population` est celle rendue par demander(), non bornee, meme si les couts ont ete
+        evalues aux points bornes : sinon la distribution serait biaisee vers les bornes.
+        """
+        ordre = np.argsort(couts)[:len(self.poids)]
+        y = (population[ordre] - self.moyenne) / self.sigma
+        y_moyen = self.poids @ y
+        self.moyenne = self.moyenne + self.sigma * y_moyen
+        self.generation += 1
+
+        # Chemins d'evolution
+        C_inv_racine = self.B @ np.diag(1.0 / self.D) @ self.B.T
+        self.ps = (1 - self.cs) * self.ps + math.sqrt(self.cs * (2 - self.cs) * self.mu_eff) * (C_inv_racine @ y_moyen)
+        norme_ps = float(np.linalg.norm(self.ps))
+        h_sigma = norme_ps / math.sqrt(1 - (1 - self.cs)**(2 * self.generation)) < (1.4 + 2 / (self.n + 1)) * self.chi_n
+        self.pc = (1 - self.cc) * self.pc + h_sigma * math.sqrt(self.cc * (2 - self.cc) * self.mu_eff) * y_moyen
+
+        # Covariance : rang 1 + rang mu
+        delta = (1 - h_sigma) * self.cc * (2 - self.cc)
+        self.C = (
+            (1 - self.c1 - self.cmu + self.c1 * delta) * self.C
+            + self.c1 * np.outer(self.pc, self.pc)
+            + self.cmu * (y.T * self.poids) @ y
+        )
+
+        # Pas global
+        self.sigma *= math.exp((self.cs / self.amortissement) * (norme_ps / self.chi_n - 1))
+
+        # Decomposition C = B diag(D^2) B^T
+        self.C = np.triu(self.C) + np.triu(self.C, 1).T
+        valeurs, self.B = np.linalg.eigh(self.C)
+        self.D = np.sqrt(np.maximum(valeurs, 1e-20))
+
+
+# ============================
+# Cache des evaluations
+# ============================
+
+def cle_gains(gains: Dict[str, List[float]], config: Dict[str, Any]) -> str:
+    """Empreinte d'un jeu de gains et de la configuration d'evaluation (scenario, drone, integrateur, cadences)."""
+    arrondis = {cle: [float(f"{g:.12g}") for g in valeurs] for cle, valeurs in sorted(gains.items())}
+    texte = json.dumps({"gains": arrondis, "config": config}, sort_keys=True)
+    return hashlib.sha1(texte.encode("utf-8")).hexdigest()
+
+
+def lire_cache(chemin: Optional[str]) -> Dict[str, float]:
+    """Couts en cache par cle_gains(), lus dans `chemin` ; vide si le fichier n'existe pas."""
+    if chemin is None or not os.path.exists(chemin):
+        return {}
+    with open(chemin, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def ecrire_cache(chemin: Optional[str], cache: Dict[str, float]) -> None:
+    """Ecrit le cache dans `chemin` de facon atomique (fichier temporaire puis remplacement) ; rien si None."""
+    if chemin is None:
+        return
+    os.makedirs(os.path.dirname(chemin) or ".", exist_ok=True)
+    temporaire = chemin + ".tmp"
+    with open(temporaire, "w", encoding="utf-8") as f:
+        json.dump(cache, f)
+    os.replace(temporaire, chemin)
+
+
+# ============================
+# Recherche
+# ============================
+
+class Autoreglage:
+    """Recherche des gains PID par CMA-ES, populations evaluees en parallele, evaluations en cache."""
+
+    def __init__(
+        self,
+        bornes: Optional[Dict[str, Tuple[Sequence[float], Sequence[float]]]] = None,
+        taille_population: int = spec_auto["TAILLE_POPULATION"],
+        sigma: float = spec_auto["SIGMA_INITIAL"],
+        graine: int = spec_auto["GRAINE"],
+        duree: float = spec_auto["DUREE"],
+        fichier_cache: Optional[str] = spec_auto["FICHIER_CACHE"],
+        nb_processus: Optional[int] = None
+    ) -> None:
+        """Initialise l'espace de recherche autour des gains actuels du Controleur."""
+        self.bornes = bornes if bornes is not None else spec_auto["BORNES"]
+        inconnues = set(self.bornes) - set(PARAMETRES_PID)
+        if inconnues:
+            raise ValueError(f"Gains non reglables : {', '.join(sorted(inconnues))}")
+
+        self.cles: List[str] = list(self.bornes)
+        self.bas: np.ndarray = np.concatenate([np.asarray(self.bornes[c][0], dtype=float) for c in self.cles])
+        self.haut: np.ndarray = np.concatenate([np.asarray(self.bornes[c][1], dtype=float) for c in self.cles])
+
+        nominaux = valeurs_nominales()
+        x0 = np.clip((np.concatenate([nominaux[c] for c in self.cles]) - self.bas) / (self.haut - self.bas), 0.0, 1.0)
+        self.optimiseur: CMAES = CMAES(x0, sigma, taille_population, np.random.default_rng(graine))
+
+        self.config: Dict[str, Any] = configuration_cout(duree)
+        self.fichier_cache: Optional[str] = fichier_cache
+        self.cache: Dict[str, float] = lire_cache(fichier_cache)
+        self.nb_processus: int = nb_processus or os.cpu_count() or 1
+        self.nb_simulations: int = 0
+
+        self.meilleurs_gains: Optional[Dict[str, List[float]]] = None
+        self.meilleur_cout: float = math.inf
+
+    def gains(self, x: np.ndarray) -> Dict[str, List[float]]:
+        """Ramene un point dans [0, 1]^n et le convertit en gains (P, I, D) par cle."""
+        valeurs = self.bas + np.clip(x, 0.0, 1.0) * (self.haut - self.bas)
+        return {cle: valeurs[3 * k:3 * k + 3].tolist() for k, cle in enumerate(self.cles)}
+
+    def evaluer(self, population: Sequence[Dict[str, List[float]]], pool: Optional[ProcessPoolExecutor]) -> List[float]:
+        """Retourne le cout de chaque jeu de gains ; seuls ceux absents du cache sont simules."""
+        cles = [cle_gains(g, self.config) for g in population]
+        a_simuler = {cle: g for cle, g in zip(cles, population) if cle not in self.cache}
+
+        taches = [(g, self.config) for g in a_simuler.values()]
+        if pool is None:
+            couts = [evaluer_gains(t) for t in taches]
+        else:
+            couts = list(pool.map(evaluer_gains, taches))
+        self.cache.update(zip(a_simuler.keys(), couts))
+        self.nb_simulations += len(taches)
+        return [self.cache[cle] for cle in cles]
+
+    def executer(self, nb_generations: int = spec_auto["NB_GENERATIONS"]) -> Dict[str, List[float]]:
+        """Fait evoluer la population et retourne les meilleurs gains trouves."""
+        pool = ProcessPoolExecutor(max_workers=self.nb_processus) if self.nb_processus > 1 else None
+        try:
+            # Les gains actuels servent de reference
+            depart = self.gains(self.optimiseur.moyenne)
+            self.meilleur_cout = self.evaluer([depart], pool)[0]
+            self.meilleurs_gains = depart
+            log(f"Gains actuels : cout = {self.meilleur_cout:.4g}")
+
+            for generation in range(nb_generations):
+                x = self.optimiseur.demander()
+                population = [self.gains(xi) for xi in x]
+                couts = self.evaluer(population, pool)
+                self.optimiseur.informer(x, couts)
+
+                k = int(np.argmin(couts))
+                if couts[k] < self.meilleur_cout:
+                    self.meilleur_cout, self.meilleurs_gains = couts[k], population[k]
+                ecrire_cache(self.fichier_cache, self.cache)
+                log(f"Generation {generation + 1}/{nb_generations} : meilleur cout = {self.meilleur_cout:.4g} (sigma = {self.optimiseur.sigma:.3g})")
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        return self.meilleurs_gains
+
+    def ecrire_gains(self, chemin: str) -> str:
+        """Ecrit les meilleurs gains au format de specifications_simulation["PID"]."""
+        noms = {"PID_Z": "Z", "PID_POSITION": "POSITION", "PID_ATTITUDE": "ATTITUDE"}
+        contenu = {
+            "cout": self.meilleur_cout,
+            "PID": {
+                noms[cle]: dict(zip(("proportionnel", "integral", "derive"), valeurs))
+                for cle, valeurs in self.meilleurs_gains.items()
+            },
+        }
+        os.makedirs(os.path.dirname(chemin) or ".", exist_ok=True)
+        with open(chemin, "w", encoding="utf-8") as f:
+            json.dump(contenu, f, indent=4)
+        return chemin
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Reglage automatique des gains PID par simulation sans rendu.")
+    parser.add_argument("--generations", type=int, default=spec_auto["NB_GENERATIONS"])
+    parser.add_argument("--population", type=int, default=spec_auto["TAILLE_POPULATION"])
+    parser.add_argument("--graine", type=int, default=spec_auto["GRAINE"])
+    parser.add_argument("--processus", type=int, default=None, help="par defaut : tous les coeurs")
+    parser.add_argument("--cache", type=str, default=spec_auto["FICHIER_CACHE"])
+    parser.add_argument("--sortie", type=str, default=spec_auto["FICHIER_GAINS"])
+    args = parser.parse_args()
+
+    debut = time.perf_counter()
+    reglage = Autoreglage(taille_population=args.population, graine=args.graine, fichier_cache=args.cache, nb_processus=args.processus)
+    reglage.executer(args.generations)
+    log(f"{reglage.nb_simulations} simulations en {time.perf_counter() - debut:.1f} s")
+    log(f"Meilleurs gains (cout = {reglage.meilleur_cout:.4g}) ecrits dans {reglage.ecrire_gains(args.sortie)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+import argparse
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+
+from utiles.constantes import (
+    physique as phys,
+    specifications_simulation as spec_sim,
+    specifications_balayage as spec_bal
+)
+from utiles.export import ecrire_lignes_csv
+from utiles.logger import log
+from controle.pid import CoefficientsPID
+from simulation.physique import creer_physique_drone
+from simulation.perturbations import Perturbations
+from simulation.sans_rendu import SimulateurSansRendu, ResultatSimulation
+
+
+# Parametres physiques tirables : cle -> champ de ParametresDrone
+PARAMETRES_PHYSIQUES: Dict[str, str] = {
+    "MASSE": "masse",
+    "POUSSEE": "poussee",
+    "TAU_MOTEUR": "tau_moteur",
+    "INERTIE": "inertie",
+}
+
+# Gains tirables : cle -> PID du Controleur qui partagent ces gains
+PARAMETRES_PID: Dict[str, Sequence[str]] = {
+    "PID_Z": ("pid_z",),
+    "PID_POSITION": ("pid_pos_x", "pid_pos_y"),
+    "PID_ATTITUDE": ("pid_att_pitch", "pid_att_roll"),
+}
+
+METRIQUES: Sequence[str] = ("depassement", "depassement_relatif", "temps_etablissement", "erreur_rms", "crash")
+
+
+# ============================
+# Tirage des parametres
+# ============================
+
+def valeurs_nominales() -> Dict[str, np.ndarray]:
+    """Retourne les valeurs nominales de chaque parametre tirable."""
+    controleur = SimulateurSansRendu().controleur
+    nominaux = {cle: np.atleast_1d(np.asarray(phys[cle], dtype=float)) for cle in PARAMETRES_PHYSIQUES}
+    for cle, pids in PARAMETRES_PID.items():
+        c = getattr(controleur, pids[0]).coeff
+        nominaux[cle] = np.array([c.proportionnel, c.integral, c.derive], dtype=float)
+    return nominaux
+
+
+def tirer_valeur(loi: Sequence[Any], nominal: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Tire une valeur (de meme forme que nominal) selon une loi ("nom", parametres...)."""
+    nom = loi[0]
+    if nom == "fixe":
+        return np.broadcast_to(np.asarray(loi[1], dtype=float), nominal.shape).copy()
+    if nom == "uniforme":
+        return rng.uniform(loi[1], loi[2], size=nominal.shape)
+    if nom == "normale":
+        return rng.normal(loi[1], loi[2], size=nominal.shape)
+    if nom == "normale_relative":
+        return nominal * (1.0 + rng.normal(0.0, loi[1], size=nominal.shape))
+    raise ValueError(f"Loi de tirage inconnue : {nom!r}")
+
+
+def preparer_vols(
+    nb_vols: int,
+    distributions: Dict[str, Sequence[Any]],
+    graine: int
+) -> List[Dict[str, Any]]:
+    """Tire les parametres de chaque vol ; chaque vol recoit sa propre graine, derivee de `graine`."""
+    inconnues = set(distributions) - set(PARAMETRES_PHYSIQUES) - set(PARAMETRES_PID)
+    if inconnues:
+        raise ValueError(f"Parametres non tirables : {', '.join(sorted(inconnues))}")
+
+    nominaux = valeurs_nominales()
+    vols = []
+    for numero, sequence in enumerate(np.random.SeedSequence(graine).spawn(nb_vols)):
+        rng = np.random.default_rng(sequence)
+        parametres = {cle: tirer_valeur(loi, nominaux[cle], rng).tolist() for cle, loi in distributions.items()}
+        vols.append({
+            "vol": numero,
+            "graine": int(sequence.generate_state(1)[0]),
+            "parametres": parametres,
+        })
+    return vols
+
+
+# ============================
+# Un vol
+# ============================
+
+def appliquer_parametres(simulateur: SimulateurSansRendu, parametres: Dict[str, Sequence[float]]) -> None:
+    """Ecrit les parametres tires dans la physique (une declinaison de ses ParametresDrone) et les PID du simulateur."""
+    physique = simulateur.physique_drone
+    surcharges = {}
+    for cle, valeurs in parametres.items():
+        if cle in PARAMETRES_PHYSIQUES:
+            surcharges[PARAMETRES_PHYSIQUES[cle]] = valeurs if len(valeurs) > 1 else valeurs[0]
+        else:
+            coeffs = CoefficientsPID(*map(float, valeurs))
+            for nom_pid in PARAMETRES_PID[cle]:
+                getattr(simulateur.controleur, nom_pid).coeff = coeffs
+
+    if surcharges:
+        physique.fixer_parametres(physique.parametres.remplacer(**surcharges))
+
+
+def perturber_etat_initial(simulateur: SimulateurSansRendu, ecarts: Dict[str, float], rng: np.random.Generator) -> None:
+    """Decale aleatoirement position, attitude et vitesse angulaire initiales."""
+    physique = simulateur.physique_drone
+    physique.position_xyz = physique.position_xyz + rng.normal(0.0, ecarts["POSITION"], 3)
+    physique.orientation_rpy = physique.orientation_rpy + rng.normal(0.0, ecarts["ORIENTATION"], 3)
+    physique.vitesse_angulaire_rpy = physique.vitesse_angulaire_rpy + rng.normal(0.0, ecarts["VITESSE_ANGULAIRE"], 3)
+    simulateur.controleur.reinitialiser(physique.position_xyz)
+
+
+def calculer_metriques(
+    resultat: ResultatSimulation,
+    position_initiale: np.ndarray,
+    consigne_xyz: Sequence[float],
+    bande_relative: float = spec_bal["BANDE_ETABLISSEMENT"],
+    bande_min: float = spec_bal["BANDE_ETABLISSEMENT_MIN"]
+) -> Dict[str, float]:
+    """Depassement, temps d'etablissement et crash sur z ; erreur RMS sur la position 3D."""
+    z = resultat.position_xyz[:, 2]
+    consigne_z = float(consigne_xyz[2])
+    echelon = consigne_z - float(position_initiale[2])
+
+    # Depassement dans le sens de l'echelon (m, et fraction de l'echelon)
+    sens = 1.0 if echelon >= 0.0 else -1.0
+    depassement = max(0.0, float(np.max(sens * (z - consigne_z))))
+    depassement_relatif = depassement / abs(echelon) if abs(echelon) > 1e-9 else math.nan
+
+    # Temps d'etablissement : dernier instant hors de la bande autour de la consigne
+    bande = max(bande_relative * abs(echelon), bande_min)
+    hors_bande = np.flatnonzero(np.abs(z - consigne_z) > bande)
+    if hors_bande.size == 0:
+        temps_etablissement = 0.0
+    elif hors_bande[-1] == len(z) - 1:
+        temps_etablissement = math.nan  # non etabli en fin de vol
+    else:
+        temps_etablissement = float(resultat.t[hors_bande[-1]])
+
+    erreur = resultat.position_xyz - np.asarray(consigne_xyz, dtype=float)
+    erreur_rms = float(np.sqrt(np.mean(np.sum(erreur**2, axis=1))))
+
+    return {
+        "depassement": depassement,
+        "depassement_relatif": depassement_relatif,
+        "temps_etablissement": temps_etablissement,
+        "erreur_rms": erreur_rms,
+        "crash": bool(resultat.crash.any()),
+    }
+
+
+def simuler_vol(tache: Dict[str, Any]) -> Dict[str, Any]:
+    """Simule un vol sans rendu et retourne une ligne : numero, graine, parametres a plat, metriques.
+
+    Fonction de module, pour etre executee dans un processus du pool.
+    """
+    rng = np.random.default_rng(tache["graine"])
+    simulateur = SimulateurSansRendu(creer_physique_drone(), dt=tache["dt"])
+    appliquer_parametres(simulateur, tache["parametres"])
+    perturber_etat_initial(simulateur, tache["perturbation"], rng)
+    if tache["turbulence"] is not None:
+        simulateur.physique_drone.perturbations = Perturbations(
+            pas=simulateur.ordonnanceur.pas_physique, turbulence=tache["turbulence"], graine=rng,
+            parametres=simulateur.physique_drone.parametres
+        )
+
+    position_initiale = simulateur.physique_drone.position_xyz.copy()
+    consigne_xyz = (0.0, 0.0, simulateur.controleur.pid_z.consigne)
+    resultat = simulateur.executer(tache["duree"])
+
+    ligne: Dict[str, Any] = {"vol": tache["vol"], "graine": tache["graine"]}
+    for cle, valeurs in tache["parametres"].items():
+        if len(valeurs) == 1:
+            ligne[cle] = valeurs[0]
+        else:
+            for k, valeur in enumerate(valeurs):
+                ligne[f"{cle}_{k}"] = valeur
+    ligne.update(calculer_metriques(resultat, position_initiale, consigne_xyz))
+    return ligne
+
+
+# ============================
+# Balayage complet
+# ============================
+
+def executer_balayage(
+    nb_vols: int = spec_bal["NB_VOLS"],
+    distributions: Optional[Dict[str, Sequence[Any]]] = None,
+    graine: int = spec_bal["GRAINE"],
+    duree: float = spec_bal["DUREE"],
+    dt: float = spec_sim["PAS_FIXE"],
+    perturbation: Optional[Dict[str, float]] = None,
+    turbulence: Optional[Dict[str, Sequence[float]]] = spec_bal["TURBULENCE"],
+    nb_processus: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Repartit les vols sur un pool de processus et retourne une ligne par vol, dans l'ordre.
+
+    Le resultat ne depend que de `graine`, pas du nombre de processus.
+    """
+    vols = preparer_vols(nb_vols, distributions if distributions is not None else spec_bal["DISTRIBUTIONS"], graine)
+    perturbation = perturbation if perturbation is not None else spec_bal["PERTURBATION_INITIALE"]
+    for vol in vols:
+        vol.update(duree=duree, dt=dt, perturbation=perturbation, turbulence=turbulence)
+
+    nb_processus = nb_processus or os.cpu_count() or 1
+    if nb_processus == 1:
+        return [simuler_vol(vol) for vol in vols]
+
+    taille_lot = max(1, len(vols) // (4 * nb_processus))
+    with ProcessPoolExecutor(max_workers=nb_processus) as pool:
+        return list(pool.map(simuler_vol, vols, chunksize=taille_lot))
+
+
+def resumer(lignes: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """Agrege les metriques : moyenne, mediane, 95e centile et max (NaN ignores), taux de crash."""
+    resume: Dict[str, Dict[str, float]] = {}
+    for metrique in METRIQUES:
+        valeurs = np.array([ligne[metrique] for ligne in lignes], dtype=float)
+        if metrique == "crash":
+            resume[metrique] = {"taux": float(valeurs.mean())}
+            continue
+        finies = valeurs[np.isfinite(valeurs)]
+        resume[metrique] = {
+            "moyenne": float(finies.mean()) if finies.size else math.nan,
+            "p50": float(np.percentile(finies, 50)) if finies.size else math.nan,
+            "p95": float(np.percentile(finies, 95)) if finies.size else math.nan,
+            "max": float(finies.max()) if finies.size else math.nan,
+            "non_finis": int(valeurs.size - finies.size),
+        }
+    return resume
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Balayage Monte Carlo de vols sans rendu.")
+    parser.add_argument("--vols", type=int, default=spec_bal["NB_VOLS"])
+    parser.add_argument("--graine", type=int, default=spec_bal["GRAINE"])
+    parser.add_argument("--duree", type=float, default=spec_bal["DUREE"])
+    parser.add_argument("--processus", type=int, default=None, help="par defaut : tous les coeurs")
+    parser.add_argument("--sortie", type=str, default=None, help="fichier CSV des resultats par vol")
+    args = parser.parse_args()
+
+    debut = time.perf_counter()
+    lignes = executer_balayage(args.vols, graine=args.graine, duree=args.duree, nb_processus=args.processus)
+    log(f"{len(lignes)} vols en {time.perf_counter() - debut:.1f} s")
+
+    for metrique, stats in resumer(lignes).items():
+        log(f"{metrique} : " + ", ".join(f"{nom} = {valeur:.4g}" for nom, valeur in stats.items()))
+
+    if args.sortie:
+        dossier, nom = os.path.split(args.sortie)
+        chemin = ecrire_lignes_csv(dossier or ".", nom, lignes)
+        log(f"Resultats ecrits dans {chemin}")
+
+
+if __name__ == "__main__":
+    main()
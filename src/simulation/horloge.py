@@ -0,0 +1,56 @@
+import math
+from typing import Optional
+from utiles.constantes import specifications_simulation as spec_sim
+
+
+class HorlogeSimulation:
+    """Convertit le temps reel en temps simule, avec une echelle modifiable en cours de simulation.
+
+    echelle < 1 : ralenti ; echelle > 1 : k fois le temps reel ; None : aussi
+    vite que possible. L'echelle est une seule valeur, ecrite par l'interface et
+    lue par le fil de simulation.
+
+    Plus vite que le temps reel, l'affichage n'a pas besoin de chaque trame :
+    trame_a_rendre() n'en laisse rendre qu'une sur saut_trames (les taches et
+    evenements de Panda3D avancent a chaque trame).
+    """
+
+    def __init__(
+        self,
+        echelle: Optional[float] = spec_sim["ECHELLE_TEMPS"],
+        saut_trames_max: int = spec_sim["SAUT_TRAMES_MAX"]
+    ) -> None:
+        """Initialise l'echelle et le compteur de trames."""
+        self.saut_trames_max: int = max(1, int(saut_trames_max))
+        self.echelle: Optional[float] = None
+        self.fixer_echelle(echelle)
+        self._trames: int = 0
+
+    @property
+    def aussi_vite_que_possible(self) -> bool:
+        return self.echelle is None
+
+    def fixer_echelle(self, echelle: Optional[float]) -> None:
+        """Change l'echelle de temps ; None pour aller aussi vite que possible."""
+        if echelle is not None and not echelle > 0.0:
+            raise ValueError(f"Echelle de temps invalide : {echelle}.")
+        self.echelle = None if echelle is None else float(echelle)
+
+    def convertir(self, dt_reel: float) -> float:
+        """Temps simule correspondant a dt_reel secondes reelles (hors mode aussi vite que possible)."""
+        return dt_reel * self.echelle
+
+    @property
+    def saut_trames(self) -> int:
+        """Une trame rendue sur saut_trames."""
+        if self.echelle is None:
+            return self.saut_trames_max
+        return min(self.saut_trames_max, max(1, math.ceil(self.echelle)))
+
+    def trame_a_rendre(self) -> bool:
+        """True pour la trame courante si elle doit etre rendue."""
+        self._trames += 1
+        if self._trames >= self.saut_trames:
+            self._trames = 0
+            return True
+        return False
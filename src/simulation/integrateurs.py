@@ -0,0 +1,226 @@
+import numpy as np
+from typing import Dict, Optional, Tuple, Type
+from utiles.constantes import physique as phys
+
+
+class Integrateur:
+    """Interface commune : avance une PhysiqueDrone d'un pas dt."""
+    nom: str = ""
+    adaptatif: bool = False  # True si l'integrateur choisit lui-meme ses sous-pas
+
+    def etape(self, physique, vitesses_cibles: np.ndarray, dt: float) -> None:
+        """Integre l'etat de `physique` sur dt, commandes moteur constantes."""
+        raise NotImplementedError
+
+
+class EulerSemiImplicite(Integrateur):
+    """Euler semi-implicite : vitesses d'abord, puis positions avec les nouvelles vitesses.
+
+    C'est le schema historique de PhysiqueDrone, repris tel quel (noyau compris).
+    """
+    nom = "euler_semi_implicite"
+
+    def etape(self, physique, vitesses_cibles: np.ndarray, dt: float) -> None:
+        if physique.mode_noyau:
+            physique._etape_noyau(vitesses_cibles, dt)
+        else:
+            physique._etape_euler(vitesses_cibles, dt)
+
+
+class RK4(Integrateur):
+    """Runge-Kutta classique d'ordre 4 sur le vecteur d'etat complet."""
+    nom = "rk4"
+
+    def etape(self, physique, vitesses_cibles: np.ndarray, dt: float) -> None:
+        cibles = np.asarray(vitesses_cibles, dtype=float)
+        f = physique.derivees_etat
+        y = physique.lire_etat()
+
+        k1 = f(y, cibles)
+        k2 = f(y + 0.5 * dt * k1, cibles)
+        k3 = f(y + 0.5 * dt * k2, cibles)
+        k4 = f(y + dt * k3, cibles)
+
+        physique.ecrire_etat(y + dt / 6.0 * (k1 + 2.0 * k2 + 2.0 * k3 + k4))
+        physique._gestion_sol_et_stabilisation(dt)
+
+
+class RK45Adaptatif(Integrateur):
+    """Dormand-Prince 5(4) a pas adaptatif, avec localisation exacte du contact au sol.
+
+    Le pas interne grandit tant que l'erreur estimee reste sous la tolerance et
+    retrecit sinon. Quand un pas accepte traverse le sol, l'instant d'impact est
+    trouve par dichotomie sur l'interpolation d'Hermite de z, puis l'etat est
+    integre exactement jusqu'a cet instant avant d'appliquer le rebond : le
+    resultat ne depend plus du pas choisi par l'appelant.
+
+    Le pas interne et la derniere derivee (FSAL) sont conserves d'un appel a
+    l'autre : si l'etat, les commandes et les perturbations n'ont pas change
+    depuis, le premier etage n'est pas reevalue.
+    """
+    nom = "rk45"
+    adaptatif = True
+
+    # Tableau de Butcher de Dormand-Prince (derniere ligne de A = poids d'ordre 5, FSAL)
+    A: Tuple[Tuple[float, ...], ...] = (
+        (),
+        (1/5,),
+        (3/40, 9/40),
+        (44/45, -56/15, 32/9),
+        (19372/6561, -25360/2187, 64448/6561, -212/729),
+        (9017/3168, -355/33, 46732/5247, 49/176, -5103/18656),
+        (35/384, 0.0, 500/1113, 125/192, -2187/6784, 11/84),
+    )
+    # Difference entre poids d'ordre 5 et d'ordre 4, pour l'estimation d'erreur
+    E: Tuple[float, ...] = (
+        71/57600, 0.0, -71/16695, 71/1920, -17253/339200, 22/525, -1/40
+    )
+
+    def __init__(
+        self,
+        tolerance_relative: float = phys["RK45_TOLERANCE_RELATIVE"],
+        tolerance_absolue: float = phys["RK45_TOLERANCE_ABSOLUE"],
+        pas_min: float = phys["RK45_PAS_MIN"],
+        pas_max: float = phys["RK45_PAS_MAX"]
+    ) -> None:
+        """Initialise les tolerances, les bornes du pas et les compteurs."""
+        self.tolerance_relative: float = tolerance_relative
+        self.tolerance_absolue: float = tolerance_absolue
+        self.pas_min: float = pas_min
+        self.pas_max: float = pas_max
+
+        # Pas propose pour le prochain sous-pas, conserve d'un appel a l'autre
+        self.h: float = 1.0 / phys["FREQUENCE_PHYSIQUE"]
+
+        # Compteurs
+        self.nb_evaluations: int = 0
+        self.nb_pas_acceptes: int = 0
+        self.nb_pas_rejetes: int = 0
+        self.nb_impacts: int = 0
+
+        # Temps integre depuis la creation, et (instant, vitesse verticale apres rebond) du dernier impact
+        self.temps: float = 0.0
+        self.dernier_impact: Optional[Tuple[float, float]] = None
+
+        # Fin du dernier appel : etat, derivee en cet etat, et entrees avec lesquelles elle a ete evaluee
+        self._y: Optional[np.ndarray] = None
+        self._k1: Optional[np.ndarray] = None
+        self._entrees: Optional[np.ndarray] = None
+
+    def _pas(self, f, y: np.ndarray, k1: np.ndarray, h: float, cibles: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Un pas de Dormand-Prince : retourne (y5, f(y5), erreur estimee)."""
+        k = [k1]
+        for a in self.A[1:]:
+            yi = y + h * sum(aj * kj for aj, kj in zip(a, k) if aj != 0.0)
+            k.append(f(yi, cibles))
+        y5 = yi                     # FSAL : le dernier etage est evalue en y5
+        self.nb_evaluations += 6
+
+        erreur = h * sum(ej * kj for ej, kj in zip(self.E, k) if ej != 0.0)
+        return y5, k[-1], erreur
+
+    def _norme_erreur(self, y: np.ndarray, y5: np.ndarray, erreur: np.ndarray) -> float:
+        """Norme RMS de l'erreur ponderee par les tolerances (acceptee si <= 1)."""
+        echelle = self.tolerance_absolue + self.tolerance_relative * np.maximum(np.abs(y), np.abs(y5))
+        return float(np.sqrt(np.mean((erreur / echelle) ** 2)))
+
+    def _fraction_contact(self, z0: float, vz0: float, z1: float, vz1: float, h: float, hauteur_min: float) -> float:
+        """Fraction du pas ou l'interpolation d'Hermite de z atteint la hauteur minimale."""
+        z0 -= hauteur_min
+        z1 -= hauteur_min
+        bas, haut = 0.0, 1.0
+        for _ in range(60):
+            s = 0.5 * (bas + haut)
+            s2, s3 = s * s, s * s * s
+            z = (
+                (2*s3 - 3*s2 + 1) * z0 + (s3 - 2*s2 + s) * h * vz0 +
+                (-2*s3 + 3*s2) * z1 + (s3 - s2) * h * vz1
+            )
+            if z > 0.0:
+                bas = s
+            else:
+                haut = s
+        return haut
+
+    def etape(self, physique, vitesses_cibles: np.ndarray, dt: float) -> None:
+        cibles = np.asarray(vitesses_cibles, dtype=float)
+        f = physique.derivees_etat
+        hauteur_min = physique.hauteur_min
+
+        y = physique.lire_etat()
+        entrees = np.concatenate((cibles, physique.force_externe, physique.couple_externe))
+        if self._y is not None and np.array_equal(y, self._y) and np.array_equal(entrees, self._entrees):
+            k1 = self._k1
+        else:
+            k1 = f(y, cibles)
+            self.nb_evaluations += 1
+        t = 0.0
+        contact = False
+
+        while dt - t > 1e-12:
+            h = min(self.h, dt - t)
+            raccourci = h < self.h  # pas tronque a la fin de l'intervalle
+            y5, k7, erreur = self._pas(f, y, k1, h, cibles)
+            norme = self._norme_erreur(y, y5, erreur)
+
+            # Nouveau pas propose (facteur de securite 0.9, variation bornee)
+            facteur = 5.0 if norme == 0.0 else min(5.0, max(0.2, 0.9 * norme ** -0.2))
+
+            if norme > 1.0 and h > self.pas_min:
+                self.h = max(self.pas_min, h * facteur)
+                self.nb_pas_rejetes += 1
+                continue
+
+            self.nb_pas_acceptes += 1
+            g0 = y[2] - hauteur_min
+            g1 = y5[2] - hauteur_min
+
+            if g0 > 1e-9 and g1 < 0.0:
+                # Impact : integration exacte jusqu'a l'instant de contact
+                h_contact = h * self._fraction_contact(y[2], y[5], y5[2], y5[5], h, hauteur_min)
+                y_contact, _, _ = self._pas(f, y, k1, h_contact, cibles)
+                physique.ecrire_etat(y_contact)
+                physique._reponse_sol(hauteur_min, 0.0)
+                t += h_contact
+                self.nb_impacts += 1
+                self.dernier_impact = (self.temps + t, float(physique.vitesse_xyz[2]))
+            elif g1 < 0.0:
+                # Deja au contact : la reaction du sol annule la vitesse de penetration,
+                # seuls le maintien au sol et les frottements s'appliquent sur le sous-pas
+                y5[5] = max(0.0, y5[5])
+                physique.ecrire_etat(y5)
+                physique._reponse_sol(hauteur_min, h)
+                t += h
+            else:
+                y, k1 = y5, k7
+                t += h
+                # Un pas tronque ne fait pas oublier le pas propose, sauf si l'erreur demande de le reduire
+                propose = min(self.pas_max, h * facteur)
+                self.h = max(self.h, propose) if raccourci and facteur >= 1.0 else propose
+                continue
+
+            # Discontinuite de l'etat : on repart de l'etat corrige
+            contact = True
+            y = physique.lire_etat()
+            k1 = f(y, cibles)
+            self.nb_evaluations += 1
+
+        physique.ecrire_etat(y)
+        physique.crash = contact
+        self.temps += dt
+        self._y, self._k1, self._entrees = physique.lire_etat(), k1, entrees
+
+
+INTEGRATEURS: Dict[str, Type[Integrateur]] = {
+    EulerSemiImplicite.nom: EulerSemiImplicite,
+    RK4.nom: RK4,
+    RK45Adaptatif.nom: RK45Adaptatif,
+}
+
+
+def creer_integrateur(nom: str) -> Integrateur:
+    """Instancie l'integrateur enregistre sous `nom`."""
+    try:
+        return INTEGRATEURS[nom]()
+    except KeyError:
+        raise ValueError(f"Integrateur inconnu : {nom!r} (disponibles : {', '.join(INTEGRATEURS)})") from None
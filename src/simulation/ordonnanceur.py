@@ -0,0 +1,84 @@
+import math
+from typing import Callable, Optional
+from utiles.constantes import physique as phys, specifications_simulation as spec_sim
+
+
+class Ordonnanceur:
+    """Cadence physique, controle et interface a des frequences fixes distinctes.
+
+    Le temps reel (dt de rendu, variable) s'accumule ; il est consomme par pas
+    physiques fixes. Le controle s'execute tous les `ratio_controle` pas
+    physiques, avec un dt qui vaut exactement sa periode. Le rendu suit
+    l'affichage : il montre le dernier etat, quel que soit le nombre de pas
+    effectues depuis la trame precedente, et l'interface n'est notifiee qu'a
+    `frequence_interface`.
+
+    avancer() et interface_due() ne partagent aucun etat : la simulation peut
+    avancer sur un fil et l'interface etre cadencee sur un autre.
+    """
+
+    def __init__(
+        self,
+        frequence_physique: float = phys["FREQUENCE_PHYSIQUE"],
+        frequence_controle: float = spec_sim["FREQUENCE_CONTROLE"],
+        frequence_interface: float = spec_sim["FREQUENCE_INTERFACE"],
+        nb_pas_max: int = phys["NB_SOUS_PAS_MAX"]
+    ) -> None:
+        """Initialise les periodes ; la periode de controle est un multiple entier du pas physique."""
+        self.pas_physique: float = 1.0 / frequence_physique
+        # Un pas est du des que l'accumulateur l'atteint, aux erreurs d'arrondi des soustractions pres
+        self._seuil_pas: float = self.pas_physique * (1.0 - 1e-9)
+        self.ratio_controle: int = max(1, round(frequence_physique / frequence_controle))
+        self.pas_controle: float = self.ratio_controle * self.pas_physique
+        self.periode_interface: float = 1.0 / frequence_interface
+        self.nb_pas_max: int = int(nb_pas_max)
+
+        self.accumulateur: float = 0.0
+        self.temps_interface: float = math.inf  # premiere trame : interface notifiee
+        self.reinitialiser_compteurs()
+
+    def reinitialiser_compteurs(self) -> None:
+        """Remet a zero le temps simule et les compteurs."""
+        self.t: float = 0.0                 # temps simule
+        self.nb_pas_physique: int = 0
+        self.nb_pas_controle: int = 0
+        self.nb_pas_abandonnes: int = 0     # retard abandonne quand nb_pas_max est atteint
+
+    def avancer(
+        self,
+        dt: float,
+        controle: Callable[[float], None],
+        physique: Callable[[float], None],
+        nb_pas_max: Optional[int] = None
+    ) -> int:
+        """Consomme dt de temps simule : pas de controle et pas physiques dus. Retourne le nombre de pas physiques.
+
+        nb_pas_max remplace self.nb_pas_max pour cet appel (echelle de temps > 1).
+        """
+        if nb_pas_max is None:
+            nb_pas_max = self.nb_pas_max
+        self.accumulateur += dt
+        nb_pas = 0
+        while self.accumulateur >= self._seuil_pas and nb_pas < nb_pas_max:
+            if self.nb_pas_physique % self.ratio_controle == 0:
+                controle(self.pas_controle)
+                self.nb_pas_controle += 1
+            physique(self.pas_physique)
+
+            self.accumulateur -= self.pas_physique
+            self.nb_pas_physique += 1
+            self.t = self.nb_pas_physique * self.pas_physique
+            nb_pas += 1
+
+        if self.accumulateur >= self._seuil_pas:
+            self.nb_pas_abandonnes += int(self.accumulateur / self.pas_physique)
+            self.accumulateur = 0.0
+        return nb_pas
+
+    def interface_due(self, dt: float) -> bool:
+        """Compte dt de rendu ; True au plus une fois par periode d'interface, les trames intermediaires sont sautees."""
+        self.temps_interface += dt
+        if self.temps_interface < self.periode_interface:
+            return False
+        self.temps_interface = 0.0
+        return True
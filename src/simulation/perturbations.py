@@ -0,0 +1,175 @@
+import math
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Union
+import numpy as np
+
+from utiles.constantes import (
+    physique as phys,
+    perturbations as pert
+)
+from utiles.parametres import ParametresDrone
+
+
+@dataclass
+class Rafale:
+    """Rafale discrete en 1 - cosinus : le vent passe de 0 a `amplitude` puis revient a 0 sur `duree`."""
+    debut: float                # s
+    duree: float                # s
+    amplitude: Sequence[float]  # m/s, repere monde, (3,) commune ou (N, 3) par drone
+
+    def vitesse(self, t: np.ndarray) -> np.ndarray:
+        """Vent de la rafale aux instants t (B,), de forme (B, 1, 3) ou (B, N, 3)."""
+        s = (t - self.debut) / self.duree
+        profil = np.where((s >= 0.0) & (s <= 1.0), 0.5 * (1.0 - np.cos(2.0 * np.pi * s)), 0.0)
+        return profil[:, None, None] * np.asarray(self.amplitude, dtype=float)
+
+
+def filtrer_premier_ordre(bruit: np.ndarray, a: np.ndarray, etat: np.ndarray) -> np.ndarray:
+    """Applique x[k] = a x[k-1] + bruit[k] le long de l'axe 0, sans boucle sur les pas.
+
+    Forme fermee x[k] = a^k (x[-1] + somme_j a^-j bruit[j]), evaluee par tranches
+    assez courtes pour que a^-k reste borne. `a` porte sur le dernier axe ; `etat`
+    (le dernier x) est mis a jour en place.
+    """
+    nb_pas = len(bruit)
+    sortie = np.empty_like(bruit)
+    log_a = np.log(a)
+    tranche = int(min(nb_pas, max(1.0, 20.0 / max(-float(log_a.min()), 1e-12))))
+
+    for debut in range(0, nb_pas, tranche):
+        fin = min(nb_pas, debut + tranche)
+        k = np.arange(1, fin - debut + 1, dtype=float).reshape((-1,) + (1,) * (bruit.ndim - 1))
+        puissances = np.exp(k * log_a)
+        sortie[debut:fin] = puissances * (etat + np.cumsum(bruit[debut:fin] / puissances, axis=0))
+        etat[...] = sortie[fin - 1]
+    return sortie
+
+
+class Perturbations:
+    """Vent constant, rafales et turbulence de Dryden pour N drones, convertis en forces et couples.
+
+    Le vent (repere monde) donne une force aerodynamique quasi statique
+    0.5 rho S Cd |u| u par axe, le meme modele que la trainee du drone
+    immobile. Les rafales angulaires de la turbulence agissent par
+    l'amortissement angulaire.
+
+    La turbulence suit un modele de Dryden du premier ordre (gel de Taylor a la
+    vitesse de reference). Le bruit est genere par blocs de `taille_bloc` pas
+    pour tous les drones a la fois ; appliquer() ne fait qu'indexer le bloc courant.
+
+    Surfaces, coefficients de trainee, densite de l'air, envergure et
+    amortissement angulaire sont ceux des ParametresDrone de la physique
+    perturbee : appliquer() adopte ses parametres s'ils ont change.
+    """
+
+    def __init__(
+        self,
+        nb_drones: int = 1,
+        pas: float = 1.0 / phys["FREQUENCE_PHYSIQUE"],
+        vent_constant: Sequence[float] = pert["VENT_CONSTANT"],
+        rafales: Sequence[Rafale] = (),
+        turbulence: Optional[Dict[str, Sequence[float]]] = pert["TURBULENCE"],
+        vitesse_reference: float = pert["VITESSE_REFERENCE"],
+        taille_bloc: int = pert["TAILLE_BLOC"],
+        graine: Union[None, int, np.random.Generator] = None,
+        parametres: Optional[ParametresDrone] = None
+    ) -> None:
+        """Initialise les sources de vent, les filtres de turbulence et le premier bloc.
+
+        turbulence : INTENSITE (m/s), ECHELLE (m) et INTENSITE_ANGULAIRE (rad/s)
+        par axe, ou None pour la desactiver.
+        parametres : ParametresDrone du drone perturbe ; ceux des constantes par defaut.
+        """
+        self.nb_drones: int = int(nb_drones)
+        self.pas: float = float(pas)
+        self.taille_bloc: int = int(taille_bloc)
+        self.vent_constant: np.ndarray = np.asarray(vent_constant, dtype=float)
+        self.rafales = list(rafales)
+        self.rng: np.random.Generator = np.random.default_rng(graine)
+        self.t: float = 0.0
+
+        # Turbulence : 3 vitesses lineaires puis 3 vitesses angulaires, filtres du 1er ordre
+        self.turbulence: bool = turbulence is not None
+        self.vitesse_reference: float = float(vitesse_reference)
+        if self.turbulence:
+            self._echelles: np.ndarray = np.asarray(turbulence["ECHELLE"], dtype=float)
+            self._ecarts_types: np.ndarray = np.concatenate((
+                np.asarray(turbulence["INTENSITE"], dtype=float),
+                np.asarray(turbulence["INTENSITE_ANGULAIRE"], dtype=float)
+            ))
+
+        # Coefficients aerodynamiques et filtres du drone
+        self.fixer_parametres(parametres if parametres is not None else ParametresDrone())
+        if self.turbulence:
+            # Etat initial tire dans la loi stationnaire : pas de regime transitoire
+            self._etat: np.ndarray = self._ecarts_types * self.rng.standard_normal((self.nb_drones, 6))
+
+        # Bloc courant
+        self._fin_bloc: int = 0  # indice (en pas) suivant le dernier echantillon genere
+        self._generer_bloc()
+
+    def fixer_parametres(self, parametres: ParametresDrone) -> None:
+        """Adopte les parametres du drone : force aerodynamique, amortissement et filtres angulaires.
+
+        Le bloc courant, s'il existe, est recalcule ; le bruit deja tire est conserve.
+        """
+        self.parametres: ParametresDrone = parametres
+
+        # Force quasi statique par axe : 0.5 rho S Cd
+        self._coeffs_aero: np.ndarray = -parametres.coeffs_trainee_corps
+        self.amortissement_ang: float = parametres.amortissement_angulaire
+
+        if self.turbulence:
+            V = self.vitesse_reference
+            envergure = 2 * parametres.longueur_bras
+            constantes_temps = np.concatenate((self._echelles / V, np.full(3, 4 * envergure / (math.pi * V))))
+            self._a: np.ndarray = np.exp(-self.pas / constantes_temps)
+            self._gain: np.ndarray = self._ecarts_types * np.sqrt(1.0 - self._a**2)
+
+        if hasattr(self, "vent"):
+            self._calculer_efforts()
+
+    def _generer_bloc(self) -> None:
+        """Calcule vent, forces et couples des `taille_bloc` pas suivants, pour tous les drones."""
+        B, N = self.taille_bloc, self.nb_drones
+        t = (self._fin_bloc + np.arange(B)) * self.pas
+
+        vent = np.empty((B, N, 3))
+        vent[:] = self.vent_constant
+        for rafale in self.rafales:
+            vent += rafale.vitesse(t)
+
+        if self.turbulence:
+            bruit = self.rng.standard_normal((B, N, 6))
+            bruit *= self._gain
+            turbulence = filtrer_premier_ordre(bruit, self._a, self._etat)
+            vent += turbulence[..., :3]
+            self.vitesses_angulaires: np.ndarray = turbulence[..., 3:]
+        else:
+            self.vitesses_angulaires = np.zeros((B, N, 3))
+
+        self.vent: np.ndarray = vent
+        self._calculer_efforts()
+        self._fin_bloc += B
+
+    def _calculer_efforts(self) -> None:
+        """Forces et couples du bloc courant, a partir du vent et des rafales angulaires."""
+        self.forces: np.ndarray = self._coeffs_aero * np.abs(self.vent) * self.vent
+        self.couples: np.ndarray = self.amortissement_ang * self.vitesses_angulaires
+
+    def appliquer(self, physique, dt: float) -> None:
+        """Ecrit force_externe et couple_externe de l'instant courant dans `physique`, puis avance de dt.
+
+        `physique` est une PhysiqueDrone (N = 1) ou une PhysiqueEssaim. Le bruit est
+        echantillonne au pas `pas` et maintenu entre deux echantillons si dt differe.
+        """
+        if physique.parametres is not self.parametres:
+            self.fixer_parametres(physique.parametres)
+        indice = int(self.t / self.pas + 1e-9)
+        while indice >= self._fin_bloc:
+            self._generer_bloc()
+        k = indice - (self._fin_bloc - self.taille_bloc)
+
+        physique.force_externe[...] = self.forces[k].reshape(physique.force_externe.shape)
+        physique.couple_externe[...] = self.couples[k].reshape(physique.couple_externe.shape)
+        self.t += dt
@@ -1,16 +1,37 @@
+import math
 import numpy as np
-from typing import Iterable
+from typing import Iterable, Optional
 from utiles.constantes import (
     physique as phys,
-    specifications_simulation as spec_sim,
-    specifications_drone as spec_drone
+    specifications_simulation as spec_sim
 )
-from utiles.transformations import produit_vectoriel_gyroscopique, matrice_rotation
+from utiles.transformations import (
+    produit_vectoriel_gyroscopique,
+    matrice_rotation,
+    matrice_rotation_quaternion,
+    quaternion_depuis_euler,
+    euler_depuis_quaternion,
+    produit_quaternion
+)
+from utiles.parametres import ParametresDrone
+from simulation.integrateurs import Integrateur, creer_integrateur
+from simulation.perturbations import Perturbations
 
 
 class PhysiqueDrone:
-    def __init__(self) -> None:
-        """Initialise l'etat physique complet du drone."""
+    def __init__(
+        self,
+        mode_noyau: bool = False,
+        integrateur: Optional[str] = None,
+        parametres: Optional[ParametresDrone] = None
+    ) -> None:
+        """Initialise l'etat physique complet du drone.
+
+        mode_noyau : utilise le noyau sans allocation (tampons pre-alloues,
+        rotation calculee une seule fois par pas).
+        integrateur : nom du schema d'integration, phys["INTEGRATEUR"] par defaut.
+        parametres : ParametresDrone, partageable entre drones ; ceux des constantes par defaut.
+        """
         self.position_xyz: np.ndarray = np.array(phys["POSITION_INITIALE"], dtype=float)
         self.vitesse_xyz: np.ndarray = np.zeros(3)
 
@@ -21,35 +42,65 @@ class PhysiqueDrone:
         self.vitesses_helices_reelles: np.ndarray = np.array(
             spec_sim["VITESSES_ROTATION_HELICES"], dtype=float
         )
-        self.tau_moteur: float = phys["TAU_MOTEUR"]
-
-        # Parametre drone
-        self.surface_drone_lateral: float = 2 * spec_drone["LONGUEUR_BRAS"] * spec_drone["HAUTEUR_DRONE"]
-        self.surface_drone_dessus: float = (2 * spec_drone["LONGUEUR_BRAS"])**2
-        self.coeffs_trainee: np.ndarray = np.array(spec_drone["COEFFS_TRAINEE"])
-
-        # Parametres physiques
-        self.masse: float = phys["MASSE"]
-        self.poussee: float = phys["POUSSEE"]
-        self.Ix, self.Iy, self.Iz = phys["INERTIE"]
-        self.L: float = spec_drone["LONGUEUR_BRAS"]
-        self.k_yaw: float = phys["K_YAW"]
-        self.amortissement_ang: float = phys["AMORTISSEMENT_ANGULAIRE"]
-        self.frottement_ang: float = phys["FROTTEMENT_ANGULAIRE"]
-        self.inertie_rotor: float = phys["INERTIE_ROTOR"]
-        self.densite_air: float = phys["DENSITE_AIR"]   
-        self.frottements: np.ndarray = np.array(
-            [phys["FROTTEMENTS"]["lineaire"],
-            phys["FROTTEMENTS"]["quadratique"]],
-            dtype=float
-        )
 
-        # Sens de rotation (+1 / -1 par helice)
-        self.sens: np.ndarray = np.array(spec_sim["SENS_HELICES"], dtype=float)
+        # Parametres physiques et grandeurs derivees
+        self.fixer_parametres(parametres if parametres is not None else ParametresDrone())
 
         # Verification de crash
         self.crash: bool = False
 
+        # Perturbations exterieures : force (repere monde), couple (repere corps)
+        self.force_externe: np.ndarray = np.zeros(3)
+        self.couple_externe: np.ndarray = np.zeros(3)
+        self.perturbations: Optional[Perturbations] = None
+
+        # Noyau sans allocation
+        self.mode_noyau: bool = mode_noyau
+        if mode_noyau:
+            self.preparer_noyau()
+
+        # Integration (les pas fixes sont cadences par l'Ordonnanceur)
+        self.integrateur: Integrateur = creer_integrateur(integrateur or phys["INTEGRATEUR"])
+
+
+    def fixer_parametres(self, parametres: ParametresDrone) -> None:
+        """Adopte `parametres` : copie les valeurs lues a chaque pas en attributs, grandeurs derivees comprises.
+
+        Seule facon de changer un parametre physique ; l'etat du drone est conserve.
+        """
+        self.parametres: ParametresDrone = parametres
+        p = parametres
+
+        self.tau_moteur: float = p.tau_moteur
+        self.surface_drone_lateral: float = float(p.surface_corps[0])
+        self.surface_drone_dessus: float = float(p.surface_corps[2])
+        self.coeffs_trainee: np.ndarray = np.array(p.coeffs_trainee)
+        self.masse: float = p.masse
+        self.poussee: float = p.poussee
+        self.Ix, self.Iy, self.Iz = p.inertie
+        self.L: float = p.longueur_bras
+        self.k_yaw: float = p.k_yaw
+        self.amortissement_ang: float = p.amortissement_angulaire
+        self.frottement_ang: float = p.frottement_angulaire
+        self.inertie_rotor: float = p.inertie_rotor
+        self.densite_air: float = p.densite_air
+        self.frottements: np.ndarray = np.array([p.frottements_lineaires, p.frottements_quadratiques])
+        self.sens: np.ndarray = np.array(p.sens_helices)  # +1 / -1 par helice
+
+        # Derivees, lues par tous les pipelines
+        self._inertie: np.ndarray = np.array(p.inertie)
+        self._inertie_inv: np.ndarray = p.inertie_inv
+        self._coeffs_gyro: np.ndarray = p.coeffs_gyro
+        self._coeffs_trainee_corps: np.ndarray = p.coeffs_trainee_corps
+        self._k_lineaire: np.ndarray = self.frottements[0]
+        self._k_quadratique: np.ndarray = self.frottements[1]
+        self._poids_z: float = -p.poids
+        self._masse_inv: float = p.masse_inv
+        self._sens_rotor: np.ndarray = self.inertie_rotor * self.sens
+        self._sens_yaw: np.ndarray = self.k_yaw * self.sens
+        self.hauteur_min: float = p.hauteur_min
+        self._seuil_rebond: float = p.seuil_rebond
+        self._coeff_rebond: float = p.coeff_rebond
 
     # 1) Dynamique moteur
     def _maj_moteurs(self, vitesses_cibles: np.ndarray, dt: float) -> None:
@@ -59,23 +110,22 @@ class PhysiqueDrone:
         )
 
 
+    # Rotation corps -> monde de l'attitude courante
+    def _rotation(self) -> np.ndarray:
+        """Retourne la matrice de rotation corps -> monde."""
+        return matrice_rotation(self.orientation_rpy)
+
+
     # 2) Trainee
     def _calcul_trainee(self) -> np.ndarray:
         """Retourne la trainee."""
 
         # Calcul de la vitesse du drone dans le repere corps
-        R = matrice_rotation(self.orientation_rpy) # corps -> monde
+        R = self._rotation() # corps -> monde
         v_corps: np.ndarray = R.T @ self.vitesse_xyz # monde -> corps
         
-        # Surfaces et self.coeffs_trainee par axe (repere corps)
-        surface_corps: np.ndarray = np.array([
-            self.surface_drone_lateral,   # axe X corps
-            self.surface_drone_lateral,   # axe Y corps
-            self.surface_drone_dessus     # axe Z corps (montee/descente)
-        ], dtype=float)
-
-        # Force resultante de trainee
-        trainee: np.ndarray = -0.5 * self.densite_air * surface_corps * self.coeffs_trainee * np.abs(v_corps) * v_corps
+        # Force resultante de trainee : -0.5 rho S Cd |v| v par axe du repere corps
+        trainee: np.ndarray = self._coeffs_trainee_corps * np.abs(v_corps) * v_corps
         
         return R @ trainee # reconversion dans le repere monde
 
@@ -112,8 +162,8 @@ class PhysiqueDrone:
         # Amortissement
         amort = self.amortissement_ang * self.vitesse_angulaire_rpy
 
-        # Acceleration_omega = (tau - gyro - amort)/I
-        alpha = (tau - gyro - amort) / np.array([self.Ix, self.Iy, self.Iz])
+        # Acceleration_omega = (tau + couple_externe - gyro - amort)/I
+        alpha = (tau + self.couple_externe - gyro - amort) * self._inertie_inv
 
         self.vitesse_angulaire_rpy += alpha * dt
         self.orientation_rpy       += self.vitesse_angulaire_rpy * dt
@@ -127,23 +177,23 @@ class PhysiqueDrone:
         pouss_corps = np.array([0.0, 0.0, np.sum(T)]) # la rotation actuelle incline la poussee : composantes horizontales reelles
 
         # Conversion en repere monde
-        R = matrice_rotation(self.orientation_rpy)
+        R = self._rotation()
         pouss_monde = R @ pouss_corps
         
         # Trainee aerodynamique
         trainee = self._calcul_trainee()
 
         # Poids
-        poids = np.array([0.0, 0.0, -9.81 * self.masse])
+        poids = np.array([0.0, 0.0, self._poids_z])
 
         # Frottements, surtout pour eviter les derives en XY
         k_lineaire, k_quadratique = self.frottements
         F_frottements = -k_lineaire * self.vitesse_xyz -k_quadratique * np.linalg.norm(self.vitesse_xyz) * self.vitesse_xyz
 
         # Somme des forces
-        forces = pouss_monde + poids + trainee + F_frottements
+        forces = pouss_monde + poids + trainee + F_frottements + self.force_externe
 
-        acc = forces / self.masse
+        acc = forces * self._masse_inv
         self.vitesse_xyz += acc * dt
         self.position_xyz += self.vitesse_xyz * dt
         
@@ -151,43 +201,241 @@ class PhysiqueDrone:
     # 7) Gestion du sol et stabilisation
     def _gestion_sol_et_stabilisation(self, dt: float) -> None:
         """Gère collision sol + stabilisation artificielle de l'attitude."""
-        hauteur_min = phys["HAUTEUR_SOL"] + 0.2
-
-        if self.position_xyz[2] < hauteur_min:
+        if self.position_xyz[2] < self.hauteur_min:
+            self._reponse_sol(self.hauteur_min, dt)
+        else:
+            self.crash = False
 
-            # Drone au sol, en position horizontale
-            self.position_xyz[2] = hauteur_min
-            self.orientation_rpy[0] = 0.0  # roll
-            self.orientation_rpy[1] = 0.0  # pitch
+    def _reponse_sol(self, hauteur_min: float, dt: float) -> None:
+        """Reponse au contact : blocage, frottements sur dt, amortissement du yaw, rebond.
 
-            vitesse_xy = self.vitesse_xyz[:2]
+        Avec dt = 0, seule la reponse instantanee a l'impact (blocage, rebond) s'applique.
+        """
+        # Drone au sol, en position horizontale
+        self.position_xyz[2] = hauteur_min
+        self.orientation_rpy[0] = 0.0  # roll
+        self.orientation_rpy[1] = 0.0  # pitch
 
-            # Frottements horizontaux au sol
-            if np.linalg.norm(vitesse_xy) > 1e-4:
-                force_frottement_xy = - self.frottement_ang * vitesse_xy
-                self.vitesse_xyz[:2] += force_frottement_xy * dt
-            if np.linalg.norm(vitesse_xy) < 1e-1:
-                self.vitesse_xyz[2] = 0
-                self.vitesse_angulaire_rpy[2] = 0 
+        vitesse_xy = self.vitesse_xyz[:2]
 
-            # Amortissement : il n'a plus de vitesse angulaire
-            self.vitesse_angulaire_rpy[2] *= np.exp(-self.k_yaw * dt)
+        # Frottements horizontaux au sol
+        if np.linalg.norm(vitesse_xy) > 1e-4:
+            force_frottement_xy = - self.frottement_ang * vitesse_xy
+            self.vitesse_xyz[:2] += force_frottement_xy * dt
+        if np.linalg.norm(vitesse_xy) < 1e-1:
+            self.vitesse_xyz[2] = 0
+            self.vitesse_angulaire_rpy[2] = 0 
 
-            # Rebond si l'impact est assez violent
-            if self.vitesse_xyz[2] < -phys["SEUIL_REBOND"]:
-                self.vitesse_xyz[2] = -self.vitesse_xyz[2] * phys["COEFF_REBOND"]
-            else:
-                self.vitesse_xyz[2] = 0.0
+        # Amortissement : il n'a plus de vitesse angulaire
+        self.vitesse_angulaire_rpy[2] *= np.exp(-self.k_yaw * dt)
 
-            self.crash = True
-            
+        # Rebond si l'impact est assez violent
+        if self.vitesse_xyz[2] < -self._seuil_rebond:
+            self.vitesse_xyz[2] = -self.vitesse_xyz[2] * self._coeff_rebond
         else:
+            self.vitesse_xyz[2] = 0.0
+
+        self.crash = True
+
+
+    # Noyau sans allocation
+    def preparer_noyau(self) -> None:
+        """Pre-alloue les tampons du noyau ; les parametres derives viennent de fixer_parametres()."""
+        # Tampons de travail
+        self._R: np.ndarray = np.empty((3, 3))
+        self._R_plat: np.ndarray = self._R.reshape(9)
+        self._cibles: np.ndarray = np.empty(4)
+        self._tmp4: np.ndarray = np.empty(4)
+        self._T: np.ndarray = np.empty(4)
+        self._alpha: np.ndarray = np.empty(3)
+        self._tmp3: np.ndarray = np.empty(3)
+        self._v_corps: np.ndarray = np.empty(3)
+        self._trainee: np.ndarray = np.empty(3)
+        self._forces: np.ndarray = np.empty(3)
+
+    def _remplir_rotation(self) -> None:
+        """Ecrit R = Rz(yaw) Ry(pitch) Rx(roll) dans le tampon, sans allocation de matrice."""
+        roll, pitch, yaw = self.orientation_rpy.tolist()
+        cr, sr = math.cos(roll), math.sin(roll)
+        cp, sp = math.cos(pitch), math.sin(pitch)
+        cy, sy = math.cos(yaw), math.sin(yaw)
+        self._R_plat[:] = (
+            cy * cp, cy * sp * sr - sy * cr, cy * sp * cr + sy * sr,
+            sy * cp, sy * sp * sr + cy * cr, sy * sp * cr - cy * sr,
+            -sp,     cp * sr,                cp * cr
+        )
+
+    def _etape_noyau(self, vitesses_helices: Iterable[float], dt: float) -> None:
+        """Meme pipeline que etape_simulation, ecrit en place dans des tampons pre-alloues."""
+        w = self.vitesses_helices_reelles
+        omega = self.vitesse_angulaire_rpy
+        angles = self.orientation_rpy
+        v = self.vitesse_xyz
+        T, tmp3, tmp4 = self._T, self._tmp3, self._tmp4
+
+        # 1) Moteurs
+        self._cibles[:] = vitesses_helices
+        np.subtract(self._cibles, w, out=tmp4)
+        tmp4 *= dt / self.tau_moteur
+        w += tmp4
+
+        # 2) Poussees
+        np.multiply(w, w, out=T)
+        T *= self.poussee
+        T0, T1, T2, T3 = T.tolist()
+        poussee_totale = T0 + T1 + T2 + T3
+
+        # 3) Moments + couple gyroscopique rotor : omega x (0, 0, Lz)
+        Lz = float(np.dot(self._sens_rotor, w))
+        wx, wy, wz = omega.tolist()
+        alpha = self._alpha
+        alpha[:] = (
+            self.L * (T1 - T3) + wy * Lz,
+            self.L * (T2 - T0) - wx * Lz,
+            float(np.dot(self._sens_yaw, T))
+        )
+        alpha += self.couple_externe
+
+        # 4) Dynamique angulaire : (tau - omega x (I omega) - amort * omega) / I
+        tmp3[:] = (wy * wz, wz * wx, wx * wy)
+        tmp3 *= self._coeffs_gyro
+        alpha -= tmp3
+        np.multiply(omega, self.amortissement_ang, out=tmp3)
+        alpha -= tmp3
+        alpha *= self._inertie_inv
+        alpha *= dt
+        omega += alpha
+        np.multiply(omega, dt, out=tmp3)
+        angles += tmp3
+
+        # 5) Dynamique lineaire, rotation calculee une seule fois
+        self._remplir_rotation()
+        R = self._R
+        forces = self._forces
+
+        np.multiply(R[:, 2], poussee_totale, out=forces)
+
+        np.dot(v, R, out=self._v_corps)   # R.T @ v
+        np.abs(self._v_corps, out=tmp3)
+        tmp3 *= self._v_corps
+        tmp3 *= self._coeffs_trainee_corps
+        np.dot(R, tmp3, out=self._trainee)
+        forces += self._trainee
+
+        np.multiply(self._k_lineaire, v, out=tmp3)
+        forces -= tmp3
+        np.multiply(self._k_quadratique, v, out=tmp3)
+        tmp3 *= math.sqrt(float(np.dot(v, v)))
+        forces -= tmp3
+        forces += self.force_externe
+        forces[2] += self._poids_z
+
+        forces *= dt * self._masse_inv
+        v += forces
+        np.multiply(v, dt, out=tmp3)
+        self.position_xyz += tmp3
+
+        # 6) Sol
+        self._gestion_sol_noyau(dt)
+
+    def _gestion_sol_noyau(self, dt: float) -> None:
+        """Gestion du sol du noyau, sur scalaires et parametres pre-calcules."""
+        p = self.position_xyz
+        if p[2] >= self.hauteur_min:
             self.crash = False
+            return
+
+        v = self.vitesse_xyz
+        omega = self.vitesse_angulaire_rpy
+        p[2] = self.hauteur_min
+        self.orientation_rpy[0] = 0.0
+        self.orientation_rpy[1] = 0.0
+
+        vx, vy, vz = v.tolist()
+        if math.hypot(vx, vy) > 1e-4:
+            vx -= self.frottement_ang * vx * dt
+            vy -= self.frottement_ang * vy * dt
+        wz = float(omega[2])
+        if math.hypot(vx, vy) < 1e-1:
+            vz = 0.0
+            wz = 0.0
+
+        omega[2] = wz * math.exp(-self.k_yaw * dt)
+        v[:] = (vx, vy, -vz * self._coeff_rebond if vz < -self._seuil_rebond else 0.0)
+        self.crash = True
+
+
+    # Vecteur d'etat pour les integrateurs d'ordre eleve
+    def lire_etat(self) -> np.ndarray:
+        """Retourne l'etat (position, vitesse, angles, vitesse angulaire, helices) en un vecteur de 16."""
+        return np.concatenate((
+            self.position_xyz, self.vitesse_xyz,
+            self.orientation_rpy, self.vitesse_angulaire_rpy,
+            self.vitesses_helices_reelles
+        ))
+
+    def ecrire_etat(self, etat: np.ndarray) -> None:
+        """Recopie un vecteur d'etat de 16 dans les attributs, en place."""
+        self.position_xyz[:] = etat[0:3]
+        self.vitesse_xyz[:] = etat[3:6]
+        self.orientation_rpy[:] = etat[6:9]
+        self.vitesse_angulaire_rpy[:] = etat[9:12]
+        self.vitesses_helices_reelles[:] = etat[12:16]
+
+    def derivees_etat(self, etat: np.ndarray, vitesses_cibles: np.ndarray) -> np.ndarray:
+        """Retourne d(etat)/dt pour le modele de forces et moments de etape_simulation (sol exclu)."""
+        v, omega = etat[3:6], etat[9:12]
+        derivees = np.empty(16)
+
+        derivees[0:3] = v
+        derivees[6:9] = omega
+        derivees[3:6], derivees[9:12], derivees[12:16] = self._accelerations(
+            v, matrice_rotation(etat[6:9]), omega, etat[12:16], vitesses_cibles
+        )
+        return derivees
+
+    def _accelerations(
+        self,
+        v: np.ndarray,
+        R: np.ndarray,
+        omega: np.ndarray,
+        w: np.ndarray,
+        vitesses_cibles: np.ndarray
+    ) -> tuple:
+        """Retourne (dv/dt, domega/dt, dw/dt), independamment de la representation de l'attitude."""
+        # Moteurs
+        derivee_moteurs = (vitesses_cibles - w) / self.tau_moteur
+
+        # Moments et dynamique angulaire
+        T = self.poussee * w**2
+        Lz = self.inertie_rotor * np.dot(w, self.sens)
+        tau = np.array([
+            self.L * (T[1] - T[3]) + omega[1] * Lz,
+            self.L * (T[2] - T[0]) - omega[0] * Lz,
+            self.k_yaw * np.dot(self.sens, T)
+        ])
+        gyro = produit_vectoriel_gyroscopique(omega, (self.Ix, self.Iy, self.Iz))
+        alpha = (tau + self.couple_externe - gyro - self.amortissement_ang * omega) * self._inertie_inv
+
+        # Dynamique lineaire
+        v_corps = R.T @ v
+        trainee = R @ (self._coeffs_trainee_corps * np.abs(v_corps) * v_corps)
+        k_lineaire, k_quadratique = self.frottements
+        forces = R[:, 2] * np.sum(T) + trainee - k_lineaire * v - k_quadratique * np.linalg.norm(v) * v + self.force_externe
+        forces[2] += self._poids_z
+
+        return forces * self._masse_inv, alpha, derivee_moteurs
 
 
     # Fonction principale
     def etape_simulation(self, vitesses_helices: Iterable[float], dt: float) -> None:
-        """Pipeline complet : moteurs, forces, moments, dynamique."""
+        """Avance l'etat d'un pas dt avec l'integrateur choisi, perturbations comprises."""
+        if self.perturbations is not None:
+            self.perturbations.appliquer(self, dt)
+        self.integrateur.etape(self, vitesses_helices, dt)
+
+    def _etape_euler(self, vitesses_helices: Iterable[float], dt: float) -> None:
+        """Pipeline historique (Euler semi-implicite) : moteurs, forces, moments, dynamique."""
 
         vitesses_cibles = np.asarray(vitesses_helices, dtype=float)
 
@@ -198,3 +446,120 @@ class PhysiqueDrone:
         self._maj_dynamique_angulaire(tau, dt)
         self._maj_dynamique_lineaire(T, dt)
         self._gestion_sol_et_stabilisation(dt)
+
+
+class PhysiqueDroneQuaternion(PhysiqueDrone):
+    """PhysiqueDrone dont l'attitude est un quaternion unitaire (w, x, y, z).
+
+    La vitesse angulaire est integree comme vitesse du repere corps :
+    dq/dt = 1/2 q * (0, omega). La matrice de rotation se calcule sous forme
+    fermee, sans trigonometrie, et le quaternion est renormalise a chaque pas.
+    Les angles d'Euler ne sont recalcules qu'a la lecture de orientation_rpy
+    (modele 3D, controleur), et n'ont pas de singularite a integrer.
+    """
+
+    def __init__(self, integrateur: Optional[str] = None, parametres: Optional[ParametresDrone] = None) -> None:
+        """Initialise l'etat physique ; le noyau sans allocation n'existe qu'en angles d'Euler."""
+        self._rpy: Optional[np.ndarray] = None
+        self._R: Optional[np.ndarray] = None
+        super().__init__(mode_noyau=False, integrateur=integrateur, parametres=parametres)
+
+    # Attitude
+    @property
+    def orientation_rpy(self) -> np.ndarray:
+        """Angles d'Euler (roll, pitch, yaw), derives du quaternion a la demande."""
+        if self._rpy is None:
+            self._rpy = euler_depuis_quaternion(self.quaternion)
+        return self._rpy
+
+    @orientation_rpy.setter
+    def orientation_rpy(self, angles: Iterable[float]) -> None:
+        self.quaternion: np.ndarray = quaternion_depuis_euler(np.asarray(angles, dtype=float))
+        self._invalider_attitude()
+
+    def _invalider_attitude(self) -> None:
+        """Oublie les angles et la rotation en cache apres une modification du quaternion."""
+        self._rpy = None
+        self._R = None
+
+    def _rotation(self) -> np.ndarray:
+        """Retourne la matrice de rotation, calculee une fois par attitude."""
+        if self._R is None:
+            self._R = matrice_rotation_quaternion(self.quaternion)
+        return self._R
+
+    # 5) Dynamique angulaire
+    def _maj_dynamique_angulaire(self, tau: np.ndarray, dt: float) -> None:
+        """Integre la vitesse angulaire puis le quaternion."""
+        gyro = produit_vectoriel_gyroscopique(self.vitesse_angulaire_rpy, (self.Ix, self.Iy, self.Iz))
+        amort = self.amortissement_ang * self.vitesse_angulaire_rpy
+        alpha = (tau + self.couple_externe - gyro - amort) * self._inertie_inv
+        self.vitesse_angulaire_rpy += alpha * dt
+
+        # q <- q + 1/2 q * (0, omega) dt
+        w, x, y, z = self.quaternion
+        p, q, r = self.vitesse_angulaire_rpy * (0.5 * dt)
+        self.quaternion += (
+            -x * p - y * q - z * r,
+             w * p + y * r - z * q,
+             w * q - x * r + z * p,
+             w * r + x * q - y * p
+        )
+        self._renormaliser()
+
+    def _renormaliser(self) -> None:
+        """Ramene la norme du quaternion a 1 (un pas de Newton sur 1/sqrt, sans racine)."""
+        n2 = float(np.dot(self.quaternion, self.quaternion))
+        self.quaternion *= 0.5 * (3.0 - n2)
+        self._invalider_attitude()
+
+    # 7) Sol
+    def _reponse_sol(self, hauteur_min: float, dt: float) -> None:
+        """Reponse au contact ; roll et pitch remis a zero sont reportes dans le quaternion."""
+        angles = self.orientation_rpy
+        super()._reponse_sol(hauteur_min, dt)
+        self.orientation_rpy = angles
+
+    # Vecteur d'etat : position, vitesse, quaternion, vitesse angulaire, helices (17)
+    def lire_etat(self) -> np.ndarray:
+        """Retourne l'etat complet en un vecteur de 17 (attitude en quaternion)."""
+        return np.concatenate((
+            self.position_xyz, self.vitesse_xyz,
+            self.quaternion, self.vitesse_angulaire_rpy,
+            self.vitesses_helices_reelles
+        ))
+
+    def ecrire_etat(self, etat: np.ndarray) -> None:
+        """Recopie un vecteur d'etat de 17 dans les attributs, quaternion normalise."""
+        self.position_xyz[:] = etat[0:3]
+        self.vitesse_xyz[:] = etat[3:6]
+        self.quaternion[:] = etat[6:10] / np.linalg.norm(etat[6:10])
+        self.vitesse_angulaire_rpy[:] = etat[10:13]
+        self.vitesses_helices_reelles[:] = etat[13:17]
+        self._invalider_attitude()
+
+    def derivees_etat(self, etat: np.ndarray, vitesses_cibles: np.ndarray) -> np.ndarray:
+        """Retourne d(etat)/dt, avec dq/dt = 1/2 q * (0, omega)."""
+        v, omega = etat[3:6], etat[10:13]
+        q = etat[6:10] / np.linalg.norm(etat[6:10])
+        derivees = np.empty(17)
+
+        derivees[0:3] = v
+        derivees[6:10] = 0.5 * produit_quaternion(q, (0.0, omega[0], omega[1], omega[2]))
+        derivees[3:6], derivees[10:13], derivees[13:17] = self._accelerations(
+            v, matrice_rotation_quaternion(q), omega, etat[13:17], vitesses_cibles
+        )
+        return derivees
+
+
+def creer_physique_drone(**options) -> PhysiqueDrone:
+    """Instancie la physique selon phys["ATTITUDE"] : "euler" ou "quaternion".
+
+    En attitude d'Euler, mode_noyau vaut phys["MODE_NOYAU"] s'il n'est pas donne.
+    """
+    if phys["ATTITUDE"] == "quaternion":
+        if options.pop("mode_noyau", False):
+            raise ValueError("Le noyau sans allocation n'existe qu'en attitude d'Euler.")
+        return PhysiqueDroneQuaternion(**options)
+    options.setdefault("mode_noyau", phys["MODE_NOYAU"])
+    return PhysiqueDrone(**options)
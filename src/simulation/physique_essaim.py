@@ -0,0 +1,211 @@
+import numpy as np
+from typing import Optional, Sequence, Union
+from utiles.constantes import physique as phys, specifications_simulation as spec_sim
+from utiles.parametres import ParametresDrone
+from utiles.transformations import matrices_rotation, produits_vectoriels_gyroscopiques
+from simulation.perturbations import Perturbations
+
+
+# Ecart relatif maximal admis entre PhysiqueEssaim (N = 1) et PhysiqueDrone, verifie
+# par tests/test_essaim.py sur les vols de reference (commandes et perturbations communes).
+# Les ecarts viennent uniquement de l'ordre des operations flottantes.
+TOLERANCE_EQUIVALENCE: float = 1e-9
+
+# Parametres propres a chaque drone ; tous les autres doivent etre communs a l'essaim
+PARAMETRES_PAR_DRONE = ("masse", "poussee", "tau_moteur", "inertie")
+
+
+class PhysiqueEssaim:
+    """Etat physique de N drones, avance en une seule etape vectorisee."""
+
+    def __init__(
+        self,
+        nb_drones: int,
+        positions_initiales: Optional[np.ndarray] = None,
+        parametres: Union[None, ParametresDrone, Sequence[ParametresDrone]] = None
+    ) -> None:
+        """Initialise l'etat (N,3)/(N,4) et les parametres (N,) de l'essaim.
+
+        parametres : un ParametresDrone partage par tous les drones, ou un par drone
+        (ParametresDrone.declinaisons) ; seuls PARAMETRES_PAR_DRONE peuvent alors differer.
+        """
+        self.nb_drones: int = int(nb_drones)
+        N = self.nb_drones
+
+        # Etat
+        if positions_initiales is None:
+            positions_initiales = phys["POSITION_INITIALE"]
+        self.position_xyz: np.ndarray = np.empty((N, 3))
+        self.position_xyz[:] = np.asarray(positions_initiales, dtype=float)
+        self.vitesse_xyz: np.ndarray = np.zeros((N, 3))
+
+        self.orientation_rpy: np.ndarray = np.zeros((N, 3))
+        self.vitesse_angulaire_rpy: np.ndarray = np.zeros((N, 3))
+
+        # Modele moteur (1er ordre)
+        self.vitesses_helices_reelles: np.ndarray = np.empty((N, 4))
+        self.vitesses_helices_reelles[:] = np.asarray(spec_sim["VITESSES_ROTATION_HELICES"], dtype=float)
+
+        # Parametres propres a chaque drone, modifiables pour les balayages
+        if parametres is None:
+            parametres = ParametresDrone()
+        liste = [parametres] * N if isinstance(parametres, ParametresDrone) else list(parametres)
+        if len(liste) != N:
+            raise ValueError(f"{len(liste)} jeux de parametres pour {N} drones.")
+        commun = liste[0]
+        communs = [nom for nom in ParametresDrone.noms() if nom not in PARAMETRES_PAR_DRONE]
+        for p in liste:
+            if p is not commun and any(getattr(p, nom) != getattr(commun, nom) for nom in communs):
+                raise ValueError(f"Seuls {', '.join(PARAMETRES_PAR_DRONE)} peuvent differer d'un drone a l'autre.")
+
+        self.tau_moteur: np.ndarray = np.array([p.tau_moteur for p in liste])
+        self.masse: np.ndarray = np.array([p.masse for p in liste])
+        self.poids: np.ndarray = np.array([p.poids for p in liste])
+        self.poussee: np.ndarray = np.array([p.poussee for p in liste])
+        self.inertie: np.ndarray = np.array([p.inertie for p in liste])
+
+        # Parametres communs
+        self.parametres: ParametresDrone = commun
+        self.surface_corps: np.ndarray = commun.surface_corps
+        self.coeffs_trainee: np.ndarray = np.array(commun.coeffs_trainee)
+        self.coeffs_trainee_corps: np.ndarray = commun.coeffs_trainee_corps
+
+        self.L: float = commun.longueur_bras
+        self.k_yaw: float = commun.k_yaw
+        self.amortissement_ang: float = commun.amortissement_angulaire
+        self.frottement_ang: float = commun.frottement_angulaire
+        self.inertie_rotor: float = commun.inertie_rotor
+        self.densite_air: float = commun.densite_air
+        self.k_lineaire: np.ndarray = np.array(commun.frottements_lineaires)
+        self.k_quadratique: np.ndarray = np.array(commun.frottements_quadratiques)
+        self.hauteur_min: float = commun.hauteur_min
+        self.seuil_rebond: float = commun.seuil_rebond
+        self.coeff_rebond: float = commun.coeff_rebond
+
+        # Sens de rotation (+1 / -1 par helice)
+        self.sens: np.ndarray = np.array(commun.sens_helices)
+
+        # Verification de crash, par drone
+        self.crash: np.ndarray = np.zeros(N, dtype=bool)
+
+        # Perturbations exterieures : forces (repere monde), couples (repere corps)
+        self.force_externe: np.ndarray = np.zeros((N, 3))
+        self.couple_externe: np.ndarray = np.zeros((N, 3))
+        self.perturbations: Optional[Perturbations] = None
+
+        # Tampons reutilises a chaque pas
+        self._R: np.ndarray = np.empty((N, 3, 3))
+        self._gyro: np.ndarray = np.empty((N, 3))
+
+
+    # Rotation corps -> monde pour chaque drone
+    def _matrices_rotation(self) -> np.ndarray:
+        """Retourne les N matrices R = Rz(yaw) Ry(pitch) Rx(roll), de forme (N,3,3)."""
+        return matrices_rotation(self.orientation_rpy, out=self._R)
+
+
+    # 1) Dynamique moteur
+    def _maj_moteurs(self, vitesses_cibles: np.ndarray, dt: float) -> None:
+        """Met a jour les vitesses reelles des moteurs (1er ordre)."""
+        self.vitesses_helices_reelles += (
+            (vitesses_cibles - self.vitesses_helices_reelles) * (dt / self.tau_moteur)[:, None]
+        )
+
+
+    # 2) Poussees et moments
+    def _calcul_moments(self, T: np.ndarray) -> np.ndarray:
+        """Calcule les moments (N,3) dans le repere corps, couple gyroscopique rotor inclus."""
+        tau = np.empty((self.nb_drones, 3))
+        tau[:, 0] = self.L * (T[:, 1] - T[:, 3])
+        tau[:, 1] = self.L * (T[:, 2] - T[:, 0])
+        tau[:, 2] = self.k_yaw * (T @ self.sens)
+
+        # omega x (0, 0, Lz)
+        Lz = self.inertie_rotor * (self.vitesses_helices_reelles @ self.sens)
+        tau[:, 0] += self.vitesse_angulaire_rpy[:, 1] * Lz
+        tau[:, 1] -= self.vitesse_angulaire_rpy[:, 0] * Lz
+        return tau
+
+
+    # 3) Dynamique angulaire
+    def _maj_dynamique_angulaire(self, tau: np.ndarray, dt: float) -> None:
+        """Integre les vitesses et angles des N drones."""
+        omega = self.vitesse_angulaire_rpy
+        gyro = produits_vectoriels_gyroscopiques(omega, self.inertie, out=self._gyro)
+        amort = self.amortissement_ang * omega
+
+        alpha = (tau + self.couple_externe - gyro - amort) / self.inertie
+
+        self.vitesse_angulaire_rpy += alpha * dt
+        self.orientation_rpy       += self.vitesse_angulaire_rpy * dt
+
+
+    # 4) Dynamique lineaire
+    def _maj_dynamique_lineaire(self, T: np.ndarray, dt: float) -> None:
+        """Integre la dynamique lineaire des N drones dans le repere monde."""
+        R = self._matrices_rotation()
+        v = self.vitesse_xyz
+
+        # Poussee : troisieme colonne de R fois la poussee totale
+        pouss_monde = R[:, :, 2] * T.sum(axis=1)[:, None]
+
+        # Trainee dans le repere corps, reconvertie dans le repere monde
+        v_corps = np.einsum("nji,nj->ni", R, v)
+        trainee_corps = self.coeffs_trainee_corps * np.abs(v_corps) * v_corps
+        trainee = np.einsum("nij,nj->ni", R, trainee_corps)
+
+        # Frottements
+        norme_v = np.sqrt(np.einsum("ni,ni->n", v, v))[:, None]
+        F_frottements = -self.k_lineaire * v - self.k_quadratique * norme_v * v
+
+        forces = pouss_monde + trainee + F_frottements + self.force_externe
+        forces[:, 2] -= self.poids
+
+        self.vitesse_xyz += forces / self.masse[:, None] * dt
+        self.position_xyz += self.vitesse_xyz * dt
+
+
+    # 5) Gestion du sol et stabilisation
+    def _gestion_sol_et_stabilisation(self, dt: float) -> None:
+        """Applique la collision sol aux seuls drones sous la hauteur minimale."""
+        au_sol = self.position_xyz[:, 2] < self.hauteur_min
+        self.crash[:] = au_sol
+        if not au_sol.any():
+            return
+
+        idx = np.flatnonzero(au_sol)
+        self.position_xyz[idx, 2] = self.hauteur_min
+        self.orientation_rpy[idx, :2] = 0.0
+
+        # Frottements horizontaux au sol
+        v_xy = self.vitesse_xyz[idx, :2]
+        glisse = np.hypot(v_xy[:, 0], v_xy[:, 1]) > 1e-4
+        v_xy[glisse] -= self.frottement_ang * v_xy[glisse] * dt
+        self.vitesse_xyz[idx, :2] = v_xy
+
+        v_z = self.vitesse_xyz[idx, 2]
+        w_z = self.vitesse_angulaire_rpy[idx, 2]
+        arret = np.hypot(v_xy[:, 0], v_xy[:, 1]) < 1e-1
+        v_z[arret] = 0.0
+        w_z[arret] = 0.0
+
+        # Amortissement du yaw puis rebond si l'impact est assez violent
+        w_z *= np.exp(-self.k_yaw * dt)
+        self.vitesse_angulaire_rpy[idx, 2] = w_z
+        self.vitesse_xyz[idx, 2] = np.where(v_z < -self.seuil_rebond, -v_z * self.coeff_rebond, 0.0)
+
+
+    # Fonction principale
+    def etape_simulation(self, vitesses_helices: np.ndarray, dt: float) -> None:
+        """Avance les N drones d'un pas : perturbations, moteurs, forces, moments, dynamique, sol."""
+        if self.perturbations is not None:
+            self.perturbations.appliquer(self, dt)
+        vitesses_cibles = np.asarray(vitesses_helices, dtype=float)
+
+        self._maj_moteurs(vitesses_cibles, dt)
+        T   = self.poussee[:, None] * self.vitesses_helices_reelles**2
+        tau = self._calcul_moments(T)
+
+        self._maj_dynamique_angulaire(tau, dt)
+        self._maj_dynamique_lineaire(T, dt)
+        self._gestion_sol_et_stabilisation(dt)
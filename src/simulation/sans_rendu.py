@@ -0,0 +1,209 @@
+import math
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+import numpy as np
+
+from utiles.constantes import specifications_simulation as spec_sim, physique as phys
+from simulation.physique import PhysiqueDrone, creer_physique_drone
+from simulation.ordonnanceur import Ordonnanceur
+from controle.pid import CoefficientsPID
+from controle.controleur import Controleur
+
+
+@dataclass
+class ResultatSimulation:
+    """Series temporelles enregistrees pendant une simulation sans rendu."""
+    t: np.ndarray                      # (n,)
+    position_xyz: np.ndarray           # (n, 3)
+    vitesse_xyz: np.ndarray            # (n, 3)
+    orientation_rpy: np.ndarray        # (n, 3)
+    vitesses_helices: np.ndarray       # (n, 4) vitesses commandees
+    vitesses_helices_reelles: np.ndarray  # (n, 4)
+    termes_pid: np.ndarray             # (n, 3) P, I, D du PID altitude
+    consigne: np.ndarray               # (n,) consigne d'altitude
+    crash: np.ndarray                  # (n,) booleens
+
+
+class SimulateurSansRendu:
+    """Fait avancer physique et controleur a pas fixe, sans Panda3D ni Qt."""
+
+    def __init__(
+        self,
+        physique_drone: Optional[PhysiqueDrone] = None,
+        dt: float = spec_sim["PAS_FIXE"],
+        controleur: Optional[Controleur] = None,
+        ordonnanceur: Optional[Ordonnanceur] = None
+    ) -> None:
+        """Initialise la physique, le controleur et les commandes moteur.
+
+        Chaque etape consomme dt comme une trame d'affichage, aux cadences physique et
+        controle de l'ordonnanceur (celles des constantes par defaut, comme Simulateur).
+        Avec un integrateur adaptatif, l'ordonnanceur par defaut fait un pas physique par pas de controle.
+        """
+        self.physique_drone: PhysiqueDrone = physique_drone if physique_drone is not None else creer_physique_drone()
+        self.dt: float = float(dt)
+        self.t: float = 0.0
+
+        # Vecteur vitesses helices (rad/s)
+        self.vitesses_helices: List[float] = list(spec_sim["VITESSES_ROTATION_HELICES"])
+        self.vitessse_max: float = self.physique_drone.parametres.vitesse_helice_max
+        self.moteurs_forces_utilisateur = [False, False, False, False]
+
+        # PID altitude
+        self.consigne: List[float] = list(spec_sim["CONSIGNE"])
+        if controleur is None:
+            coeffs = CoefficientsPID(**spec_sim["PID"]["Z"])
+            controleur = Controleur(self.consigne, coeffs, self.physique_drone.parametres)
+        self.controleur: Controleur = controleur
+        self.controleur.reinitialiser(self.physique_drone.position_xyz)
+        self.pid_actif: bool = True
+
+        # Derniers termes du PID altitude
+        self.derniers_termes: tuple = (0.0, 0.0, 0.0)
+
+        if ordonnanceur is None:
+            # Un integrateur adaptatif choisit ses sous-pas : il recoit une periode de controle entiere
+            adaptatif = self.physique_drone.integrateur.adaptatif
+            ordonnanceur = Ordonnanceur(spec_sim["FREQUENCE_CONTROLE"] if adaptatif else phys["FREQUENCE_PHYSIQUE"])
+        self.ordonnanceur: Ordonnanceur = ordonnanceur
+        # Pas physiques dus a une etape de dt : aucun n'est abandonne, quel que soit dt
+        self._nb_pas_etape: int = math.ceil(self.dt / self.ordonnanceur.pas_physique) + 1
+        # Enregistreur de vol (utiles.enregistreur.EnregistreurVol), appele apres chaque pas physique
+        self.enregistreur = None
+        # Profileur des etapes (utiles.profileur.Profileur), None = desactive, aucun cout
+        self.profileur = None
+
+    # ============================
+    # Commandes (memes semantiques que Simulateur)
+    # ============================
+
+    def fixer_vitesse_helice(self, index: int, vitesse: float) -> None:
+        """Fixe la vitesse d'une helice en la bornant entre 0 et vitessse_max."""
+        self.moteurs_forces_utilisateur[index] = True
+        self.vitesses_helices[index] = max(0.0, min(self.vitessse_max, float(vitesse)))
+
+    def fixer_consigne(self, consigne: List[float]) -> None:
+        """Change la consigne de position (x, y, z)."""
+        self.consigne[:] = [float(c) for c in consigne]
+        self.controleur.fixer_consigne(self.consigne)
+
+    def initialiser_simulation(self) -> None:
+        """Remet la simulation dans son etat initial."""
+        self.physique_drone.position_xyz = np.array([0.0, 0.0, 1.0], dtype=float)
+        self.physique_drone.vitesse_xyz = np.array([0.0, 0.0, 0.0], dtype=float)
+        self.physique_drone.orientation_rpy = np.array([0.0, 0.0, 0.0], dtype=float)
+        self.physique_drone.vitesse_angulaire_rpy = np.array([0.0, 0.0, 0.0], dtype=float)
+        self.physique_drone.crash = False
+
+        x, y, z = self.physique_drone.position_xyz
+        self.controleur.reinitialiser([x, y, z])
+        self.vitesses_helices = list(spec_sim["VITESSES_ROTATION_HELICES"])
+        self.t = 0.0
+
+    # ============================
+    # Boucle a pas fixe
+    # ============================
+
+    def etape(self) -> None:
+        """Une etape de dt : pas de controle et pas physiques dus, crash, relachement des moteurs forces."""
+        self.avancer(self.dt, self._nb_pas_etape)
+
+    def avancer(self, dt: float, nb_pas_max: Optional[int] = None) -> int:
+        """Consomme dt (temps simule) aux cadences de l'ordonnanceur. Retourne le nombre de pas physiques."""
+        if self.profileur is None:
+            return self.ordonnanceur.avancer(dt, self._etape_controle, self._etape_physique, nb_pas_max)
+        return self.ordonnanceur.avancer(dt, self._etape_controle_profilee, self._etape_physique_profilee, nb_pas_max)
+
+    def _etape_controle(self, dt: float) -> None:
+        """Calcule les commandes moteur."""
+        physique = self.physique_drone
+        vitesses_angulaires, p, i, d, _ = self.controleur.appliquer_controle(
+            altitude_mesuree=float(physique.position_xyz[2]),
+            orientation_rpy=physique.orientation_rpy,
+            position_xyz=physique.position_xyz,
+            dt=dt,
+            pid_actif=self.pid_actif,
+            moteurs_forces_utilisateur=self.moteurs_forces_utilisateur,
+            vitesses_angulaires_actuelles=self.vitesses_helices,
+        )
+        self.vitesses_helices = vitesses_angulaires
+        self.derniers_termes = (p, i, d)
+
+    def _etape_physique(self, dt: float) -> None:
+        """Avance la physique, coupe les moteurs en cas de crash, relache les moteurs forces et enregistre l'etat."""
+        self.physique_drone.etape_simulation(self.vitesses_helices, dt)
+        self._apres_pas_physique(dt)
+        if self.enregistreur is not None:
+            self.enregistreur.enregistrer(self)
+
+    def _apres_pas_physique(self, dt: float) -> None:
+        """Temps, coupure des moteurs en cas de crash et relachement des moteurs forces, apres un pas physique."""
+        physique = self.physique_drone
+        self.t += dt
+
+        if physique.crash:
+            self.vitesses_helices = [0.0, 0.0, 0.0, 0.0]
+
+        for k in range(4):
+            if self.moteurs_forces_utilisateur[k]:
+                if abs(self.vitesses_helices[k] - physique.vitesses_helices_reelles[k]) < 0.5:
+                    self.moteurs_forces_utilisateur[k] = False
+
+    # Variantes mesurees par le profileur (choisies une fois par appel, hors de la boucle de pas)
+    def _etape_controle_profilee(self, dt: float) -> None:
+        debut = time.perf_counter_ns()
+        self._etape_controle(dt)
+        self.profileur.ajouter("controle", time.perf_counter_ns() - debut)
+
+    def _etape_physique_profilee(self, dt: float) -> None:
+        debut = time.perf_counter_ns()
+        self.physique_drone.etape_simulation(self.vitesses_helices, dt)
+        milieu = time.perf_counter_ns()
+        self._apres_pas_physique(dt)
+        fin = time.perf_counter_ns()
+        self.profileur.ajouter("physique", milieu - debut)
+        self.profileur.ajouter("moteurs", fin - milieu)
+        if self.enregistreur is not None:
+            self.enregistreur.enregistrer(self)
+            self.profileur.ajouter("enregistrement", time.perf_counter_ns() - fin)
+
+    def executer(
+        self,
+        duree: float,
+        rappel: Optional[Callable[["SimulateurSansRendu"], None]] = None
+    ) -> ResultatSimulation:
+        """Simule `duree` secondes aussi vite que possible et retourne les series.
+
+        `rappel`, s'il est fourni, est appele avant chaque etape (changement de
+        consigne, moteur force, ...).
+        """
+        n = int(round(duree / self.dt))
+        physique = self.physique_drone
+
+        t = np.empty(n)
+        position = np.empty((n, 3))
+        vitesse = np.empty((n, 3))
+        orientation = np.empty((n, 3))
+        helices = np.empty((n, 4))
+        helices_reelles = np.empty((n, 4))
+        termes = np.empty((n, 3))
+        consigne = np.empty(n)
+        crash = np.empty(n, dtype=bool)
+
+        for k in range(n):
+            if rappel is not None:
+                rappel(self)
+            self.etape()
+
+            t[k] = self.t
+            position[k] = physique.position_xyz
+            vitesse[k] = physique.vitesse_xyz
+            orientation[k] = physique.orientation_rpy
+            helices[k] = self.vitesses_helices
+            helices_reelles[k] = physique.vitesses_helices_reelles
+            termes[k] = self.derniers_termes
+            consigne[k] = self.controleur.pid_z.consigne
+            crash[k] = physique.crash
+
+        return ResultatSimulation(t, position, vitesse, orientation, helices, helices_reelles, termes, consigne, crash)
@@ -0,0 +1,318 @@
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+from utiles.constantes import physique as phys, specifications_simulation as spec_sim, specifications_scenario as spec_scn
+from utiles.export import ecrire_lignes_csv
+from utiles.logger import log
+from utiles.parametres import ParametresDrone, lire_toml_ou_json
+from simulation.physique import creer_physique_drone
+from simulation.integrateurs import creer_integrateur
+from simulation.perturbations import Perturbations, Rafale
+from simulation.sans_rendu import SimulateurSansRendu, ResultatSimulation
+from simulation.balayage import PARAMETRES_PHYSIQUES, PARAMETRES_PID, appliquer_parametres, calculer_metriques
+
+
+CLES_ETAT_INITIAL: Sequence[str] = ("position", "vitesse", "orientation", "vitesse_angulaire")
+CLES_PERTURBATIONS: Sequence[str] = ("vent_constant", "rafales", "turbulence", "graine")
+CLES_RAFALE: Sequence[str] = ("debut", "duree", "amplitude")
+CLES_TURBULENCE: Sequence[str] = ("INTENSITE", "ECHELLE", "INTENSITE_ANGULAIRE")
+
+
+@dataclass
+class Scenario:
+    """Description declarative d'un vol sans rendu : etat initial, consignes, gains, physique, perturbations."""
+    nom: str
+    duree: float = spec_sim["DUREE_SANS_RENDU"]             # s
+    dt: float = spec_sim["PAS_FIXE"]                       # s
+    etat_initial: Dict[str, List[float]] = field(default_factory=dict)  # cles CLES_ETAT_INITIAL, (3,)
+    consignes: List[Tuple[float, List[float]]] = field(default_factory=list)  # (t, [x, y, z]) par t croissant
+    pid: Dict[str, List[float]] = field(default_factory=dict)           # cles PARAMETRES_PID, (P, I, D)
+    physique: Dict[str, List[float]] = field(default_factory=dict)      # cles PARAMETRES_PHYSIQUES
+    parametres: Dict[str, Any] = field(default_factory=dict)            # champs de ParametresDrone
+    integrateur: Optional[str] = None                      # phys["INTEGRATEUR"] par defaut
+    mode_noyau: Optional[bool] = None                      # phys["MODE_NOYAU"] par defaut
+    perturbations: Optional[Dict[str, Any]] = None         # cles CLES_PERTURBATIONS (rafales : Rafale), None = sans
+    enregistrer: bool = False                              # enregistrement de vol en plus des metriques
+
+    def consigne(self, t: float) -> List[float]:
+        """Consigne (x, y, z) en vigueur a l'instant t."""
+        courante = list(spec_sim["CONSIGNE"])
+        for debut, position in self.consignes:
+            if debut > t:
+                break
+            courante = position
+        return courante
+
+
+def _verifier_cles(
+    section: Dict[str, Any],
+    autorisees: Sequence[str],
+    nom: str,
+    obligatoires: Sequence[str] = ()
+) -> None:
+    """ValueError si `section` contient des cles hors de `autorisees`, ou s'il lui manque une cle de `obligatoires`."""
+    inconnues = set(section) - set(autorisees)
+    if inconnues:
+        raise ValueError(f"Cles inconnues dans {nom} : {', '.join(sorted(inconnues))}")
+    manquantes = [cle for cle in obligatoires if cle not in section]
+    if manquantes:
+        raise ValueError(f"Cles manquantes dans {nom} : {', '.join(manquantes)}")
+
+
+def _table(valeur: Any, nom: str) -> Dict[str, Any]:
+    """`valeur` si c'est une table, ValueError sinon."""
+    if not isinstance(valeur, dict):
+        raise ValueError(f"{nom} : table attendue, {type(valeur).__name__} trouve")
+    return valeur
+
+
+def _tableaux(valeur: Any, nom: str) -> List[Dict[str, Any]]:
+    """`valeur` si c'est une liste de tables, ValueError sinon."""
+    if not isinstance(valeur, (list, tuple)):
+        raise ValueError(f"{nom} : tableau de tables attendu, {type(valeur).__name__} trouve")
+    return [_table(element, f"{nom}[{k}]") for k, element in enumerate(valeur)]
+
+
+def _reels(valeurs: Any, nom: str, taille: Optional[int] = None) -> List[float]:
+    """Liste de reels finis (`taille` valeurs si donnee) ; ValueError sinon."""
+    try:
+        reels = np.atleast_1d(np.asarray(valeurs, dtype=float))
+    except (TypeError, ValueError):
+        reels = None
+    if reels is None or reels.ndim != 1 or (taille is not None and len(reels) != taille) or not np.isfinite(reels).all():
+        attendu = f"{taille} reel(s) fini(s)" if taille is not None else "des reels finis"
+        raise ValueError(f"{nom} : {attendu} attendu(s), {valeurs!r} trouve")
+    return reels.tolist()
+
+
+def _valider_perturbations(perturbations: Any) -> Dict[str, Any]:
+    """Table de perturbations validee : vecteurs en reels, rafales en Rafale, turbulence complete."""
+    _verifier_cles(_table(perturbations, "perturbations"), CLES_PERTURBATIONS, "perturbations")
+    valide: Dict[str, Any] = {}
+    if "vent_constant" in perturbations:
+        valide["vent_constant"] = _reels(perturbations["vent_constant"], "perturbations.vent_constant", 3)
+
+    rafales = []
+    for k, rafale in enumerate(_tableaux(perturbations.get("rafales", []), "perturbations.rafales")):
+        nom = f"perturbations.rafales[{k}]"
+        _verifier_cles(rafale, CLES_RAFALE, nom, obligatoires=CLES_RAFALE)
+        duree = _reels(rafale["duree"], f"{nom}.duree", 1)[0]
+        if not duree > 0.0:
+            raise ValueError(f"{nom}.duree doit etre strictement positive : {duree}")
+        rafales.append(Rafale(_reels(rafale["debut"], f"{nom}.debut", 1)[0], duree, _reels(rafale["amplitude"], f"{nom}.amplitude", 3)))
+    valide["rafales"] = rafales
+
+    if "turbulence" in perturbations:
+        turbulence = _table(perturbations["turbulence"], "perturbations.turbulence")
+        _verifier_cles(turbulence, CLES_TURBULENCE, "perturbations.turbulence", obligatoires=CLES_TURBULENCE)
+        valide["turbulence"] = {cle: _reels(turbulence[cle], f"perturbations.turbulence.{cle}", 3) for cle in CLES_TURBULENCE}
+        if not all(echelle > 0.0 for echelle in valide["turbulence"]["ECHELLE"]):
+            raise ValueError("perturbations.turbulence.ECHELLE doit etre strictement positive.")
+
+    graine = perturbations.get("graine")
+    if graine is not None and (isinstance(graine, bool) or not isinstance(graine, int) or graine < 0):
+        raise ValueError(f"perturbations.graine : entier positif attendu, {graine!r} trouve")
+    valide["graine"] = graine
+    return valide
+
+
+def scenario_depuis_dict(donnees: Dict[str, Any], nom: str) -> Scenario:
+    """Construit et valide un Scenario a partir du contenu d'un fichier ; `nom` sert si le fichier n'en donne pas.
+
+    Toute la validation a lieu ici, avant le vol : ValueError nommant la cle fautive.
+    """
+    _verifier_cles(_table(donnees, "le scenario"), [f.name for f in fields(Scenario)], "le scenario")
+    scenario = Scenario(**{**donnees, "nom": str(donnees.get("nom", nom))})
+
+    scenario.duree = _reels(scenario.duree, "duree", 1)[0]
+    scenario.dt = _reels(scenario.dt, "dt", 1)[0]
+    if not scenario.duree > 0.0 or not scenario.dt > 0.0:
+        raise ValueError("duree et dt doivent etre positifs.")
+
+    _verifier_cles(_table(scenario.etat_initial, "etat_initial"), CLES_ETAT_INITIAL, "etat_initial")
+    scenario.etat_initial = {cle: _reels(valeurs, f"etat_initial.{cle}", 3) for cle, valeurs in scenario.etat_initial.items()}
+
+    consignes = []
+    for k, consigne in enumerate(_tableaux(scenario.consignes, "consignes")):
+        _verifier_cles(consigne, ("t", "position"), f"consignes[{k}]", obligatoires=("position",))
+        consignes.append((_reels(consigne.get("t", 0.0), f"consignes[{k}].t", 1)[0], _reels(consigne["position"], f"consignes[{k}].position", 3)))
+    scenario.consignes = sorted(consignes, key=lambda c: c[0])
+
+    _verifier_cles(_table(scenario.pid, "pid"), PARAMETRES_PID, "pid")
+    _verifier_cles(_table(scenario.physique, "physique"), PARAMETRES_PHYSIQUES, "physique")
+    scenario.pid = {cle: _reels(valeurs, f"pid.{cle}", 3) for cle, valeurs in scenario.pid.items()}
+    scenario.physique = {cle: _reels(valeurs, f"physique.{cle}") for cle, valeurs in scenario.physique.items()}
+
+    # Parametres puis surcharges de la section physique, comme appliquer_parametres() : ValueError si invalides
+    surcharges = {PARAMETRES_PHYSIQUES[cle]: v if len(v) > 1 else v[0] for cle, v in scenario.physique.items()}
+    try:
+        ParametresDrone.depuis_dict(_table(scenario.parametres, "parametres")).remplacer(**surcharges)
+    except (TypeError, ValueError) as err:
+        raise ValueError(f"parametres ou physique : {err}") from None
+
+    if scenario.integrateur is not None:
+        if not isinstance(scenario.integrateur, str):
+            raise ValueError(f"integrateur : nom attendu, {scenario.integrateur!r} trouve")
+        try:
+            creer_integrateur(scenario.integrateur)
+        except ValueError as err:
+            raise ValueError(f"integrateur : {err}") from None
+    if scenario.mode_noyau is not None and not isinstance(scenario.mode_noyau, bool):
+        raise ValueError(f"mode_noyau : booleen attendu, {scenario.mode_noyau!r} trouve")
+    if scenario.mode_noyau and phys["ATTITUDE"] != "euler":
+        raise ValueError("mode_noyau : le noyau sans allocation n'existe qu'en attitude d'Euler.")
+    if not isinstance(scenario.enregistrer, bool):
+        raise ValueError(f"enregistrer : booleen attendu, {scenario.enregistrer!r} trouve")
+
+    if scenario.perturbations is not None:
+        scenario.perturbations = _valider_perturbations(scenario.perturbations)
+    return scenario
+
+
+def charger_scenario(chemin: str) -> Scenario:
+    """Lit un scenario TOML (.toml) ou JSON (.json) ; ValueError nommant le fichier et la cle s'il est invalide."""
+    nom = os.path.splitext(os.path.basename(chemin))[0]
+    donnees = lire_toml_ou_json(chemin)
+    try:
+        return scenario_depuis_dict(donnees, nom)
+    except ValueError as err:
+        raise ValueError(f"{chemin} : {err}") from None
+
+
+# ============================
+# Execution d'un scenario
+# ============================
+
+def creer_simulateur(scenario: Scenario, **options: Any) -> SimulateurSansRendu:
+    """Simulateur sans rendu dans l'etat initial du scenario, gains, physique et perturbations appliques.
+
+    `options` sont transmises a creer_physique_drone (mode_noyau, ...).
+    """
+    options["parametres"] = ParametresDrone.depuis_dict(scenario.parametres)
+    if scenario.integrateur:
+        options["integrateur"] = scenario.integrateur
+    if scenario.mode_noyau is not None:
+        options["mode_noyau"] = scenario.mode_noyau
+    physique = creer_physique_drone(**options)
+    simulateur = SimulateurSansRendu(physique, dt=scenario.dt)
+    appliquer_parametres(simulateur, {**scenario.physique, **scenario.pid})
+
+    for cle, valeurs in scenario.etat_initial.items():
+        attribut = f"{cle}_rpy" if cle in ("orientation", "vitesse_angulaire") else f"{cle}_xyz"
+        setattr(physique, attribut, np.array(valeurs, dtype=float))
+    simulateur.controleur.reinitialiser(physique.position_xyz)
+    simulateur.fixer_consigne(scenario.consigne(0.0))
+
+    if scenario.perturbations is not None:
+        perturbations = scenario.perturbations
+        physique.perturbations = Perturbations(
+            pas=simulateur.ordonnanceur.pas_physique,
+            vent_constant=perturbations.get("vent_constant", (0.0, 0.0, 0.0)),
+            rafales=perturbations.get("rafales", ()),
+            turbulence=perturbations.get("turbulence"),
+            graine=perturbations.get("graine"),
+            parametres=physique.parametres
+        )
+    return simulateur
+
+
+def calculer_metriques_scenario(scenario: Scenario, resultat: ResultatSimulation, position_initiale: np.ndarray) -> Dict[str, Any]:
+    """Metriques du vol : depassement et etablissement sur la derniere consigne, erreur RMS sur tout le programme."""
+    changements = [t for t, _ in scenario.consignes if 0.0 < t < scenario.duree]
+    debut = int(np.searchsorted(resultat.t, changements[-1])) if changements else 0
+
+    # Dernier segment : de la derniere consigne a la fin du vol
+    segment = ResultatSimulation(*(getattr(resultat, f.name)[debut:] for f in fields(ResultatSimulation)))
+    depart = resultat.position_xyz[debut - 1] if debut else position_initiale
+    metriques = calculer_metriques(segment, depart, scenario.consigne(scenario.duree))
+
+    # Erreur RMS par rapport a la consigne en vigueur a chaque pas
+    consignes = np.array([scenario.consigne(0.0)] + [position for _, position in scenario.consignes], dtype=float)
+    instants = np.array([-np.inf] + [t for t, _ in scenario.consignes])
+    en_vigueur = consignes[np.searchsorted(instants, resultat.t, side="right") - 1]
+    metriques["erreur_rms"] = float(np.sqrt(np.mean(np.sum((resultat.position_xyz - en_vigueur)**2, axis=1))))
+
+    x, y, z = resultat.position_xyz[-1]
+    metriques.update(x_final=float(x), y_final=float(y), z_final=float(z))
+    return metriques
+
+
+def executer_scenario(scenario: Scenario, dossier_sortie: str, enregistrer: bool = False) -> Dict[str, Any]:
+    """Simule un scenario et ecrit <nom>.json (metriques) dans dossier_sortie, plus <nom>.enr si demande.
+
+    Fonction de module, pour etre executee dans un processus du pool.
+    """
+    os.makedirs(dossier_sortie, exist_ok=True)
+    simulateur = creer_simulateur(scenario)
+    if enregistrer or scenario.enregistrer:
+        from utiles.enregistreur import EnregistreurVol
+        simulateur.enregistreur = EnregistreurVol(os.path.join(dossier_sortie, f"{scenario.nom}.enr"))
+
+    programme = [(t, position) for t, position in scenario.consignes if t > 0.0]
+
+    def suivre_programme(sim: SimulateurSansRendu) -> None:
+        while programme and sim.t + 0.5 * sim.dt >= programme[0][0]:
+            sim.fixer_consigne(programme.pop(0)[1])
+
+    position_initiale = simulateur.physique_drone.position_xyz.copy()
+    debut = time.perf_counter()
+    try:
+        resultat = simulateur.executer(scenario.duree, suivre_programme)
+    finally:
+        if simulateur.enregistreur is not None:
+            simulateur.enregistreur.fermer()
+    ecoule = time.perf_counter() - debut
+
+    ligne: Dict[str, Any] = {"scenario": scenario.nom, "duree": scenario.duree, "dt": scenario.dt}
+    ligne.update(calculer_metriques_scenario(scenario, resultat, position_initiale))
+    ligne["temps_calcul"] = ecoule
+    if simulateur.enregistreur is not None:
+        ligne["enregistrement"] = simulateur.enregistreur.chemin
+
+    with open(os.path.join(dossier_sortie, f"{scenario.nom}.json"), "w", encoding="utf-8") as f:
+        json.dump(ligne, f, indent=2)
+    return ligne
+
+
+def _executer_tache(tache: Tuple[Scenario, str, bool]) -> Dict[str, Any]:
+    return executer_scenario(*tache)
+
+
+def executer_lot(
+    chemins: Sequence[str],
+    dossier_sortie: str = spec_scn["DOSSIER_SORTIE"],
+    enregistrer: bool = False,
+    nb_processus: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Charge tous les scenarios, les repartit sur un pool de processus et ecrit resume.csv ; une ligne par scenario, dans l'ordre.
+
+    Tous les fichiers sont lus et valides avant le premier vol.
+    """
+    scenarios = [charger_scenario(chemin) for chemin in chemins]
+    noms = [scenario.nom for scenario in scenarios]
+    doublons = sorted({nom for nom in noms if noms.count(nom) > 1})
+    if doublons:
+        raise ValueError(f"Noms de scenario en double : {', '.join(doublons)}")
+
+    taches = [(scenario, dossier_sortie, enregistrer) for scenario in scenarios]
+    nb_processus = min(nb_processus or os.cpu_count() or 1, max(1, len(taches)))
+    if nb_processus == 1:
+        lignes = [_executer_tache(tache) for tache in taches]
+    else:
+        with ProcessPoolExecutor(max_workers=nb_processus) as pool:
+            lignes = list(pool.map(_executer_tache, taches))
+
+    if lignes:
+        # Le resume d'un lot remplace celui du lot precedent (ecrire_lignes_csv ajoute en fin de fichier)
+        chemin = os.path.join(dossier_sortie, "resume.csv")
+        if os.path.exists(chemin):
+            os.remove(chemin)
+        colonnes = list(dict.fromkeys(cle for ligne in lignes for cle in ligne))
+        ecrire_lignes_csv(dossier_sortie, "resume.csv", lignes, entetes=colonnes)
+        log(f"Resume de {len(lignes)} scenarios ecrit dans {chemin}")
+    return lignes
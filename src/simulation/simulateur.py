@@ -1,49 +1,131 @@
+import time
 from PyQt5.QtCore import QObject, pyqtSignal
-from typing import List
-import numpy as np
+from typing import Dict, List, Optional
 
-from direct.showbase.ShowBaseGlobal import globalClock
-from utiles.constantes import specifications_simulation as spec_sim, physique as phys
-from controle.pid import CoefficientsPID
-from controle.controleur import Controleur
+from utiles.constantes import (
+    specifications_simulation as spec_sim,
+    specifications_reseau as spec_res,
+    specifications_profileur as spec_prof
+)
+from utiles.profileur import Profileur
+from simulation.horloge import HorlogeSimulation
+from simulation.sans_rendu import SimulateurSansRendu
+from simulation.travailleur import Instantane, TravailleurSimulation
 
 
 class Simulateur(QObject):
-    altitude_changee = pyqtSignal(float)
-    pid_mis_a_jour = pyqtSignal(float, float, float, float, float) # ordre: P, I, D, consigne, mesure
-    vitesses_moteurs_mises_a_jour = pyqtSignal(list)
-
-    def __init__(self, scene, modele_drone, physique_drone) -> None:
-        """Initialise la simulation : physique, PID, modele 3D et boucle de mise à jour."""
+    telemetrie_publiee = pyqtSignal(object) # LotTelemetrie, un par tick d'interface
+
+    def __init__(
+        self,
+        scene,
+        modele_drone,
+        physique_drone,
+        fil_dedie: bool = spec_sim["SIMULATION_FIL_DEDIE"],
+        reseau: bool = spec_res["ACTIF"]
+    ) -> None:
+        """Initialise la simulation : physique, PID, fil de simulation, modele 3D et boucle de mise à jour.
+
+        Physique et controle appartiennent au TravailleurSimulation. Le fil Qt/Panda3D
+        ne lit que ses instantanes publies, et ne lui parle que par sa file de commandes.
+        """
         super().__init__()
 
         self.scene = scene
         self.modele_drone = modele_drone
         self.physique_drone = physique_drone
-
-        # Vecteur vitesses helices (rad/s)
-        self.vitesses_helices: List[float] = list(spec_sim["VITESSES_ROTATION_HELICES"])
-        self.vitessse_max: float = float(phys["VITESSE_HELICE_MAX"])
-        self.moteurs_forces_utilisateur = [False, False, False, False]
-
-        # PID altitude
-        coeffs = CoefficientsPID(**spec_sim["PID"]["Z"])
-        self.consigne: List[float] = list(spec_sim["CONSIGNE"])
-        self.controleur = Controleur(self.consigne, coeffs)
-        self.controleur.reinitialiser(self.physique_drone.position_xyz)
-        self.pid_actif: bool = True
+        self.sens_helices = physique_drone.parametres.sens_helices
+
+        # Physique + PID, cadences par l'ordonnanceur
+        self.simulation = SimulateurSansRendu(physique_drone)
+        self.ordonnanceur = self.simulation.ordonnanceur
+        self.controleur = self.simulation.controleur
+        self.consigne: List[float] = self.simulation.consigne
+        # Liste partagee avec le fil de simulation : l'affectation d'un element est atomique
+        self.moteurs_forces_utilisateur = self.simulation.moteurs_forces_utilisateur
+
+        # Fil de simulation (ou iterations sur le fil Panda3D si fil_dedie est faux), a l'echelle de l'horloge
+        self.horloge = HorlogeSimulation()
+        self.fil_dedie: bool = bool(fil_dedie)
+        self.travailleur = TravailleurSimulation(self.simulation, horloge=self.horloge)
+        if self.fil_dedie:
+            self.travailleur.start()
+
+        # Telemetrie et commandes UDP
+        self.reseau = None
+        if reseau:
+            from utiles.reseau import InterfaceReseau
+            self.reseau = InterfaceReseau(self)
+            self.reseau.demarrer()
+
+        # Profilage des etapes (None = desactive)
+        self.profileur: Optional[Profileur] = None
+        self.nb_trames: int = 0
+        if spec_prof["ACTIF"]:
+            self.activer_profilage()
 
         # Tâche Panda pour la simulation
         self.scene.taskMgr.add(self.mettre_a_jour_simulation, "tacheSimulation")
 
+    @property
+    def instantane(self) -> Instantane:
+        """Dernier etat publie par le fil de simulation."""
+        return self.travailleur.tampon.lire()
+
+    @property
+    def vitesses_helices(self) -> List[float]:
+        """Vitesses helices commandees (rad/s) du dernier instantane."""
+        return list(self.instantane.vitesses_helices)
+
+    @property
+    def pid_actif(self) -> bool:
+        return self.simulation.pid_actif
+
+    @pid_actif.setter
+    def pid_actif(self, actif: bool) -> None:
+        self.travailleur.executer(setattr, self.simulation, "pid_actif", bool(actif))
+
+    def fixer_echelle_temps(self, echelle: Optional[float]) -> None:
+        """Change l'echelle de temps : < 1 ralenti, > 1 accelere, None aussi vite que possible."""
+        self.horloge.fixer_echelle(echelle)
+
+    def activer_profilage(self) -> Profileur:
+        """Attache un profileur aux etapes de rendu et, via sa file, a celles du fil de simulation."""
+        if self.profileur is None:
+            self.profileur = Profileur()
+            self.travailleur.executer(setattr, self.simulation, "profileur", self.profileur)
+        return self.profileur
+
+    def desactiver_profilage(self) -> None:
+        """Detache le profileur ; les etapes ne sont plus mesurees."""
+        self.profileur = None
+        self.travailleur.executer(setattr, self.simulation, "profileur", None)
+
+    def compteurs_profilage(self) -> Dict[str, int]:
+        """Compteurs dont le profileur deduit les frequences de rendu, physique et controle."""
+        return {
+            "trames": self.nb_trames,
+            "physique": self.ordonnanceur.nb_pas_physique,
+            "controle": self.ordonnanceur.nb_pas_controle,
+        }
+
+    def arreter(self) -> None:
+        """Arrete l'interface reseau et le fil de simulation."""
+        if self.reseau is not None:
+            self.reseau.arreter()
+        self.travailleur.arreter()
+
     # ============================
     # Communication entre la fenetre PyQt5 et la scene panda3D
     # ============================
 
     def fixer_vitesse_helice(self, index: int, vitesse: float) -> None:
         """Fixe la vitesse d'une helice en la bornant entre 0 et vitessse_max."""
-        self.moteurs_forces_utilisateur[index] = True
-        self.vitesses_helices[index] = max(0.0, min(self.vitessse_max, float(vitesse)))
+        self.travailleur.executer(self.simulation.fixer_vitesse_helice, index, vitesse)
+
+    def fixer_consigne(self, consigne: List[float]) -> None:
+        """Change la consigne de position (x, y, z)."""
+        self.travailleur.executer(self.simulation.fixer_consigne, list(consigne))
 
     def tourner_gauche(self) -> None:
         """Fait pivoter la camera vers la gauche via la scene."""
@@ -58,28 +140,12 @@ class Simulateur(QObject):
     # ============================
 
     def initialiser_simulation(self) -> None:
-        """Remet la simulation dans son etat initial."""
-        try:
-            # Position et orientation
-            self.physique_drone.position_xyz = np.array([0.0, 0.0, 1.0], dtype=float)
-            self.physique_drone.vitesse_xyz = np.array([0.0, 0.0, 0.0], dtype=float)
-            self.physique_drone.orientation_rpy = np.array([0.0, 0.0, 0.0], dtype=float)
-            self.physique_drone.vitesse_angulaire_rpy = np.array([0.0, 0.0, 0.0], dtype=float)
-            self.physique_drone.crash = False
-
-            # Reset PID interne
-            x, y, z = self.physique_drone.position_xyz
-            self.controleur.reinitialiser([x, y, z])
-
-            # Helices : retour aux vitesses par defaut
-            self.vitesses_helices = list(spec_sim["VITESSES_ROTATION_HELICES"])
-
-            # Mise a jour du modele 3D
-            self.modele_drone.mettre_a_jour_pose(
-                self.physique_drone.position_xyz,
-                self.physique_drone.orientation_rpy
-            )
+        """Remet la simulation dans son etat initial (sur le fil de simulation)."""
+        self.travailleur.executer(self._initialiser_simulation)
 
+    def _initialiser_simulation(self) -> None:
+        try:
+            self.simulation.initialiser_simulation()
         except Exception as err:
             print("Erreur reinitialisation simulation :", err)
 
@@ -87,69 +153,72 @@ class Simulateur(QObject):
     # Gestion de la scene 3D
     # ============================
 
-    def _appliquer_controleur(self, dt: float) -> None:
-        altitude: float = float(self.physique_drone.position_xyz[2])
-
-        vitesses_angulaires, p, i, d, consigne = self.controleur.appliquer_controle(
-            altitude_mesuree=altitude,
-            orientation_rpy=self.physique_drone.orientation_rpy,
-            position_xyz=self.physique_drone.position_xyz,
-            dt=dt,
-            pid_actif=self.pid_actif,
-            moteurs_forces_utilisateur=self.moteurs_forces_utilisateur,
-            vitesses_angulaires_actuelles=self.vitesses_helices,
-        )
+    def _emettre_interface(self) -> None:
+        """emet vers Qt, en un seul signal, les echantillons accumules depuis le dernier tick."""
+        lot = self.travailleur.telemetrie.extraire()
+        if lot is not None:
+            self.telemetrie_publiee.emit(lot)
 
-        self.vitesses_helices = vitesses_angulaires
-        self.pid_mis_a_jour.emit(float(p), float(i), float(d), float(consigne), float(altitude))
-
-    def _simuler_physique(self, dt: float) -> None:
-        """Fait avancer la simulation physique du drone."""
-        self.physique_drone.etape_simulation(self.vitesses_helices, dt)
-
-    def _emettre_altitude(self) -> None:
-        """emet l'altitude actuelle vers Qt."""
-        z = float(self.physique_drone.position_xyz[2])
-        self.altitude_changee.emit(z)
-
-    def _gerer_crash(self) -> None:
-        """Coupe les moteurs en cas de crash."""
-        if self.physique_drone.crash:
-            self.vitesses_helices = [0.0, 0.0, 0.0, 0.0]
-
-    def _mettre_a_jour_pose_3d(self) -> None:
+    def _mettre_a_jour_pose_3d(self, instantane: Instantane) -> None:
         """Met à jour le modele 3D du drone (position + orientation)."""
         self.modele_drone.mettre_a_jour_pose(
-            self.physique_drone.position_xyz,
-            self.physique_drone.orientation_rpy
+            instantane.position_xyz,
+            instantane.orientation_rpy
         )
 
-    def _mettre_a_jour_helices_visuel(self, dt: float) -> None:
+    def _mettre_a_jour_helices_visuel(self, instantane: Instantane, dt: float) -> None:
         """Applique les vitesses aux helices visuelles et les fait tourner."""
-        sens = spec_sim["SENS_HELICES"]
+        sens = self.sens_helices
 
         for i in range(4):
-            self.modele_drone.helices[i][1] = self.vitesses_helices[i] * sens[i]
+            self.modele_drone.helices[i][1] = instantane.vitesses_helices[i] * sens[i]
 
         self.modele_drone.mettre_a_jour_helices(dt)
 
     # Methode principale
     def mettre_a_jour_simulation(self, task) -> int:
-        """Pipeline complet de mise à jour : PID, physique, 3D."""
-        dt = globalClock.getDt()
-
-        self._appliquer_controleur(dt)
-        self._simuler_physique(dt)
-        self._emettre_altitude()
-        self._gerer_crash()
-        self.vitesses_moteurs_mises_a_jour.emit(list(self.physique_drone.vitesses_helices_reelles))
-        
-        for i in range(4):
-            if self.moteurs_forces_utilisateur[i]:
-                if abs(self.vitesses_helices[i] - self.physique_drone.vitesses_helices_reelles[i]) < 0.5:
-                    self.moteurs_forces_utilisateur[i] = False
-
-        self._mettre_a_jour_pose_3d()
-        self._mettre_a_jour_helices_visuel(dt)
-
-        return task.cont
\ No newline at end of file
+        """Pipeline de rendu : lit le dernier instantane, notifie l'interface a sa cadence, met à jour la 3D."""
+        dt = self.scene.clock.getDt()
+        self.nb_trames += 1
+        if self.profileur is not None:
+            self._mettre_a_jour_profilee(dt, self.profileur)
+            return task.cont
+
+        if self.fil_dedie:
+            instantane = self.instantane
+        else:
+            instantane = self.travailleur.iteration(dt)
+
+        if self.ordonnanceur.interface_due(dt):
+            self._emettre_interface()
+
+        self._mettre_a_jour_pose_3d(instantane)
+        self._mettre_a_jour_helices_visuel(instantane, dt)
+
+        return task.cont
+
+    def _mettre_a_jour_profilee(self, dt: float, profileur: Profileur) -> None:
+        """Meme pipeline que mettre_a_jour_simulation, chaque etape mesuree."""
+        horloge = time.perf_counter_ns
+        debut = horloge()
+        if self.fil_dedie:
+            instantane = self.instantane
+        else:
+            instantane = self.travailleur.iteration(dt)
+        t_iteration = horloge()
+        profileur.ajouter("iteration", t_iteration - debut)
+
+        # Mesuree seulement aux trames ou l'interface est notifiee
+        if self.ordonnanceur.interface_due(dt):
+            self._emettre_interface()
+            profileur.ajouter("interface", horloge() - t_iteration)
+        t_interface = horloge()
+
+        self._mettre_a_jour_pose_3d(instantane)
+        t_pose = horloge()
+        self._mettre_a_jour_helices_visuel(instantane, dt)
+        fin = horloge()
+
+        profileur.ajouter("pose_3d", t_pose - t_interface)
+        profileur.ajouter("helices", fin - t_pose)
+        profileur.ajouter("trame", fin - debut)
@@ -0,0 +1,114 @@
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Optional, Sequence
+import numpy as np
+
+from utiles.constantes import specifications_simulation as spec_sim
+
+
+# Colonnes d'un echantillon de telemetrie
+COLONNES = ("t", "p", "i", "d", "consigne", "altitude", "moteur_0", "moteur_1", "moteur_2", "moteur_3")
+
+
+@dataclass(frozen=True)
+class LotTelemetrie:
+    """Echantillons consecutifs, une ligne par echantillon (colonnes COLONNES), en lecture seule."""
+    donnees: np.ndarray  # (n, len(COLONNES))
+
+    def __len__(self) -> int:
+        return len(self.donnees)
+
+    @property
+    def t(self) -> np.ndarray:
+        """Temps simule (n,)."""
+        return self.donnees[:, 0]
+
+    @property
+    def termes_pid(self) -> np.ndarray:
+        """P, I, D du PID altitude (n, 3)."""
+        return self.donnees[:, 1:4]
+
+    @property
+    def consigne(self) -> np.ndarray:
+        """Consigne d'altitude (n,)."""
+        return self.donnees[:, 4]
+
+    @property
+    def altitude(self) -> np.ndarray:
+        """Altitude mesuree (n,)."""
+        return self.donnees[:, 5]
+
+    @property
+    def vitesses_helices_reelles(self) -> np.ndarray:
+        """Vitesses reelles des 4 helices (n, 4)."""
+        return self.donnees[:, 6:10]
+
+    @classmethod
+    def concatener(cls, lots: Sequence["LotTelemetrie"]) -> "LotTelemetrie":
+        """Un seul lot avec les echantillons de `lots`, dans l'ordre."""
+        if len(lots) == 1:
+            return lots[0]
+        donnees = np.concatenate([lot.donnees for lot in lots])
+        donnees.setflags(write=False)
+        return cls(donnees)
+
+
+class AccumulateurTelemetrie:
+    """Accumule les echantillons du fil de simulation et les livre par lots a l'interface.
+
+    L'ecrivain (fil de simulation) remplit un tableau pre-alloue et le fige en
+    LotTelemetrie toutes les `periode` secondes simulees. Le lecteur (fil Qt)
+    recupere a chaque tick tous les lots fermes d'un coup. Seule la file des lots
+    fermes est partagee : un deque, dont append et popleft sont atomiques.
+    Si l'interface ne lit plus, les lots les plus anciens sont abandonnes au-dela
+    de `nb_lots_max`.
+    """
+
+    def __init__(
+        self,
+        periode: float = 1.0 / spec_sim["FREQUENCE_INTERFACE"],
+        taille_lot: int = spec_sim["TELEMETRIE_TAILLE_LOT"],
+        nb_lots_max: int = spec_sim["TELEMETRIE_NB_LOTS_MAX"]
+    ) -> None:
+        """Initialise le lot en cours et la file des lots fermes."""
+        self.periode: float = float(periode)
+        self.taille_lot: int = int(taille_lot)
+        self._lot: np.ndarray = np.empty((self.taille_lot, len(COLONNES)))
+        self._n: int = 0
+        self._debut: float = 0.0
+        self.lots: Deque[LotTelemetrie] = deque(maxlen=int(nb_lots_max))
+
+    def ajouter(self, instantane) -> None:
+        """Ajoute un echantillon tire d'un Instantane (fil de simulation)."""
+        if self._n and instantane.t < self._lot[self._n - 1, 0]:
+            self.fermer()  # reinitialisation : le temps recule
+        if self._n == 0:
+            self._debut = instantane.t
+        ligne = self._lot[self._n]
+        ligne[0] = instantane.t
+        ligne[1:4] = instantane.termes_pid
+        ligne[4] = instantane.consigne
+        ligne[5] = instantane.position_xyz[2]
+        ligne[6:10] = instantane.vitesses_helices_reelles
+        self._n += 1
+
+        if self._n == self.taille_lot or instantane.t - self._debut >= self.periode:
+            self.fermer()
+
+    def fermer(self) -> None:
+        """Fige le lot en cours et le rend disponible au lecteur (fil de simulation)."""
+        if self._n == 0:
+            return
+        donnees = self._lot[:self._n].copy()
+        donnees.setflags(write=False)
+        self.lots.append(LotTelemetrie(donnees))
+        self._n = 0
+
+    def extraire(self) -> Optional[LotTelemetrie]:
+        """Retire tous les lots fermes et les retourne en un seul lot, ou None (fil Qt)."""
+        lots = []
+        while self.lots:
+            lots.append(self.lots.popleft())
+        if not lots:
+            return None
+        return LotTelemetrie.concatener(lots)
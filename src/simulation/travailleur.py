@@ -0,0 +1,158 @@
+import math
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Tuple
+import numpy as np
+
+from utiles.constantes import specifications_simulation as spec_sim
+from simulation.sans_rendu import SimulateurSansRendu
+from simulation.horloge import HorlogeSimulation
+from simulation.telemetrie import AccumulateurTelemetrie
+
+
+def _lecture_seule(valeurs) -> np.ndarray:
+    """Copie `valeurs` dans un tableau non modifiable."""
+    tableau = np.array(valeurs, dtype=float)
+    tableau.setflags(write=False)
+    return tableau
+
+
+@dataclass(frozen=True)
+class Instantane:
+    """Etat publie par le fil de simulation. Immuable : il se lit sans verrou, depuis n'importe quel fil."""
+    numero: int                          # rang de publication
+    t: float                             # temps simule (s)
+    position_xyz: np.ndarray             # (3,)
+    orientation_rpy: np.ndarray          # (3,)
+    vitesses_helices: np.ndarray         # (4,) vitesses commandees
+    vitesses_helices_reelles: np.ndarray # (4,)
+    termes_pid: Tuple[float, float, float]  # P, I, D du PID altitude
+    consigne: float                      # consigne d'altitude
+    crash: bool
+
+    @classmethod
+    def depuis_simulation(cls, simulation: SimulateurSansRendu, numero: int) -> "Instantane":
+        """Copie l'etat courant de `simulation`."""
+        physique = simulation.physique_drone
+        p, i, d = simulation.derniers_termes
+        return cls(
+            numero=numero,
+            t=float(simulation.t),
+            position_xyz=_lecture_seule(physique.position_xyz),
+            orientation_rpy=_lecture_seule(physique.orientation_rpy),
+            vitesses_helices=_lecture_seule(simulation.vitesses_helices),
+            vitesses_helices_reelles=_lecture_seule(physique.vitesses_helices_reelles),
+            termes_pid=(float(p), float(i), float(d)),
+            consigne=float(simulation.controleur.pid_z.consigne),
+            crash=bool(physique.crash)
+        )
+
+
+class TamponDouble:
+    """Double tampon d'instantanes : un seul ecrivain, lecteurs quelconques, aucun verrou.
+
+    L'ecrivain remplit la case inactive puis bascule l'indice ; chaque operation est
+    une seule affectation, atomique pour l'interpreteur. Comme les instantanes sont
+    immuables, un lecteur obtient toujours un etat complet : le dernier publie, ou
+    au pire le precedent.
+    """
+
+    def __init__(self, initial: Instantane) -> None:
+        """Initialise les deux cases avec `initial`."""
+        self._cases = [initial, initial]
+        self._indice: int = 0
+
+    def publier(self, instantane: Instantane) -> None:
+        """Ecrit dans la case inactive puis la rend visible."""
+        indice = 1 - self._indice
+        self._cases[indice] = instantane
+        self._indice = indice
+
+    def lire(self) -> Instantane:
+        """Dernier instantane publie."""
+        return self._cases[self._indice]
+
+
+class TravailleurSimulation(threading.Thread):
+    """Fait avancer physique et controle sur un fil dedie et publie un Instantane par iteration.
+
+    Les commandes de l'interface (consigne, moteurs, reinitialisation) passent par
+    une file et sont executees par le fil de simulation, entre deux iterations :
+    la simulation n'est jamais modifiee depuis un autre fil.
+    Sans demarrage du fil, iteration() peut etre appelee directement (mode mono-fil).
+    """
+
+    def __init__(
+        self,
+        simulation: SimulateurSansRendu,
+        periode: float = spec_sim["PERIODE_TRAVAILLEUR"],
+        horloge: Optional[HorlogeSimulation] = None
+    ) -> None:
+        """`simulation` doit avoir un ordonnanceur ; `periode` est l'intervalle entre deux publications (s).
+
+        `horloge` convertit le temps reel ecoule en temps simule ; en mode aussi vite
+        que possible, chaque iteration avance de nb_pas_max pas, sans attente.
+        """
+        super().__init__(name="TravailleurSimulation", daemon=True)
+        if simulation.ordonnanceur is None:
+            raise ValueError("La simulation du travailleur doit avoir un ordonnanceur.")
+
+        self.simulation: SimulateurSansRendu = simulation
+        self.periode: float = float(periode)
+        self.horloge: HorlogeSimulation = horloge if horloge is not None else HorlogeSimulation()
+        self.commandes: "queue.SimpleQueue[Tuple[Callable[..., Any], tuple]]" = queue.SimpleQueue()
+        self._arret = threading.Event()
+
+        self.nb_iterations: int = 0
+        self.tampon: TamponDouble = TamponDouble(Instantane.depuis_simulation(simulation, 0))
+        self.telemetrie: AccumulateurTelemetrie = AccumulateurTelemetrie()
+
+    def executer(self, fonction: Callable[..., Any], *args: Any) -> None:
+        """Met `fonction(*args)` en file ; elle s'executera sur le fil de simulation."""
+        self.commandes.put((fonction, args))
+
+    def iteration(self, dt: float) -> Instantane:
+        """Execute les commandes en attente, avance de dt reel (mis a l'echelle), publie l'etat et l'echantillonne."""
+        while True:
+            try:
+                fonction, args = self.commandes.get_nowait()
+            except queue.Empty:
+                break
+            fonction(*args)
+
+        ordonnanceur = self.simulation.ordonnanceur
+        echelle = self.horloge.echelle
+        if echelle is None:
+            self.simulation.avancer(ordonnanceur.nb_pas_max * ordonnanceur.pas_physique)
+        else:
+            self.simulation.avancer(self.horloge.convertir(dt), math.ceil(ordonnanceur.nb_pas_max * max(1.0, echelle)))
+        self.nb_iterations += 1
+        instantane = Instantane.depuis_simulation(self.simulation, self.nb_iterations)
+        self.tampon.publier(instantane)
+        self.telemetrie.ajouter(instantane)
+        return instantane
+
+    def run(self) -> None:
+        """Boucle a periode fixe ; le dt reellement ecoule est passe a l'ordonnanceur."""
+        precedent = time.perf_counter()
+        echeance = precedent
+        while not self._arret.is_set():
+            maintenant = time.perf_counter()
+            self.iteration(maintenant - precedent)
+            precedent = maintenant
+
+            if self.horloge.aussi_vite_que_possible:
+                echeance = time.perf_counter()
+                continue
+            echeance = max(echeance + self.periode, maintenant)
+            attente = echeance - time.perf_counter()
+            if attente > 0.0:
+                self._arret.wait(attente)
+
+    def arreter(self, delai: float = 1.0) -> None:
+        """Demande l'arret du fil et l'attend au plus `delai` secondes."""
+        self._arret.set()
+        if self.is_alive():
+            self.join(delai)
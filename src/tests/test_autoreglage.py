@@ -0,0 +1,23 @@
+import math
+
+import pytest
+
+from simulation.autoreglage import configuration_cout, evaluer_gains
+from simulation.physique import creer_physique_drone
+from utiles.constantes import specifications_autoreglage as spec_auto
+
+
+@pytest.mark.parametrize("debut", [0.0, -1.0, spec_auto["DUREE"]])
+def test_rafale_hors_du_vol_refusee(monkeypatch, debut):
+    """Une rafale qui ne commence pas dans ]0, DUREE[ laisserait une fenetre de metriques vide."""
+    monkeypatch.setitem(spec_auto, "RAFALE", {**spec_auto["RAFALE"], "DEBUT": debut})
+    with pytest.raises(ValueError, match="RAFALE"):
+        configuration_cout()
+
+
+def test_cout_fini_sans_echelon():
+    """Consigne a l'altitude de depart : depassement relatif indefini, cout fini quand meme."""
+    config = {**configuration_cout(), "duree": 2.0}
+    config["rafale"] = {**config["rafale"], "DEBUT": 1.0}
+    config["consigne"] = [0.0, 0.0, float(creer_physique_drone().position_xyz[2])]
+    assert math.isfinite(evaluer_gains(({}, config)))
@@ -0,0 +1,97 @@
+import copy
+
+import numpy as np
+from numpy.testing import assert_allclose
+
+from controle.banc_pid import BancPID
+from controle.controleur import Controleur
+from controle.controleur_essaim import ControleurEssaim
+from controle.pid import CoefficientsPID
+from utiles.constantes import specifications_simulation as spec_sim
+
+NB_DRONES = 4
+NB_PAS = 600
+TOLERANCE = 1e-12
+NOMS_PID = ("pid_z", "pid_pos_x", "pid_pos_y", "pid_att_pitch", "pid_att_roll")  # colonnes du banc de ControleurEssaim
+ETAT_PID = ("integrale", "erreur_precedente", "mesure_precedente")
+
+
+def _controleur():
+    return Controleur(spec_sim["CONSIGNE"], CoefficientsPID(**spec_sim["PID"]["Z"]))
+
+
+def _comparer_etats(banc, pids):
+    """Etat du banc (N, K) et etat des PID pids[n][k], canal par canal.
+
+    Une mesure precedente inconnue (PID jamais appele) correspond a initialise = False.
+    """
+    initialise = np.array([[pid.mesure_precedente is not None for pid in ligne] for ligne in pids])
+    np.testing.assert_array_equal(banc.initialise, initialise)
+    for etat in ETAT_PID:
+        attendu = np.array([[getattr(pid, etat) for pid in ligne] for ligne in pids], dtype=float)
+        calcule = np.where(initialise | (etat != "mesure_precedente"), getattr(banc, etat), np.nan)
+        assert_allclose(calcule, attendu, rtol=TOLERANCE, atol=TOLERANCE, err_msg=etat)
+
+
+def test_banc_pid_equivalent_pids():
+    """BancPID suit N x K PID separes : sorties, termes et etat, boucles inactives et consignes changeantes comprises."""
+    rng = np.random.default_rng(0)
+    modeles = [getattr(_controleur(), nom) for nom in NOMS_PID]
+    banc = BancPID.depuis_pids(modeles, NB_DRONES)
+    pids = [[copy.deepcopy(pid) for pid in modeles] for _ in range(NB_DRONES)]
+
+    for pas in range(NB_PAS):
+        if pas % 50 == 0:
+            banc.consigne[:] = rng.normal(0.0, 1.0, banc.consigne.shape)
+            for n, ligne in enumerate(pids):
+                for k, pid in enumerate(ligne):
+                    pid.consigne = float(banc.consigne[n, k])
+
+        dt = 0.005 if pas % 3 == 0 else 0.02  # 0.005 s : terme derive ignore
+        mesures = rng.normal(0.0, 2.0, (NB_DRONES, len(modeles)))
+        actifs = rng.random(mesures.shape) > 0.2
+        sorties = banc(mesures, dt, actifs=actifs)
+
+        attendues = np.zeros_like(mesures)
+        termes = np.zeros(mesures.shape + (3,))
+        for n, ligne in enumerate(pids):
+            for k, pid in enumerate(ligne):
+                if actifs[n, k]:
+                    attendues[n, k] = pid(mesures[n, k], dt)
+                    termes[n, k] = pid.derniers_termes
+        assert_allclose(sorties, attendues, rtol=TOLERANCE, atol=TOLERANCE)
+        assert_allclose(banc.derniers_termes, termes, rtol=TOLERANCE, atol=TOLERANCE)
+        _comparer_etats(banc, pids)
+
+
+def test_controleur_essaim_equivalent_controleurs():
+    """ControleurEssaim suit N Controleur : vitesses, termes du PID altitude et etat des 5 PID, a chaque pas."""
+    rng = np.random.default_rng(1)
+    controleurs = [_controleur() for _ in range(NB_DRONES)]
+    essaim = ControleurEssaim(NB_DRONES, controleurs[0])
+
+    positions = rng.normal(0.0, 0.5, (NB_DRONES, 3)) + [0.0, 0.0, 2.0]
+    for controleur, position in zip(controleurs, positions):
+        controleur.reinitialiser(position)
+    essaim.reinitialiser(positions)
+
+    vitesses = np.tile(np.asarray(spec_sim["VITESSES_ROTATION_HELICES"], dtype=float), (NB_DRONES, 1))
+    dt = 1.0 / spec_sim["FREQUENCE_CONTROLE"]
+    for _ in range(NB_PAS):
+        positions += rng.normal(0.0, 0.05, positions.shape)
+        pid_actif = rng.random(NB_DRONES) > 0.1
+        forces = rng.random((NB_DRONES, 4)) > 0.9
+
+        attendues = np.empty_like(vitesses)
+        termes = np.empty((NB_DRONES, 3))
+        for n, controleur in enumerate(controleurs):
+            v, p, i, d, _ = controleur.appliquer_controle(
+                positions[n, 2], np.zeros(3), positions[n], dt, bool(pid_actif[n]), forces[n].tolist(), vitesses[n].tolist()
+            )
+            attendues[n] = v
+            termes[n] = (p, i, d)
+
+        vitesses, termes_essaim = essaim.appliquer_controle(positions, dt, pid_actif, forces, vitesses)
+        assert_allclose(vitesses, attendues, rtol=TOLERANCE, atol=TOLERANCE)
+        assert_allclose(termes_essaim, termes, rtol=TOLERANCE, atol=TOLERANCE)
+        _comparer_etats(essaim.banc, [[getattr(c, nom) for nom in NOMS_PID] for c in controleurs])
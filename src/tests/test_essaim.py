@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from simulation.physique_essaim import PhysiqueEssaim, TOLERANCE_EQUIVALENCE
+from utiles.constantes import physique as phys
+from tests.trajectoires import CAS, preparer_cas
+
+ETAT = ("position_xyz", "vitesse_xyz", "orientation_rpy", "vitesse_angulaire_rpy", "vitesses_helices_reelles")
+
+
+def _jumeler(physique):
+    """Fait avancer une PhysiqueEssaim(1) avec les commandes et perturbations de `physique`, a chaque pas.
+
+    Retourne les etats (drone, essaim) apres chaque pas, par canal.
+    """
+    essaim = PhysiqueEssaim(1, parametres=physique.parametres)
+    for canal in ETAT:
+        getattr(essaim, canal)[0] = getattr(physique, canal)
+    etats = {canal: ([], []) for canal in ETAT}
+    etape = physique.etape_simulation
+
+    def etape_jumelee(vitesses_helices, dt):
+        etape(vitesses_helices, dt)
+        essaim.force_externe[0] = physique.force_externe
+        essaim.couple_externe[0] = physique.couple_externe
+        essaim.etape_simulation(np.asarray(vitesses_helices, dtype=float)[None], dt)
+        for canal, (drone, copie) in etats.items():
+            drone.append(np.array(getattr(physique, canal)))
+            copie.append(getattr(essaim, canal)[0].copy())
+
+    physique.etape_simulation = etape_jumelee
+    return etats
+
+
+@pytest.mark.skipif(phys["ATTITUDE"] != "euler", reason="PhysiqueEssaim integre l'attitude en angles d'Euler")
+@pytest.mark.parametrize("nom", list(CAS))
+def test_equivalence_essaim_drone(nom):
+    """Avec les memes commandes, PhysiqueEssaim(1) suit PhysiqueDrone a TOLERANCE_EQUIVALENCE pres."""
+    simulateur, suivre_evenements = preparer_cas(nom, mode_noyau=False)
+    etats = _jumeler(simulateur.physique_drone)
+    simulateur.executer(CAS[nom].scenario.duree, suivre_evenements)
+
+    for canal, (drone, copie) in etats.items():
+        np.testing.assert_allclose(copie, drone, rtol=TOLERANCE_EQUIVALENCE, atol=TOLERANCE_EQUIVALENCE, err_msg=canal)
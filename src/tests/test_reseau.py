@@ -0,0 +1,118 @@
+import math
+import socket
+import time
+
+import pytest
+
+from simulation.sans_rendu import SimulateurSansRendu
+from simulation.travailleur import TravailleurSimulation
+from utiles.reseau import ClientReseau, InterfaceReseau
+
+HOTE = "127.0.0.1"
+
+
+class _Simulateur:
+    """Facade de Simulateur sans Qt : les commandes passent par la file du travailleur."""
+
+    def __init__(self):
+        self.simulation = SimulateurSansRendu()
+        self.travailleur = TravailleurSimulation(self.simulation)
+
+    @property
+    def instantane(self):
+        return self.travailleur.tampon.lire()
+
+    @property
+    def pid_actif(self):
+        return self.simulation.pid_actif
+
+    @pid_actif.setter
+    def pid_actif(self, actif):
+        self.travailleur.executer(setattr, self.simulation, "pid_actif", bool(actif))
+
+    def fixer_consigne(self, consigne):
+        self.travailleur.executer(self.simulation.fixer_consigne, list(consigne))
+
+    def fixer_vitesse_helice(self, index, vitesse):
+        self.travailleur.executer(self.simulation.fixer_vitesse_helice, index, vitesse)
+
+
+def _port_libre():
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+        s.bind((HOTE, 0))
+        return s.getsockname()[1]
+
+
+def _attendre(condition, delai=2.0):
+    fin = time.monotonic() + delai
+    while not condition():
+        if time.monotonic() > fin:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+@pytest.fixture
+def boucle_locale():
+    """Simulateur mono-fil, interface reseau et client relies en UDP local."""
+    ports = {"port_telemetrie": _port_libre(), "port_commandes": _port_libre()}
+    simulateur = _Simulateur()
+    client = ClientReseau(HOTE, **ports)
+    interface = InterfaceReseau(simulateur, HOTE, **ports)
+    interface.demarrer()
+    yield simulateur, interface, client
+    interface.arreter()
+    client.fermer()
+
+
+def test_commandes_aller_retour(boucle_locale):
+    """Consigne, PID et moteur force arrivent au fil de simulation ; l'etat publie les reflete."""
+    simulateur, interface, client = boucle_locale
+
+    client.envoyer_consigne(1.0, -0.5, 3.0)
+    client.envoyer_pid(False)
+    client.envoyer_moteur(2, 40.0)
+    assert _attendre(lambda: interface.nb_commandes == 3)
+
+    simulateur.travailleur.iteration(0.0)
+    simulation = simulateur.simulation
+    assert simulation.consigne == [1.0, -0.5, 3.0]
+    assert simulation.pid_actif is False
+    assert simulation.moteurs_forces_utilisateur[2]
+    assert simulation.vitesses_helices[2] == 40.0
+
+    assert _attendre(lambda: (client.recevoir(0.1) or {}).get("consigne") == 3.0)
+
+
+@pytest.mark.parametrize("paquet", [
+    b"DRCM",                                                     # trop court
+    b"XXXX\x01" + bytes(24),                                     # mauvaise signature
+    b"DRCM\x09",                                                 # code inconnu
+    b"DRCM\x01" + bytes(8),                                      # arguments tronques
+])
+def test_paquet_malforme_ignore(boucle_locale, paquet):
+    """Un paquet malforme est compte comme invalide et ne modifie pas la simulation."""
+    simulateur, interface, client = boucle_locale
+    client.envoi.sendto(paquet, client.adresse_commandes)
+    assert _attendre(lambda: interface.nb_paquets_invalides == 1)
+    assert interface.nb_commandes == 0
+    assert simulateur.travailleur.commandes.empty()
+
+
+@pytest.mark.parametrize("envoi", [
+    lambda client: client.envoyer_consigne(0.0, math.nan, 2.0),
+    lambda client: client.envoyer_consigne(math.inf, 0.0, 2.0),
+    lambda client: client.envoyer_moteur(0, math.nan),
+    lambda client: client.envoyer_moteur(7, 100.0),
+])
+def test_valeur_rejetee(boucle_locale, envoi):
+    """Valeurs non finies et indice de moteur hors bornes sont rejetes comme paquets invalides."""
+    simulateur, interface, client = boucle_locale
+    consigne = list(simulateur.simulation.consigne)
+    envoi(client)
+    assert _attendre(lambda: interface.nb_paquets_invalides == 1)
+
+    simulateur.travailleur.iteration(0.0)
+    assert interface.nb_commandes == 0
+    assert simulateur.simulation.consigne == consigne
+    assert not any(simulateur.simulation.moteurs_forces_utilisateur)
@@ -0,0 +1,51 @@
+import glob
+import os
+import re
+
+import pytest
+
+from simulation.perturbations import Rafale
+from simulation.scenario import charger_scenario, creer_simulateur, executer_lot, scenario_depuis_dict
+
+DOSSIER_SCENARIOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scenarios")
+
+
+@pytest.mark.parametrize("chemin", sorted(glob.glob(os.path.join(DOSSIER_SCENARIOS, "*.toml"))))
+def test_scenarios_fournis(chemin):
+    """Les scenarios d'exemple sont valides et donnent un simulateur."""
+    scenario = charger_scenario(chemin)
+    creer_simulateur(scenario)
+    if scenario.perturbations is not None:
+        assert all(isinstance(rafale, Rafale) for rafale in scenario.perturbations["rafales"])
+
+
+@pytest.mark.parametrize("donnees, cle", [
+    ({"consignes": [{"t": 1.0}]}, "consignes[0]"),
+    ({"perturbations": {"rafales": [{"debut": 1.0, "duree": 1.0, "amplitude": [1.0, 0.0, 0.0], "force": 3}]}}, "perturbations.rafales[0]"),
+    ({"perturbations": {"rafales": [{"debut": 1.0, "duree": 0.0, "amplitude": [1.0, 0.0, 0.0]}]}}, "perturbations.rafales[0].duree"),
+    ({"perturbations": {"turbulence": {"INTENSITE": [0.1] * 3, "INTENSITE_ANGULAIRE": [0.0] * 3}}}, "perturbations.turbulence"),
+    ({"perturbations": [1.0]}, "perturbations"),
+    ({"pid": 3}, "pid"),
+    ({"pid": {"PID_Z": [1.0, 2.0]}}, "pid.PID_Z"),
+    ({"etat_initial": {"position": ["a", 0.0, 1.0]}}, "etat_initial.position"),
+    ({"physique": {"MASSE": -1.0}}, "physique"),
+    ({"integrateur": "rk9"}, "integrateur"),
+    ({"duree": "x"}, "duree"),
+])
+def test_scenario_invalide(donnees, cle):
+    """Toute erreur de contenu est une ValueError qui nomme la cle, levee a la lecture."""
+    with pytest.raises(ValueError, match=re.escape(cle)):
+        scenario_depuis_dict(donnees, "invalide")
+
+
+def test_lot_valide_avant_le_premier_vol(tmp_path):
+    """Un fichier invalide arrete le lot avant tout vol ; l'erreur nomme le fichier."""
+    valide = tmp_path / "valide.json"
+    valide.write_text('{"duree": 0.5}', encoding="utf-8")
+    invalide = tmp_path / "invalide.json"
+    invalide.write_text('{"integrateur": "rk9"}', encoding="utf-8")
+    sortie = tmp_path / "sortie"
+
+    with pytest.raises(ValueError, match="invalide.json"):
+        executer_lot([str(valide), str(invalide)], str(sortie), nb_processus=1)
+    assert not sortie.exists()
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from simulation.ordonnanceur import Ordonnanceur
+from simulation.sans_rendu import SimulateurSansRendu
+from utiles.constantes import physique as phys
+from tests.trajectoires import CAS, CAS_ORIGINE, REVISION_ORIGINE, charger_reference, comparer, simuler_cas
+
+
+@pytest.mark.parametrize("nom", list(CAS))
+def test_trajectoire_reference(nom):
+    """Le pipeline de reference reproduit la trajectoire enregistree."""
+    ecarts = comparer(simuler_cas(nom, mode_noyau=False), charger_reference(nom))
+    assert not ecarts, "\n".join(ecarts)
+
+
+@pytest.mark.parametrize("nom", CAS_ORIGINE)
+def test_reference_modele_origine(nom):
+    """Les vols sans perturbation sont compares au modele d'origine, pas a une sortie du modele actuel."""
+    assert str(charger_reference(nom)["modele"]) == f"origine {REVISION_ORIGINE}"
+
+
+@pytest.mark.skipif(phys["ATTITUDE"] != "euler", reason="le noyau sans allocation n'existe qu'en attitude d'Euler")
+@pytest.mark.parametrize("nom", list(CAS))
+def test_trajectoire_reference_noyau(nom):
+    """Le noyau sans allocation reste equivalent au pipeline de reference."""
+    ecarts = comparer(simuler_cas(nom, mode_noyau=True), charger_reference(nom))
+    assert not ecarts, "\n".join(ecarts)
+
+
+def test_simulation_deterministe():
+    """Deux vols identiques, turbulence comprise, donnent exactement les memes series."""
+    premier, second = simuler_cas("turbulence"), simuler_cas("turbulence")
+    for canal in ("position_xyz", "orientation_rpy", "vitesses_helices", "termes_pid"):
+        np.testing.assert_array_equal(getattr(premier, canal), getattr(second, canal))
+
+
+class _Releve:
+    """Enregistreur minimal : etat (position, orientation, helices) apres chaque pas physique."""
+
+    def __init__(self):
+        self.etats = []
+
+    def enregistrer(self, simulation):
+        physique = simulation.physique_drone
+        self.etats.append(np.concatenate([physique.position_xyz, physique.orientation_rpy, physique.vitesses_helices_reelles]))
+
+
+def _etats_par_pas(durees_trames):
+    """Avance une simulation ordonnancee trame par trame ; un etat par pas physique."""
+    simulateur = SimulateurSansRendu(ordonnanceur=Ordonnanceur())
+    simulateur.enregistreur = _Releve()
+    for dt in durees_trames:
+        simulateur.avancer(dt, nb_pas_max=10_000)
+    return np.array(simulateur.enregistreur.etats)
+
+
+def test_independance_cadence_rendu():
+    """A pas physique egal, l'etat ne depend pas de la duree des trames de rendu."""
+    reguliere = _etats_par_pas(np.full(90, 1 / 30))
+    irreguliere = _etats_par_pas(np.random.default_rng(0).uniform(1 / 144, 1 / 20, 120))
+
+    nb_pas = min(len(reguliere), len(irreguliere))
+    assert nb_pas > 2000
+    np.testing.assert_array_equal(reguliere[:nb_pas], irreguliere[:nb_pas])
@@ -0,0 +1,259 @@
+import argparse
+import os
+import subprocess
+import types
+from dataclasses import dataclass, fields
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+import numpy as np
+
+from simulation.scenario import Scenario, creer_simulateur
+from simulation.sans_rendu import SimulateurSansRendu, ResultatSimulation
+from utiles.constantes import specifications_simulation as spec_sim
+from utiles.parametres import ParametresDrone
+
+
+DOSSIER_REFERENCES: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "references")
+
+PAS_REFERENCE: float = 1 / 60                      # s, entre deux echantillons de tous les cas
+INTEGRATEUR_REFERENCE: str = "euler_semi_implicite"
+REVISION_ORIGINE: str = "d3ab50a"                  # PhysiqueDrone d'origine, avant les optimisations
+
+# Tolerance par canal de ResultatSimulation : (absolue, relative), ecart admis |a - b| <= abs + rel |b|
+TOLERANCES: Dict[str, Tuple[float, float]] = {
+    "t": (1e-12, 0.0),
+    "position_xyz": (1e-7, 1e-7),             # m
+    "vitesse_xyz": (1e-7, 1e-7),              # m/s
+    "orientation_rpy": (1e-8, 1e-7),          # rad
+    "vitesses_helices": (1e-5, 1e-7),         # rad/s
+    "vitesses_helices_reelles": (1e-5, 1e-7), # rad/s
+    "termes_pid": (1e-6, 1e-7),
+    "consigne": (0.0, 0.0),
+    "crash": (0.0, 0.0),
+}
+
+
+@dataclass
+class CasReference:
+    """Vol de reference : un scenario, plus les actions de l'utilisateur que le scenario ne decrit pas."""
+    scenario: Scenario
+    evenements: Sequence[Tuple[float, Callable[[SimulateurSansRendu], None]]] = ()  # (t, action) par t croissant
+    pid_actif: bool = True
+
+
+def _forcer_moteurs(vitesses: Sequence[float]) -> Callable[[SimulateurSansRendu], None]:
+    """Action : force les moteurs aux vitesses donnees, comme les curseurs de l'interface."""
+    def action(simulateur: SimulateurSansRendu) -> None:
+        for indice, vitesse in enumerate(vitesses):
+            if vitesse is not None:
+                simulateur.fixer_vitesse_helice(indice, vitesse)
+    return action
+
+
+CAS: Dict[str, CasReference] = {
+    # Vol stationnaire a l'altitude de depart
+    "stationnaire": CasReference(Scenario(
+        "stationnaire", duree=5.0, dt=PAS_REFERENCE,
+        etat_initial={"position": [0.0, 0.0, 2.0]},
+        consignes=[(0.0, [0.0, 0.0, 2.0])]
+    )),
+    # Echelon vers la consigne par defaut
+    "echelon_consigne": CasReference(Scenario(
+        "echelon_consigne", duree=8.0, dt=PAS_REFERENCE,
+        etat_initial={"position": [0.0, 0.0, 2.0]},
+        consignes=[(0.0, list(spec_sim["CONSIGNE"]))]
+    )),
+    # Moteur arriere force a mi-regime en vol stationnaire, puis repris par le PID
+    "moteur_force": CasReference(Scenario(
+        "moteur_force", duree=5.0, dt=PAS_REFERENCE,
+        etat_initial={"position": [0.0, 0.0, 2.0]},
+        consignes=[(0.0, [0.0, 0.0, 2.0])]
+    ), evenements=[(1.0, _forcer_moteurs([20.0, None, None, None]))]),
+    # Chute moteurs coupes : impact, rebond puis drone pose
+    "rebond_sol": CasReference(Scenario(
+        "rebond_sol", duree=3.0, dt=PAS_REFERENCE,
+        etat_initial={"position": [0.0, 0.0, 1.5], "vitesse": [0.5, 0.0, -2.0]}
+    ), evenements=[(0.0, _forcer_moteurs([0.0, 0.0, 0.0, 0.0]))], pid_actif=False),
+    # PID coupe : moteurs a la vitesse par defaut, attitude initiale inclinee
+    "pid_inactif": CasReference(Scenario(
+        "pid_inactif", duree=3.0, dt=PAS_REFERENCE,
+        etat_initial={"position": [0.0, 0.0, 2.0], "orientation": [0.05, -0.02, 0.0]}
+    ), pid_actif=False),
+    # Vol stationnaire sous turbulence de Dryden, graine fixe (absente du modele d'origine)
+    "turbulence": CasReference(Scenario(
+        "turbulence", duree=5.0, dt=PAS_REFERENCE,
+        etat_initial={"position": [0.0, 0.0, 2.0]},
+        consignes=[(0.0, [0.0, 0.0, 2.2])],
+        perturbations={
+            "vent_constant": [0.5, 0.0, 0.0],
+            "turbulence": {
+                "INTENSITE": [0.5, 0.5, 0.25],
+                "ECHELLE": [20.0, 20.0, 5.0],
+                "INTENSITE_ANGULAIRE": [0.05, 0.05, 0.05],
+            },
+            "graine": 1234,
+        }
+    )),
+}
+
+
+# Cas que le modele d'origine sait simuler : il n'a pas de perturbations exterieures
+CAS_ORIGINE: List[str] = [nom for nom, cas in CAS.items() if cas.scenario.perturbations is None]
+
+CANAUX_ETAT: Sequence[str] = ("position_xyz", "vitesse_xyz", "orientation_rpy", "vitesse_angulaire_rpy", "vitesses_helices_reelles")
+
+
+# ============================
+# Modele d'origine
+# ============================
+
+def charger_physique_origine(revision: str = REVISION_ORIGINE) -> type:
+    """Classe PhysiqueDrone de `revision`, lue par git, completee des parametres lus par le simulateur actuel."""
+    chemin = "src/simulation/physique.py"
+    source = subprocess.run(
+        ["git", "show", f"{revision}:{chemin}"],
+        cwd=os.path.dirname(DOSSIER_REFERENCES), capture_output=True, text=True, check=True
+    ).stdout
+    module = types.ModuleType(f"physique_{revision}")
+    exec(compile(source, f"{revision}:{chemin}", "exec"), module.__dict__)
+
+    class PhysiqueOrigine(module.PhysiqueDrone):
+        def __init__(self) -> None:
+            super().__init__()
+            self.parametres: ParametresDrone = ParametresDrone()
+
+    return PhysiqueOrigine
+
+
+# ============================
+# Simulation et references
+# ============================
+
+def preparer_cas(
+    nom: str,
+    integrateur: str = INTEGRATEUR_REFERENCE,
+    origine: bool = False,
+    **options: Any
+) -> Tuple[SimulateurSansRendu, Callable[[SimulateurSansRendu], None]]:
+    """Simulateur du cas `nom` et rappel qui declenche ses evenements, a passer a executer().
+
+    origine : la physique est remplacee, etat initial compris, par le PhysiqueDrone de REVISION_ORIGINE.
+    """
+    cas = CAS[nom]
+    simulateur = creer_simulateur(cas.scenario, integrateur=integrateur, **options)
+    simulateur.pid_actif = cas.pid_actif
+    if origine:
+        if nom not in CAS_ORIGINE:
+            raise ValueError(f"Le modele d'origine ne sait pas simuler le cas {nom!r} (perturbations).")
+        physique = charger_physique_origine()()
+        for canal in CANAUX_ETAT:
+            setattr(physique, canal, np.array(getattr(simulateur.physique_drone, canal), dtype=float))
+        simulateur.physique_drone = physique
+    evenements = list(cas.evenements)
+
+    def suivre_evenements(sim: SimulateurSansRendu) -> None:
+        while evenements and sim.t + 0.5 * sim.dt >= evenements[0][0]:
+            evenements.pop(0)[1](sim)
+
+    return simulateur, suivre_evenements
+
+
+def simuler_cas(
+    nom: str,
+    integrateur: str = INTEGRATEUR_REFERENCE,
+    origine: bool = False,
+    **options: Any
+) -> ResultatSimulation:
+    """Simule le cas `nom` ; `options` sont transmises a creer_physique_drone (mode_noyau, ...)."""
+    simulateur, suivre_evenements = preparer_cas(nom, integrateur, origine, **options)
+    return simulateur.executer(CAS[nom].scenario.duree, suivre_evenements)
+
+
+def chemin_reference(nom: str) -> str:
+    return os.path.join(DOSSIER_REFERENCES, f"{nom}.npz")
+
+
+def enregistrer_reference(nom: str, resultat: ResultatSimulation, modele: str = "actuel") -> str:
+    """Ecrit toutes les series de `resultat` dans references/<nom>.npz (compresse), avec le modele qui les a produites.
+
+    Retourne le chemin.
+    """
+    os.makedirs(DOSSIER_REFERENCES, exist_ok=True)
+    chemin = chemin_reference(nom)
+    series = {f.name: getattr(resultat, f.name) for f in fields(ResultatSimulation)}
+    np.savez_compressed(chemin, modele=np.array(modele), **series)
+    return chemin
+
+
+def charger_reference(nom: str) -> Dict[str, np.ndarray]:
+    """Series de reference du cas `nom`, par canal."""
+    with np.load(chemin_reference(nom)) as donnees:
+        return {canal: donnees[canal] for canal in donnees.files}
+
+
+def ecarts_max(resultat: ResultatSimulation, reference: Dict[str, np.ndarray]) -> Dict[str, float]:
+    """Ecart absolu maximal par canal (inf si les formes different)."""
+    ecarts = {}
+    for canal in TOLERANCES:
+        calcule = np.asarray(getattr(resultat, canal), dtype=float)
+        attendu = np.asarray(reference[canal], dtype=float)
+        ecarts[canal] = float(np.max(np.abs(calcule - attendu), initial=0.0)) if calcule.shape == attendu.shape else np.inf
+    return ecarts
+
+
+def comparer(
+    resultat: ResultatSimulation,
+    reference: Dict[str, np.ndarray],
+    tolerances: Dict[str, Tuple[float, float]] = TOLERANCES
+) -> List[str]:
+    """Compare `resultat` a `reference` canal par canal ; un message par canal hors tolerance, liste vide sinon."""
+    messages = []
+    for canal, (absolue, relative) in tolerances.items():
+        calcule = np.asarray(getattr(resultat, canal), dtype=float)
+        attendu = np.asarray(reference[canal], dtype=float)
+        if calcule.shape != attendu.shape:
+            messages.append(f"{canal} : forme {calcule.shape}, attendue {attendu.shape}")
+            continue
+
+        ecart = np.abs(calcule - attendu)
+        hors_tolerance = ecart > absolue + relative * np.abs(attendu)
+        if hors_tolerance.any():
+            pas = int(np.argmax(hors_tolerance.reshape(len(ecart), -1).any(axis=1)))
+            messages.append(
+                f"{canal} : ecart max {ecart.max():.3e}, premier depassement a t = {reference['t'][pas]:.3f} s "
+                f"(tolerance {absolue:g} + {relative:g} |ref|)"
+            )
+    return messages
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare les trajectoires de reference, ou les regenere.")
+    parser.add_argument("cas", nargs="*", choices=[[]] + list(CAS), help="cas a traiter (tous par defaut)")
+    parser.add_argument("--regenerer", action="store_true", help="reecrit les fichiers de reference")
+    parser.add_argument("--integrateur", default=INTEGRATEUR_REFERENCE, help="integrateur compare aux references")
+    parser.add_argument("--noyau", action=argparse.BooleanOptionalAction, default=None, help="physique en mode noyau sans allocation (MODE_NOYAU par defaut)")
+    parser.add_argument("--origine", action="store_true", help=f"simule les cas {', '.join(CAS_ORIGINE)} avec le PhysiqueDrone de {REVISION_ORIGINE}")
+    args = parser.parse_args()
+
+    options = {} if args.noyau is None else {"mode_noyau": args.noyau}
+    for nom in args.cas or CAS:
+        origine = args.origine and nom in CAS_ORIGINE
+        resultat = simuler_cas(nom, args.integrateur, origine, **options)
+        if args.regenerer:
+            modele = f"origine {REVISION_ORIGINE}" if origine else "actuel"
+            print(f"{nom:<17} : reference ({modele}) ecrite dans {enregistrer_reference(nom, resultat, modele)}")
+            continue
+
+        reference = charger_reference(nom)
+        messages = comparer(resultat, reference)
+        ecarts = ecarts_max(resultat, reference)
+        pire = max(ecarts, key=ecarts.get)
+        print(
+            f"{nom:<17} : {'ECHEC' if messages else 'ok   '} (ecart max {ecarts[pire]:.2e} sur {pire}, "
+            f"reference : modele {reference.get('modele', 'inconnu')})"
+        )
+        for message in messages:
+            print(f"    {message}")
+
+
+if __name__ == "__main__":
+    main()
@@ -54,6 +54,7 @@ physique = {
     "MASSE": 2.0,
     "POUSSEE": 0.004, # Coeff de poussée k_f, en kg.m
     "HAUTEUR_SOL" : 0.0,
+    "MARGE_SOL": 0.2, # m, hauteur du centre du drone pose au-dessus du sol
     "VITESSE_HELICE_MIN": 0.0,
     "VITESSE_HELICE_MAX": 60.0,
     "TAU_MOTEUR" : 0.2, # Constante de temps
@@ -69,6 +70,29 @@ physique = {
         "lineaire":  [0.5, 0.5, 0.002],   # k_lin_x, k_lin_y, k_lin_z
         "quadratique": [0.005, 0.005, 0.0001]    # k_quad_x, k_quad_y, k_quad_z
     },
+    "ATTITUDE": "euler", # ou "quaternion"
+    "INTEGRATEUR": "euler_semi_implicite", # ou "rk4", "rk45"
+    "MODE_NOYAU": True, # noyau sans allocation d'Euler semi-implicite, ignore en attitude "quaternion"
+    "FREQUENCE_PHYSIQUE": 1000, # Hz, sous-pas fixes independants du rendu
+    "NB_SOUS_PAS_MAX": 100, # sous-pas max par appel, au-dela le retard est abandonne
+    "RK45_TOLERANCE_RELATIVE": 1e-6,
+    "RK45_TOLERANCE_ABSOLUE": 1e-8,
+    "RK45_PAS_MIN": 1e-6, # s
+    "RK45_PAS_MAX": 0.1, # s
+}
+
+
+# Perturbations ------------------
+
+perturbations = {
+    "VENT_CONSTANT": [0.0, 0.0, 0.0], # m/s, repere monde
+    "TURBULENCE": {
+        "INTENSITE": [0.5, 0.5, 0.25],  # m/s, ecarts types (u, v, w)
+        "ECHELLE": [20.0, 20.0, 5.0],   # m, longueurs d'echelle de Dryden
+        "INTENSITE_ANGULAIRE": [0.05, 0.05, 0.05], # rad/s, rafales de roulis, tangage, lacet
+    },
+    "VITESSE_REFERENCE": 5.0, # m/s, vitesse de l'air qui transporte la turbulence
+    "TAILLE_BLOC": 1024, # pas de bruit generes en une fois
 }
 
 
@@ -81,8 +105,139 @@ specifications_simulation = {
     "PID": {
         "X": {"proportionnel": 0.2, "integral": 1.0, "derive": 3.0},
         "Y": {"proportionnel": 12.0, "integral": 1.0, "derive": 3.0},
-        "Z": {"proportionnel": 10.0, "integral": 2.0, "derive": 4.0}
+        "Z": {"proportionnel": 10.0, "integral": 2.0, "derive": 4.0},
+        "POSITION": {"proportionnel": 1.0, "integral": 0.03, "derive": 0.3},  # m -> rad, x et y
+        "ATTITUDE": {"proportionnel": 1.2, "integral": 0.0, "derive": 0.05},  # rad -> moment, roulis et tangage
+    },
+    "GAIN_MIXAGE_ATTITUDE": 0.03, # moment des PID attitude -> correction de vitesse des helices (rad/s), gain faible
+    "PAS_FIXE": 1 / 60, # s, pas de la simulation sans rendu (cadence nominale de Panda3D)
+    "DUREE_SANS_RENDU": 10.0, # s, duree simulee par defaut de main.py --headless
+    "TRACE_PID_CAPACITE": 4096, # appels conserves par PID quand la trace est activee
+    # Cadences de l'ordonnanceur (la physique suit physique["FREQUENCE_PHYSIQUE"]).
+    # Le PID ignore la derivee pour dt <= 0.01 s : au-dela de 100 Hz, le terme D disparait.
+    "FREQUENCE_CONTROLE": 50, # Hz
+    "FREQUENCE_INTERFACE": 30, # Hz, signaux Qt (graphes, jauges)
+    # Fil de simulation : physique et controle hors du fil Qt
+    "SIMULATION_FIL_DEDIE": True,
+    "PERIODE_TRAVAILLEUR": 0.004, # s, periode de publication des instantanes
+    # Echelle de temps : temps simule par seconde reelle, None = aussi vite que possible
+    "ECHELLE_TEMPS": 1.0,
+    "SAUT_TRAMES_MAX": 8, # au-dela du temps reel, une trame rendue sur SAUT_TRAMES_MAX au plus
+    # Telemetrie : echantillons regroupes en lots, un signal Qt par tick d'interface
+    "TELEMETRIE_TAILLE_LOT": 256, # echantillons max par lot
+    "TELEMETRIE_NB_LOTS_MAX": 64, # lots en attente max, les plus anciens sont abandonnes
+}
+
+
+# Balayage Monte Carlo ------------
+
+specifications_balayage = {
+    "NB_VOLS": 1000,
+    "DUREE": 10.0, # s, duree simulee de chaque vol
+    "GRAINE": 0,
+    # Lois de tirage : ("fixe", v), ("uniforme", min, max), ("normale", moyenne, ecart_type),
+    # ("normale_relative", ecart_type_relatif) autour de la valeur nominale
+    "DISTRIBUTIONS": {
+        "MASSE": ("normale_relative", 0.05),
+        "POUSSEE": ("normale_relative", 0.05),
+        "TAU_MOTEUR": ("uniforme", 0.1, 0.3),
+        "INERTIE": ("normale_relative", 0.1),
+    },
+    # Ecarts types de la perturbation de l'etat initial, tiree par vol (0 = desactivee).
+    # Les boucles laterales actuelles ne rattrapent pas des ecarts de quelques cm / centiemes de rad.
+    "PERTURBATION_INITIALE": {
+        "POSITION": 0.0,          # m
+        "ORIENTATION": 0.0,       # rad
+        "VITESSE_ANGULAIRE": 0.0, # rad/s
+    },
+    # Turbulence de Dryden tiree par vol (meme format que perturbations["TURBULENCE"]), None = sans
+    "TURBULENCE": None,
+    "BANDE_ETABLISSEMENT": 0.02, # fraction de l'echelon de consigne
+    "BANDE_ETABLISSEMENT_MIN": 0.01, # m
+}
+
+
+# Scenarios ------------------------
+
+specifications_scenario = {
+    "DOSSIER_SORTIE": "resultats/scenarios", # metriques (un JSON par scenario), resume.csv et enregistrements
+}
+
+
+# Benchmarks -----------------------
+
+specifications_benchmarks = {
+    "NB_DRONES": [1, 10, 100, 1000], # tailles d'essaim mesurees
+    "DUREE_MESURE": 0.2, # s, duree minimale de chaque mesure
+    "DOSSIER_SORTIE": "resultats/benchmarks", # un JSON par execution
+}
+
+
+# Reglage automatique des PID ------------
+
+specifications_autoreglage = {
+    # Gains cherches, bornes (P, I, D) min et max
+    "BORNES": {
+        "PID_Z": ([0.0, 0.0, 0.0], [30.0, 10.0, 10.0]),
+        "PID_POSITION": ([0.0, 0.0, 0.0], [5.0, 1.0, 3.0]),
+        "PID_ATTITUDE": ([0.0, 0.0, 0.0], [5.0, 1.0, 1.0]),
     },
+    "TAILLE_POPULATION": 16,
+    "NB_GENERATIONS": 30,
+    "SIGMA_INITIAL": 0.2, # fraction de l'intervalle de chaque gain
+    "GRAINE": 0,
+    # Scenario d'evaluation : echelon de consigne, puis rafale laterale
+    "DUREE": 12.0, # s
+    "RAFALE": {"DEBUT": 6.0, "DUREE": 1.0, "AMPLITUDE": [3.0, 0.0, 0.0]}, # s, s, m/s
+    # Cout = somme ponderee des metriques ; un crash ajoute PENALITE_CRASH
+    "POIDS": {
+        "ERREUR_RMS": 1.0,          # m, erreur de position 3D sur l'echelon
+        "DEPASSEMENT_RELATIF": 1.0,
+        "TEMPS_ETABLISSEMENT": 0.2, # s (duree de l'echelon si non etabli)
+        "ECART_RAFALE": 1.0,        # m, ecart maximal a la consigne apres la rafale
+    },
+    "PENALITE_CRASH": 100.0,
+    "FICHIER_CACHE": "resultats/autoreglage_cache.json",
+    "FICHIER_GAINS": "resultats/gains.json",
+}
+
+
+# Export en flux ------------
+
+specifications_export = {
+    "TAILLE_BLOC": 4096, # lignes ecrites d'un seul tenant
+    "NB_BLOCS": 8,       # blocs en memoire au plus (remplissage + attente d'ecriture)
+}
+
+
+# Interface reseau (UDP local) ------------
+
+specifications_reseau = {
+    "ACTIF": False,
+    "HOTE": "127.0.0.1",
+    "PORT_TELEMETRIE": 47800, # etat publie vers ce port
+    "PORT_COMMANDES": 47801,  # commandes recues sur ce port
+    "FREQUENCE_TELEMETRIE": 50, # Hz
+}
+
+
+# Enregistreur de vol ------------
+
+specifications_enregistreur = {
+    "TAILLE_BLOC": 4096, # enregistrements ecrits d'un seul tenant
+    "PAS_INDEX": 1024,   # un temps indexe tous les PAS_INDEX enregistrements
+}
+
+
+# Profilage des etapes ------------
+
+specifications_profileur = {
+    "ACTIF": False,          # profilage des le demarrage
+    "CAPACITE": 4096,        # dernieres durees gardees par etape
+    "BORNES_HISTOGRAMME_NS": (100, 100_000_000), # ns, classes logarithmiques de l'export
+    "NB_CLASSES": 60,
+    "PERIODE_AFFICHAGE_MS": 500, # rafraichissement du panneau de l'interface
+    "DOSSIER_EXPORT": "resultats/profilage",
 }
 
 
@@ -106,6 +261,9 @@ specifications_interface = {
     "CAMERA_AMPLITUDE": 250,
     "CAMERA_ZONE_MORTE": 2,
 
+    # Echelles de temps proposees (None = aussi vite que possible)
+    "ECHELLES_TEMPS": [0.25, 0.5, 1.0, 2.0, 5.0, 10.0, None],
+
     # Moteurs (sliders verticaux)
     "NOMBRE_HELICES": 4,
     "PAS_HELICE": 2,
@@ -0,0 +1,194 @@
+import json
+import os
+import struct
+from typing import Optional, Tuple
+import numpy as np
+
+from utiles.constantes import specifications_enregistreur as spec_enr
+from utiles.parametres import ParametresDrone
+
+
+# Un enregistrement par pas physique
+DTYPE_ENREGISTREMENT = np.dtype([
+    ("t", "<f8"),
+    ("position_xyz", "<f8", (3,)),
+    ("vitesse_xyz", "<f8", (3,)),
+    ("orientation_rpy", "<f8", (3,)),
+    ("vitesse_angulaire_rpy", "<f8", (3,)),
+    ("vitesses_helices", "<f8", (4,)),          # commandees
+    ("vitesses_helices_reelles", "<f8", (4,)),
+    ("termes_pid", "<f8", (3,)),                # P, I, D du PID altitude
+    ("consigne_xyz", "<f8", (3,)),
+    ("crash", "u1"),
+])
+
+# Entete : signature, version, taille de l'entete, puis description JSON completee par des espaces
+SIGNATURE = b"ENRVOL\x00\x00"
+VERSION = 1
+_FORMAT_ENTETE = "<8sII"
+_ALIGNEMENT_ENTETE = 64
+
+
+def _ecrire_entete(fichier, pas_index: int) -> int:
+    """Ecrit l'entete et retourne sa taille (multiple de 64 octets)."""
+    description = json.dumps({
+        "dtype": [list(champ) if len(champ) == 2 else [champ[0], champ[1], list(champ[2])] for champ in DTYPE_ENREGISTREMENT.descr],
+        "pas_index": int(pas_index),
+    }).encode("utf-8")
+    taille = struct.calcsize(_FORMAT_ENTETE) + len(description)
+    taille = -(-taille // _ALIGNEMENT_ENTETE) * _ALIGNEMENT_ENTETE
+    fichier.write(struct.pack(_FORMAT_ENTETE, SIGNATURE, VERSION, taille))
+    fichier.write(description.ljust(taille - struct.calcsize(_FORMAT_ENTETE)))
+    return taille
+
+
+def _lire_entete(chemin: str) -> Tuple[int, np.dtype, int]:
+    """Retourne (taille de l'entete, dtype, pas de l'index) d'un fichier d'enregistrement."""
+    with open(chemin, "rb") as fichier:
+        signature, version, taille = struct.unpack(_FORMAT_ENTETE, fichier.read(struct.calcsize(_FORMAT_ENTETE)))
+        if signature != SIGNATURE:
+            raise ValueError(f"{chemin} n'est pas un enregistrement de vol.")
+        if version != VERSION:
+            raise ValueError(f"Version d'enregistrement non supportee : {version}.")
+        description = json.loads(fichier.read(taille - struct.calcsize(_FORMAT_ENTETE)).decode("utf-8"))
+    dtype = np.dtype([tuple(champ) if len(champ) == 2 else (champ[0], champ[1], tuple(champ[2])) for champ in description["dtype"]])
+    return taille, dtype, int(description["pas_index"])
+
+
+class EnregistreurVol:
+    """Ecrit l'etat complet de chaque pas dans un fichier binaire a schema fixe.
+
+    Les enregistrements (DTYPE_ENREGISTREMENT) sont copies dans un bloc
+    pre-alloue, ecrit d'un seul tenant en fin de fichier quand il est plein.
+    Le fichier n'est jamais reecrit : un vol interrompu reste lisible jusqu'au
+    dernier bloc ecrit.
+    """
+
+    def __init__(
+        self,
+        chemin: str,
+        taille_bloc: int = spec_enr["TAILLE_BLOC"],
+        pas_index: int = spec_enr["PAS_INDEX"]
+    ) -> None:
+        """Cree le fichier (ecrase s'il existe) et ecrit l'entete."""
+        dossier = os.path.dirname(chemin)
+        if dossier:
+            os.makedirs(dossier, exist_ok=True)
+        self.chemin: str = chemin
+        self._fichier = open(chemin, "wb")
+        _ecrire_entete(self._fichier, pas_index)
+
+        self._bloc: np.ndarray = np.zeros(int(taille_bloc), dtype=DTYPE_ENREGISTREMENT)
+        self._n: int = 0
+        self.nb_enregistrements: int = 0
+
+    def enregistrer(self, simulation) -> None:
+        """Ajoute l'etat courant d'une SimulateurSansRendu (ou d'un objet de memes attributs)."""
+        physique = simulation.physique_drone
+        controleur = simulation.controleur
+        ligne = self._bloc[self._n]
+        ligne["t"] = simulation.t
+        ligne["position_xyz"] = physique.position_xyz
+        ligne["vitesse_xyz"] = physique.vitesse_xyz
+        ligne["orientation_rpy"] = physique.orientation_rpy
+        ligne["vitesse_angulaire_rpy"] = physique.vitesse_angulaire_rpy
+        ligne["vitesses_helices"] = simulation.vitesses_helices
+        ligne["vitesses_helices_reelles"] = physique.vitesses_helices_reelles
+        ligne["termes_pid"] = simulation.derniers_termes
+        ligne["consigne_xyz"] = (controleur.pid_pos_x.consigne, controleur.pid_pos_y.consigne, controleur.pid_z.consigne)
+        ligne["crash"] = physique.crash
+
+        self._n += 1
+        self.nb_enregistrements += 1
+        if self._n == len(self._bloc):
+            self.vider()
+
+    def vider(self) -> None:
+        """Ecrit le bloc en cours en fin de fichier."""
+        if self._n:
+            self._fichier.write(self._bloc[:self._n].tobytes())
+            self._fichier.flush()
+            self._n = 0
+
+    def fermer(self) -> None:
+        """Ecrit le dernier bloc et ferme le fichier."""
+        if not self._fichier.closed:
+            self.vider()
+            self._fichier.close()
+
+    def __enter__(self) -> "EnregistreurVol":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fermer()
+
+
+class LecteurVol:
+    """Lit un enregistrement de vol par np.memmap, sans le charger en memoire.
+
+    L'index creux garde le temps d'un enregistrement sur `pas_index` : une
+    recherche par temps lit l'index puis un seul intervalle de `pas_index`
+    enregistrements. Les temps doivent etre croissants (un vol sans
+    reinitialisation).
+    """
+
+    def __init__(self, chemin: str, parametres: Optional[ParametresDrone] = None) -> None:
+        """Ouvre le fichier en lecture ; un enregistrement incomplet en fin de fichier est ignore.
+
+        parametres : ParametresDrone du drone rejoue (sens des helices) ; ceux des constantes par defaut.
+        ValueError si le fichier ne contient aucun enregistrement complet.
+        """
+        self.chemin: str = chemin
+        self.sens_helices: Tuple[float, ...] = (parametres if parametres is not None else ParametresDrone()).sens_helices
+        taille_entete, dtype, self.pas_index = _lire_entete(chemin)
+        nb = (os.path.getsize(chemin) - taille_entete) // dtype.itemsize
+        if nb == 0:
+            raise ValueError(f"{chemin} ne contient aucun enregistrement.")
+        self.donnees: np.ndarray = np.memmap(chemin, dtype=dtype, mode="r", offset=taille_entete, shape=(nb,))
+        self.index_t: np.ndarray = np.array(self.donnees["t"][::self.pas_index])
+
+    def __len__(self) -> int:
+        return len(self.donnees)
+
+    @property
+    def duree(self) -> float:
+        """Temps du dernier enregistrement (s)."""
+        return float(self.donnees["t"][-1])
+
+    def indice(self, t: float) -> int:
+        """Indice du dernier enregistrement de temps <= t (0 si t precede le vol)."""
+        bloc = max(0, int(np.searchsorted(self.index_t, t, side="right")) - 1)
+        debut = bloc * self.pas_index
+        temps = self.donnees["t"][debut:debut + self.pas_index]
+        return max(0, debut + int(np.searchsorted(temps, t, side="right")) - 1)
+
+    def etat(self, t: float) -> np.void:
+        """Enregistrement de l'instant t."""
+        return self.donnees[self.indice(t)]
+
+    def intervalle(self, debut: float, fin: Optional[float] = None) -> np.ndarray:
+        """Enregistrements de temps compris entre debut et fin (vue sur le memmap)."""
+        i = self.indice(debut)
+        j = len(self) if fin is None else self.indice(fin) + 1
+        return self.donnees[i:j]
+
+    def appliquer(self, modele_drone, t: float, dt: float = 0.0) -> None:
+        """Place `modele_drone` (ModeleDrone) dans l'etat enregistre a l'instant t, helices comprises."""
+        etat = self.etat(t)
+        modele_drone.mettre_a_jour_pose(etat["position_xyz"], etat["orientation_rpy"])
+        for i, (vitesse, sens) in enumerate(zip(etat["vitesses_helices_reelles"], self.sens_helices)):
+            modele_drone.helices[i][1] = vitesse * sens
+        modele_drone.mettre_a_jour_helices(dt)
+
+    def tache_rejeu(self, modele_drone, vitesse: float = 1.0):
+        """Tache Panda3D qui rejoue le vol sur `modele_drone`, `vitesse` fois le temps reel, sans physique."""
+        etat = {"t": float(self.donnees["t"][0]), "precedent": None}
+
+        def rejouer(task):
+            dt = 0.0 if etat["precedent"] is None else task.time - etat["precedent"]
+            etat["precedent"] = task.time
+            etat["t"] += vitesse * dt
+            self.appliquer(modele_drone, etat["t"], dt)
+            return task.done if etat["t"] >= self.duree else task.cont
+
+        return rejouer
@@ -1,6 +1,15 @@
 import csv
+import gzip
+import io
+import itertools
 import os
-from typing import Dict, Iterable, List, Optional
+import queue
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence
+import numpy as np
+
+from utiles.constantes import specifications_export as spec_exp
 
 
 def ecrire_lignes_csv(
@@ -13,28 +22,264 @@ def ecrire_lignes_csv(
     """
     Ecrit des lignes dict -> CSV (creation si besoin, append sinon).
     Retourne le chemin complet du fichier.
+    Les lignes sont ecrites au fil de l'iterable, sans le copier ; pour un
+    journal ecrit a chaque pas, utiliser ExportateurFlux.
     """
     # assurer le dossier
     os.makedirs(chemin_dossier, exist_ok=True)
 
     chemin_fichier = os.path.join(chemin_dossier, nom_fichier)
-    fichier_existe = os.path.exists(chemin_fichier)
 
-    # deduire les entetes au besoin
+    # deduire les entetes au besoin : cles de la premiere ligne
+    lignes = iter(lignes)
     if entetes is None:
-        # prendre les cles de la premiere ligne
-        lignes = list(lignes)
-        if len(lignes) == 0:
+        premiere = next(lignes, None)
+        if premiere is None:
             return chemin_fichier
-        entetes = list(lignes[0].keys())
+        entetes = list(premiere.keys())
+        lignes = itertools.chain([premiere], lignes)
 
-    # ecriture
-    mode = "a" if fichier_existe else "w"
-    with open(chemin_fichier, mode, newline="", encoding=encodage) as f:
+    # ecriture : l'entete seulement si le fichier est vide (mode "a" le cree au besoin)
+    with open(chemin_fichier, "a", newline="", encoding=encodage) as f:
         writer = csv.DictWriter(f, fieldnames=entetes)
-        if not fichier_existe:
+        if f.tell() == 0:
             writer.writeheader()
-        for l in lignes:
-            writer.writerow(l)
+        writer.writerows(lignes)
+
+    return chemin_fichier
+
+
+class ExportateurFlux:
+    """Journal a haut debit : lignes de flottants bufferisees par colonnes, ecrites par un fil dedie.
+
+    Un bloc pre-alloue range chaque colonne dans une ligne contigue (colonnes x
+    taille_bloc) : ajouter() n'ecrit qu'une case par colonne, ajouter_colonnes()
+    copie chaque serie d'un seul tenant. Un bloc plein passe au fil d'ecriture,
+    qui le formate et l'ecrit d'un seul tenant. La memoire est bornee : nb_blocs blocs au plus existent. Si l'ecriture
+    prend du retard, ajouter() attend un bloc libre (bloquant=True) ou abandonne
+    le bloc courant et compte les lignes perdues (bloquant=False).
+    nb_lignes ne compte que les lignes confiees au fil d'ecriture.
+
+    format "csv" : texte, une ligne par echantillon.
+    format "colonnes" : blocs NumPy (np.save) bout a bout, relus par lire_colonnes().
+    compression : gzip, extension ".gz" ajoutee.
+    Rotation : nouveau fichier (suffixe _000, _001, ...) au-dela de taille_max
+    octets ecrits ou de duree_max secondes d'ouverture.
+    """
+
+    def __init__(
+        self,
+        chemin: str,
+        colonnes: Sequence[str],
+        format: str = "csv",
+        compression: bool = False,
+        taille_bloc: int = spec_exp["TAILLE_BLOC"],
+        nb_blocs: int = spec_exp["NB_BLOCS"],
+        taille_max: Optional[int] = None,
+        duree_max: Optional[float] = None,
+        bloquant: bool = True
+    ) -> None:
+        """Prepare les blocs et demarre le fil d'ecriture ; le premier fichier est ouvert par ce fil."""
+        if format not in ("csv", "colonnes"):
+            raise ValueError(f"Format d'export inconnu : {format}.")
+        self.colonnes: tuple = tuple(colonnes)
+        self.format: str = format
+        self.compression: bool = bool(compression)
+        self.taille_max: Optional[int] = taille_max
+        self.duree_max: Optional[float] = duree_max
+        self.bloquant: bool = bool(bloquant)
+
+        if self.compression and chemin.endswith(".gz"):
+            chemin = chemin[:-3]
+        racine, extension = os.path.splitext(chemin)
+        if not extension:
+            extension = ".csv" if format == "csv" else ".npy"
+        self._racine: str = racine
+        self._extension: str = extension + (".gz" if self.compression else "")
+        self.rotation: bool = taille_max is not None or duree_max is not None
+        dossier = os.path.dirname(chemin)
+        if dossier:
+            os.makedirs(dossier, exist_ok=True)
+
+        # Blocs : un en cours de remplissage, les autres libres ou en attente d'ecriture
+        forme = (len(self.colonnes), int(taille_bloc))
+        self._taille_bloc: int = forme[1]
+        self._libres: "queue.Queue[np.ndarray]" = queue.Queue()
+        for _ in range(max(2, int(nb_blocs)) - 1):
+            self._libres.put(np.empty(forme))
+        self._a_ecrire: "queue.Queue" = queue.Queue()
+        self._bloc: np.ndarray = np.empty(forme)
+        self._n: int = 0
+
+        self.fichiers: List[str] = []
+        self.nb_lignes: int = 0
+        self.nb_lignes_abandonnees: int = 0
+        self._erreur: Optional[BaseException] = None
+
+        self._fil = threading.Thread(target=self._ecrire, name="ExportateurFlux", daemon=True)
+        self._fil.start()
+
+    # ----- Fil appelant -----
+
+    def ajouter(self, *valeurs: float) -> None:
+        """Ajoute une ligne (une valeur par colonne)."""
+        self._bloc[:, self._n] = valeurs
+        self._n += 1
+        if self._n == self._taille_bloc:
+            self._passer_bloc()
+
+    def ajouter_colonnes(self, series: Dict[str, np.ndarray]) -> None:
+        """Ajoute des series de meme longueur, par colonne."""
+        donnees = [np.asarray(series[nom], dtype=float) for nom in self.colonnes]
+        longueur = len(donnees[0])
+        if any(len(serie) != longueur for serie in donnees):
+            raise ValueError("Les series exportees doivent avoir la meme longueur.")
+        debut = 0
+        while debut < longueur:
+            n = min(longueur - debut, self._taille_bloc - self._n)
+            for ligne, serie in zip(self._bloc, donnees):
+                ligne[self._n:self._n + n] = serie[debut:debut + n]
+            self._n += n
+            debut += n
+            if self._n == self._taille_bloc:
+                self._passer_bloc()
+
+    def vider(self) -> None:
+        """Confie au fil d'ecriture les lignes en cours, meme si le bloc n'est pas plein."""
+        if self._n:
+            self._passer_bloc()
+
+    def fermer(self) -> None:
+        """Ecrit les lignes restantes, arrete le fil et ferme le fichier."""
+        if self._fil.is_alive():
+            self.vider()
+            self._a_ecrire.put(None)
+            self._fil.join()
+        self._verifier()
+
+    def __enter__(self) -> "ExportateurFlux":
+        return self
 
-    return chemin_fichier
\ No newline at end of file
+    def __exit__(self, *exc) -> None:
+        self.fermer()
+
+    def _passer_bloc(self) -> None:
+        self._verifier()
+        try:
+            bloc_libre = self._libres.get(block=self.bloquant)
+        except queue.Empty:
+            # Ecriture en retard : le bloc courant est abandonne et reutilise
+            self.nb_lignes_abandonnees += self._n
+            self._n = 0
+            return
+        self._a_ecrire.put((self._bloc, self._n))
+        self.nb_lignes += self._n
+        self._bloc, self._n = bloc_libre, 0
+
+    def _verifier(self) -> None:
+        if self._erreur is not None:
+            raise RuntimeError("Echec de l'ecriture de l'export.") from self._erreur
+
+    # ----- Fil d'ecriture -----
+
+    def _nom_fichier(self) -> str:
+        if not self.rotation:
+            return self._racine + self._extension
+        return f"{self._racine}_{len(self.fichiers):03d}{self._extension}"
+
+    def _ouvrir(self):
+        chemin = self._nom_fichier()
+        self.fichiers.append(chemin)
+        brut = gzip.open(chemin, "wb") if self.compression else open(chemin, "wb")
+        if self.format == "csv":
+            brut.write((",".join(self.colonnes) + "\n").encode("utf-8"))
+        return brut
+
+    def _ecrire(self) -> None:
+        fichier = None
+        octets = 0
+        ouverture = 0.0
+        try:
+            while True:
+                element = self._a_ecrire.get()
+                if element is None:
+                    break
+                bloc, n = element
+
+                if fichier is not None and self.rotation and (
+                    (self.taille_max is not None and octets >= self.taille_max)
+                    or (self.duree_max is not None and time.monotonic() - ouverture >= self.duree_max)
+                ):
+                    fichier.close()
+                    fichier = None
+                if fichier is None:
+                    fichier = self._ouvrir()
+                    octets, ouverture = 0, time.monotonic()
+
+                if self.format == "csv":
+                    texte = io.StringIO()
+                    np.savetxt(texte, bloc[:, :n].T, fmt="%.9g", delimiter=",")
+                    donnees = texte.getvalue().encode("utf-8")
+                else:
+                    enregistrements = np.empty(n, dtype=np.dtype([(nom, "<f8") for nom in self.colonnes]))
+                    for nom, colonne in zip(self.colonnes, bloc):
+                        enregistrements[nom] = colonne[:n]
+                    tampon = io.BytesIO()
+                    np.save(tampon, enregistrements)
+                    donnees = tampon.getvalue()
+                fichier.write(donnees)
+                octets += len(donnees)
+                self._libres.put(bloc)
+        except BaseException as err:
+            self._erreur = err
+            # Debloque un appelant en attente d'un bloc libre
+            self._libres.put(np.empty_like(self._bloc))
+        finally:
+            if fichier is not None:
+                fichier.close()
+
+
+# Etat exporte a chaque pas par ExportateurEtat
+COLONNES_ETAT = (
+    "t", "x", "y", "z", "vx", "vy", "vz", "roll", "pitch", "yaw",
+    "helice_0", "helice_1", "helice_2", "helice_3", "p", "i", "d", "consigne_z", "crash",
+)
+
+
+class ExportateurEtat(ExportateurFlux):
+    """ExportateurFlux des colonnes COLONNES_ETAT, branche comme enregistreur d'une SimulateurSansRendu."""
+
+    def __init__(self, chemin: str, **options) -> None:
+        super().__init__(chemin, COLONNES_ETAT, **options)
+
+    def enregistrer(self, simulation) -> None:
+        """Ajoute l'etat courant de `simulation` (appele apres chaque pas physique)."""
+        physique = simulation.physique_drone
+        x, y, z = physique.position_xyz
+        vx, vy, vz = physique.vitesse_xyz
+        roll, pitch, yaw = physique.orientation_rpy
+        h0, h1, h2, h3 = physique.vitesses_helices_reelles
+        p, i, d = simulation.derniers_termes
+        self.ajouter(
+            simulation.t, x, y, z, vx, vy, vz, roll, pitch, yaw,
+            h0, h1, h2, h3, p, i, d, simulation.controleur.pid_z.consigne, physique.crash
+        )
+
+
+def lire_colonnes(chemin: str) -> Dict[str, np.ndarray]:
+    """Relit un fichier ecrit par ExportateurFlux au format "colonnes".
+
+    ValueError si un bloc est illisible (fichier tronque ou d'un autre format).
+    """
+    ouvrir = gzip.open if chemin.endswith(".gz") else open
+    blocs = []
+    with ouvrir(chemin, "rb") as fichier:
+        while True:
+            try:
+                blocs.append(np.load(fichier))
+            except EOFError:
+                break
+    if not blocs:
+        return {}
+    donnees = np.concatenate(blocs)
+    return {nom: donnees[nom] for nom in donnees.dtype.names}
@@ -1,5 +1,6 @@
-from typing import Deque, Tuple
+from typing import Deque, Dict, List, Sequence, Tuple
 from collections import deque
+import numpy as np
 
 class MemoireTamponPid:
     """Tampon glissant faible cout pour 0.5 s de donnees."""
@@ -12,6 +13,16 @@ class MemoireTamponPid:
         self.deque_donnees.append((t, p, i, d, consigne, mesure))
         self._purger(t)
 
+    def vider(self) -> None:
+        self.deque_donnees.clear()
+
+    def ajouter_lot(self, t, p, i, d, consigne, mesure) -> None:
+        """Ajoute des series de meme longueur en une fois."""
+        if len(t) == 0:
+            return
+        self.deque_donnees.extend(zip(t, p, i, d, consigne, mesure))
+        self._purger(self.deque_donnees[-1][0])
+
     def _purger(self, t_courant: float) -> None:
         t_limite = t_courant - self.fenetre_s
         while self.deque_donnees and self.deque_donnees[0][0] < t_limite:
@@ -23,4 +34,41 @@ class MemoireTamponPid:
             t.append(e[0])
             p.append(e[1]); i.append(e[2]); d.append(e[3])
             c.append(e[4]); m.append(e[5])
-        return t, p, i, d, c, m
\ No newline at end of file
+        return t, p, i, d, c, m
+
+
+class TamponCirculaire:
+    """Tampon circulaire pre-alloue : garde les `capacite` dernieres lignes de valeurs flottantes."""
+    def __init__(self, capacite: int, colonnes: Sequence[str]) -> None:
+        self.capacite: int = int(capacite)
+        self.colonnes: Tuple[str, ...] = tuple(colonnes)
+        self._donnees: np.ndarray = np.zeros((self.capacite, len(self.colonnes)))
+        self._indice: int = 0      # prochaine ligne ecrite
+        self.nb_ajouts: int = 0    # total depuis la creation, lignes ecrasees comprises
+
+    def ajouter(self, *valeurs: float) -> None:
+        self._donnees[self._indice] = valeurs
+        self._indice += 1
+        if self._indice == self.capacite:
+            self._indice = 0
+        self.nb_ajouts += 1
+
+    def __len__(self) -> int:
+        return min(self.nb_ajouts, self.capacite)
+
+    def vider(self) -> None:
+        self._indice = 0
+        self.nb_ajouts = 0
+
+    def lire(self) -> Dict[str, np.ndarray]:
+        """Retourne une copie des lignes presentes, de la plus ancienne a la plus recente, par colonne."""
+        if self.nb_ajouts <= self.capacite:
+            lignes = self._donnees[:self.nb_ajouts]
+        else:
+            lignes = np.roll(self._donnees, -self._indice, axis=0)
+        return {nom: lignes[:, k].copy() for k, nom in enumerate(self.colonnes)}
+
+    def lignes(self) -> List[Dict[str, float]]:
+        """Retourne les lignes presentes sous forme de dicts, pour utiles.export.ecrire_lignes_csv."""
+        series = self.lire()
+        return [dict(zip(self.colonnes, valeurs)) for valeurs in zip(*(series[nom].tolist() for nom in self.colonnes))]
\ No newline at end of file
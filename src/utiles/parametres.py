@@ -0,0 +1,183 @@
+import json
+import os
+from dataclasses import dataclass, field, fields, replace
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11 : fichiers JSON uniquement
+    tomllib = None
+
+from utiles.constantes import (
+    physique as phys,
+    specifications_drone as spec_drone,
+    specifications_simulation as spec_sim
+)
+
+
+GRAVITE: float = 9.81  # m/s^2
+
+# Mixage du controleur : (u_t, L, M, N) -> vitesses des helices 0 arriere, 1 gauche, 2 avant, 3 droite
+MATRICE_MIXAGE = np.array([
+    [1.0,  0.0, -1.0,  1.0],
+    [1.0,  1.0,  0.0, -1.0],
+    [1.0,  0.0,  1.0,  1.0],
+    [1.0, -1.0,  0.0, -1.0],
+])
+MATRICE_MIXAGE.setflags(write=False)
+
+
+def lire_toml_ou_json(chemin: str) -> Dict[str, Any]:
+    """Contenu d'un fichier .toml ou .json ; ValueError nommant le fichier si le format n'est pas reconnu ou la syntaxe invalide."""
+    extension = os.path.splitext(chemin)[1]
+    try:
+        if extension == ".toml":
+            if tomllib is None:
+                raise ValueError("la lecture TOML demande Python 3.11 ou plus (utiliser un fichier JSON).")
+            with open(chemin, "rb") as f:
+                return tomllib.load(f)
+        if extension == ".json":
+            with open(chemin, "r", encoding="utf-8") as f:
+                return json.load(f)
+    except ValueError as err:  # tomllib.TOMLDecodeError et json.JSONDecodeError en derivent
+        raise ValueError(f"{chemin} : {err}") from None
+    raise ValueError(f"{chemin} : format inconnu (attendu .toml ou .json).")
+
+
+def _lecture_seule(valeurs) -> np.ndarray:
+    tableau = np.array(valeurs, dtype=float)
+    tableau.setflags(write=False)
+    return tableau
+
+
+@dataclass(frozen=True, slots=True)
+class ParametresDrone:
+    """Parametres physiques d'un drone, valides et figes, avec leurs grandeurs derivees.
+
+    Les grandeurs derivees (inverse de l'inertie, trainee, poids, matrice de
+    mixage, limites du sol) sont
+    calculees une fois a la creation. Une instance est immuable : elle se
+    partage entre autant de drones que voulu. remplacer() en derive une copie
+    modifiee, pour un drone particulier d'un balayage.
+    """
+    masse: float = phys["MASSE"]                                      # kg
+    poussee: float = phys["POUSSEE"]                                  # k_f, N / (rad/s)^2
+    inertie: Tuple[float, float, float] = tuple(phys["INERTIE"])      # kg.m^2, (Ix, Iy, Iz)
+    tau_moteur: float = phys["TAU_MOTEUR"]                            # s
+    k_yaw: float = phys["K_YAW"]
+    amortissement_angulaire: float = phys["AMORTISSEMENT_ANGULAIRE"]
+    frottement_angulaire: float = phys["FROTTEMENT_ANGULAIRE"]
+    inertie_rotor: float = phys["INERTIE_ROTOR"]                      # kg.m^2
+    densite_air: float = phys["DENSITE_AIR"]                          # kg/m^3
+    frottements_lineaires: Tuple[float, float, float] = tuple(phys["FROTTEMENTS"]["lineaire"])
+    frottements_quadratiques: Tuple[float, float, float] = tuple(phys["FROTTEMENTS"]["quadratique"])
+    vitesse_helice_min: float = phys["VITESSE_HELICE_MIN"]            # rad/s
+    vitesse_helice_max: float = phys["VITESSE_HELICE_MAX"]            # rad/s
+    hauteur_sol: float = phys["HAUTEUR_SOL"]                          # m
+    marge_sol: float = phys["MARGE_SOL"]                              # m, hauteur du centre du drone pose
+    seuil_rebond: float = phys["SEUIL_REBOND"]                        # m/s
+    coeff_rebond: float = phys["COEFF_REBOND"]
+    longueur_bras: float = spec_drone["LONGUEUR_BRAS"]                # m
+    hauteur_drone: float = spec_drone["HAUTEUR_DRONE"]                # m
+    coeffs_trainee: Tuple[float, float, float] = tuple(spec_drone["COEFFS_TRAINEE"])
+    sens_helices: Tuple[float, float, float, float] = tuple(spec_sim["SENS_HELICES"])
+
+    # Grandeurs derivees, calculees par __post_init__
+    inertie_inv: np.ndarray = field(init=False, repr=False, compare=False)           # (3,)
+    coeffs_gyro: np.ndarray = field(init=False, repr=False, compare=False)           # (Iz - Iy, Ix - Iz, Iy - Ix)
+    surface_corps: np.ndarray = field(init=False, repr=False, compare=False)         # (3,) m^2, repere corps
+    coeffs_trainee_corps: np.ndarray = field(init=False, repr=False, compare=False)  # (3,) -0.5 rho S Cd
+    masse_inv: float = field(init=False, repr=False, compare=False)
+    poids: float = field(init=False, repr=False, compare=False)                      # N
+    matrice_mixage: np.ndarray = field(init=False, repr=False, compare=False)         # (4, 4), voir MATRICE_MIXAGE
+    hauteur_min: float = field(init=False, repr=False, compare=False)                # m, altitude du drone pose
+
+    def __post_init__(self) -> None:
+        """Convertit, valide et calcule les grandeurs derivees ; ValueError si un parametre est invalide."""
+        ecrire = object.__setattr__
+        for champ in fields(self):
+            if not champ.init:
+                continue
+            valeur = getattr(self, champ.name)
+            if isinstance(valeur, (list, tuple, np.ndarray)):
+                ecrire(self, champ.name, tuple(float(v) for v in valeur))
+            else:
+                ecrire(self, champ.name, float(valeur))
+        self._valider()
+
+        Ix, Iy, Iz = self.inertie
+        surface_laterale = 2 * self.longueur_bras * self.hauteur_drone
+        surface_dessus = (2 * self.longueur_bras)**2
+        surface_corps = np.array([surface_laterale, surface_laterale, surface_dessus])
+
+        ecrire(self, "inertie_inv", _lecture_seule(1.0 / np.array(self.inertie)))
+        ecrire(self, "coeffs_gyro", _lecture_seule([Iz - Iy, Ix - Iz, Iy - Ix]))
+        ecrire(self, "surface_corps", _lecture_seule(surface_corps))
+        ecrire(self, "coeffs_trainee_corps", _lecture_seule(-0.5 * self.densite_air * surface_corps * np.array(self.coeffs_trainee)))
+        ecrire(self, "masse_inv", 1.0 / self.masse)
+        ecrire(self, "poids", GRAVITE * self.masse)
+        ecrire(self, "matrice_mixage", MATRICE_MIXAGE)
+        ecrire(self, "hauteur_min", self.hauteur_sol + self.marge_sol)
+
+    def _valider(self) -> None:
+        """ValueError au premier parametre hors de son domaine."""
+        strictement_positifs = ("masse", "poussee", "tau_moteur", "longueur_bras", "hauteur_drone")
+        positifs = (
+            "k_yaw", "amortissement_angulaire", "frottement_angulaire", "inertie_rotor", "densite_air",
+            "vitesse_helice_min", "marge_sol", "seuil_rebond"
+        )
+        for nom in strictement_positifs:
+            if not getattr(self, nom) > 0.0:
+                raise ValueError(f"{nom} doit etre strictement positif : {getattr(self, nom)}.")
+        for nom in positifs:
+            if not getattr(self, nom) >= 0.0:
+                raise ValueError(f"{nom} doit etre positif ou nul : {getattr(self, nom)}.")
+
+        for nom, taille in (("inertie", 3), ("frottements_lineaires", 3), ("frottements_quadratiques", 3), ("coeffs_trainee", 3), ("sens_helices", 4)):
+            if len(getattr(self, nom)) != taille:
+                raise ValueError(f"{nom} doit avoir {taille} composantes.")
+        if not all(i > 0.0 for i in self.inertie):
+            raise ValueError(f"inertie doit etre strictement positive : {self.inertie}.")
+        if not all(c >= 0.0 for c in self.frottements_lineaires + self.frottements_quadratiques + self.coeffs_trainee):
+            raise ValueError("Les coefficients de frottement et de trainee doivent etre positifs ou nuls.")
+        if not all(s in (-1.0, 1.0) for s in self.sens_helices):
+            raise ValueError(f"sens_helices ne contient que +1 ou -1 : {self.sens_helices}.")
+        if not self.vitesse_helice_min <= self.vitesse_helice_max:
+            raise ValueError("vitesse_helice_min doit etre inferieure a vitesse_helice_max.")
+        if not 0.0 <= self.coeff_rebond <= 1.0:
+            raise ValueError(f"coeff_rebond doit etre entre 0 et 1 : {self.coeff_rebond}.")
+
+    @classmethod
+    def noms(cls) -> List[str]:
+        """Noms des parametres de base (acceptes par le constructeur, remplacer() et les fichiers)."""
+        return [champ.name for champ in fields(cls) if champ.init]
+
+    @classmethod
+    def depuis_dict(cls, donnees: Dict[str, Any], base: Optional["ParametresDrone"] = None) -> "ParametresDrone":
+        """`base` (valeurs des constantes par defaut) modifiee par `donnees` ; ValueError si une cle est inconnue."""
+        inconnues = set(donnees) - set(cls.noms())
+        if inconnues:
+            raise ValueError(f"Parametres inconnus : {', '.join(sorted(inconnues))}")
+        return replace(base, **donnees) if base is not None else cls(**donnees)
+
+    @classmethod
+    def charger(cls, chemin: str) -> "ParametresDrone":
+        """Lit un fichier .toml ou .json de parametres ; les parametres absents gardent la valeur des constantes."""
+        return cls.depuis_dict(lire_toml_ou_json(chemin))
+
+    def remplacer(self, **surcharges: Any) -> "ParametresDrone":
+        """Copie modifiee (grandeurs derivees recalculees) ; l'instance d'origine est inchangee."""
+        return self.depuis_dict(surcharges, base=self)
+
+    def declinaisons(self, surcharges: Sequence[Optional[Dict[str, Any]]]) -> List["ParametresDrone"]:
+        """Une instance par drone : self partage, sauf pour les drones qui ont des surcharges."""
+        return [self.remplacer(**s) if s else self for s in surcharges]
+
+    def vers_dict(self) -> Dict[str, Any]:
+        """Parametres de base, serialisables en JSON."""
+        donnees = {}
+        for nom in self.noms():
+            valeur = getattr(self, nom)
+            donnees[nom] = list(valeur) if isinstance(valeur, tuple) else valeur
+        return donnees
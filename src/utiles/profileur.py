@@ -0,0 +1,133 @@
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+import numpy as np
+
+from utiles.constantes import specifications_profileur as spec_prof
+
+
+class HistogrammeGlissant:
+    """Durees (ns) des `capacite` derniers passages dans une etape, dans un tableau pre-alloue.
+
+    ajouter() n'ecrit qu'une case ; quantiles et histogramme ne sont calcules qu'a la lecture.
+    """
+    def __init__(self, capacite: int = spec_prof["CAPACITE"]) -> None:
+        self.capacite: int = int(capacite)
+        self._durees: np.ndarray = np.zeros(self.capacite, dtype=np.int64)
+        self._indice: int = 0     # prochaine case ecrite
+        self.nb_ajouts: int = 0   # total depuis la creation, durees ecrasees comprises
+
+    def ajouter(self, duree_ns: int) -> None:
+        self._durees[self._indice] = duree_ns
+        self._indice += 1
+        if self._indice == self.capacite:
+            self._indice = 0
+        self.nb_ajouts += 1
+
+    def __len__(self) -> int:
+        return min(self.nb_ajouts, self.capacite)
+
+    def vider(self) -> None:
+        self._indice = 0
+        self.nb_ajouts = 0
+
+    def durees(self) -> np.ndarray:
+        """Copie des durees presentes (ns), sans ordre."""
+        return self._durees[:len(self)].copy()
+
+    def quantiles(self, q: List[float]) -> List[float]:
+        """Quantiles (en %) des durees presentes, en ns ; nan si l'etape n'a pas encore ete mesuree."""
+        if not len(self):
+            return [float("nan")] * len(q)
+        return np.percentile(self.durees(), q).tolist()
+
+    def histogramme(self, bornes_ns: np.ndarray) -> List[int]:
+        """Effectifs par classe [bornes[k], bornes[k+1]) ; les durees hors bornes vont dans la premiere ou la derniere classe."""
+        durees = np.clip(self.durees(), bornes_ns[0], bornes_ns[-1] - 1)
+        return np.histogram(durees, bins=bornes_ns)[0].tolist()
+
+
+class Profileur:
+    """Histogrammes glissants par etape, et frequences obtenues a partir de compteurs.
+
+    Les durees se mesurent avec time.perf_counter_ns() autour de chaque etape, puis
+    ajouter(etape, duree). Le code instrumente ne teste qu'une fois, hors de la boucle,
+    si un profileur est attache : sans profileur, il ne coute rien.
+    Les etapes peuvent etre mesurees depuis plusieurs fils (une etape par fil).
+    Une etape est creee a sa premiere mesure : les lectures parcourent une copie
+    de `etapes` (list(), atomique sous le GIL), jamais le dictionnaire lui-meme.
+    """
+    def __init__(self, capacite: int = spec_prof["CAPACITE"]) -> None:
+        self.capacite: int = int(capacite)
+        self.etapes: Dict[str, HistogrammeGlissant] = {}
+        self._compteurs_precedents: Optional[Dict[str, int]] = None
+        self._t_precedent: float = 0.0
+        self.frequences: Dict[str, float] = {}   # Hz, calculees par mesurer_frequences()
+
+    def histogramme(self, etape: str) -> HistogrammeGlissant:
+        """Histogramme de `etape`, cree au premier appel."""
+        histogramme = self.etapes.get(etape)
+        if histogramme is None:
+            histogramme = self.etapes[etape] = HistogrammeGlissant(self.capacite)
+        return histogramme
+
+    def ajouter(self, etape: str, duree_ns: int) -> None:
+        self.histogramme(etape).ajouter(duree_ns)
+
+    def vider(self) -> None:
+        for histogramme in list(self.etapes.values()):
+            histogramme.vider()
+        self._compteurs_precedents = None
+        self.frequences = {}
+
+    def mesurer_frequences(self, compteurs: Dict[str, int]) -> Dict[str, float]:
+        """Frequences (Hz) de chaque compteur depuis l'appel precedent ; vide au premier appel.
+
+        Un compteur qui recule (reinitialisation) repart de sa nouvelle valeur.
+        """
+        maintenant = time.perf_counter()
+        if self._compteurs_precedents is not None and maintenant > self._t_precedent:
+            ecoule = maintenant - self._t_precedent
+            self.frequences = {
+                nom: max(0, valeur - self._compteurs_precedents.get(nom, 0)) / ecoule
+                for nom, valeur in compteurs.items()
+            }
+        self._compteurs_precedents = dict(compteurs)
+        self._t_precedent = maintenant
+        return self.frequences
+
+    def resume(self) -> Dict[str, Dict[str, float]]:
+        """p50, p99 et maximum (us) et nombre de mesures presentes, par etape."""
+        resume = {}
+        for etape, histogramme in list(self.etapes.items()):
+            p50, p99, maximum = histogramme.quantiles([50.0, 99.0, 100.0])
+            resume[etape] = {"p50_us": p50 / 1e3, "p99_us": p99 / 1e3, "max_us": maximum / 1e3, "nb": len(histogramme)}
+        return resume
+
+    def exporter(self, chemin: str) -> str:
+        """Ecrit quantiles, frequences et histogrammes (classes logarithmiques, en ns) dans un fichier JSON."""
+        bornes = np.unique(np.geomspace(*spec_prof["BORNES_HISTOGRAMME_NS"], spec_prof["NB_CLASSES"] + 1).astype(np.int64))
+        donnees: Dict[str, Any] = {
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "capacite": self.capacite,
+            "frequences_hz": self.frequences,
+            "bornes_ns": bornes.tolist(),
+            "etapes": {
+                etape: {**resume, "effectifs": self.etapes[etape].histogramme(bornes)}
+                for etape, resume in self.resume().items()
+            },
+        }
+        os.makedirs(os.path.dirname(chemin) or ".", exist_ok=True)
+        with open(chemin, "w", encoding="utf-8") as f:
+            json.dump(donnees, f, indent=2)
+        return chemin
+
+    def formater(self) -> str:
+        """Tableau texte des etapes (p50 / p99 en us) suivi des frequences, pour la console ou l'interface."""
+        lignes = [f"{'etape':<16}{'p50 us':>9}{'p99 us':>9}"]
+        for etape, mesures in self.resume().items():
+            lignes.append(f"{etape:<16}{mesures['p50_us']:>9.1f}{mesures['p99_us']:>9.1f}")
+        for nom, frequence in self.frequences.items():
+            lignes.append(f"{nom:<16}{frequence:>12.0f} Hz")
+        return "\n".join(lignes)
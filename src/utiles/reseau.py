@@ -0,0 +1,271 @@
+import argparse
+import asyncio
+import math
+import socket
+import struct
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from utiles.constantes import specifications_reseau as spec_res
+
+
+# Paquet d'etat : signature, numero, t, position (3), orientation (3),
+# vitesses commandees (4), vitesses reelles (4), P, I, D, consigne z, crash
+SIGNATURE_ETAT = b"DRET"
+PAQUET_ETAT = struct.Struct("<4sId3d3d4d4d3ddB")
+
+# Paquets de commande : signature, code, puis arguments selon le code
+SIGNATURE_COMMANDE = b"DRCM"
+ENTETE_COMMANDE = struct.Struct("<4sB")
+CONSIGNE, PID_ACTIF, MOTEUR = 1, 2, 3
+ARGUMENTS_COMMANDE = {
+    CONSIGNE: struct.Struct("<3d"),   # x, y, z (m)
+    PID_ACTIF: struct.Struct("<B"),   # 0 ou 1
+    MOTEUR: struct.Struct("<Bd"),     # indice, vitesse (rad/s)
+}
+
+
+def coder_etat(instantane) -> bytes:
+    """Paquet d'etat d'un Instantane."""
+    return PAQUET_ETAT.pack(
+        SIGNATURE_ETAT,
+        instantane.numero & 0xFFFFFFFF,
+        instantane.t,
+        *instantane.position_xyz,
+        *instantane.orientation_rpy,
+        *instantane.vitesses_helices,
+        *instantane.vitesses_helices_reelles,
+        *instantane.termes_pid,
+        instantane.consigne,
+        instantane.crash
+    )
+
+
+def decoder_etat(paquet: bytes) -> Dict[str, Any]:
+    """Dict des champs d'un paquet d'etat ; ValueError si le paquet est invalide."""
+    if len(paquet) != PAQUET_ETAT.size:
+        raise ValueError("Taille de paquet d'etat invalide.")
+    v = PAQUET_ETAT.unpack(paquet)
+    if v[0] != SIGNATURE_ETAT:
+        raise ValueError("Signature de paquet d'etat invalide.")
+    return {
+        "numero": v[1],
+        "t": v[2],
+        "position_xyz": v[3:6],
+        "orientation_rpy": v[6:9],
+        "vitesses_helices": v[9:13],
+        "vitesses_helices_reelles": v[13:17],
+        "termes_pid": v[17:20],
+        "consigne": v[20],
+        "crash": bool(v[21]),
+    }
+
+
+def coder_commande(code: int, *arguments) -> bytes:
+    """Paquet de commande : CONSIGNE (x, y, z), PID_ACTIF (actif) ou MOTEUR (indice, vitesse)."""
+    return ENTETE_COMMANDE.pack(SIGNATURE_COMMANDE, code) + ARGUMENTS_COMMANDE[code].pack(*arguments)
+
+
+def decoder_commande(paquet: bytes) -> tuple:
+    """(code, arguments) d'un paquet de commande ; ValueError si le paquet est invalide ou une valeur non finie."""
+    if len(paquet) < ENTETE_COMMANDE.size:
+        raise ValueError("Paquet de commande trop court.")
+    signature, code = ENTETE_COMMANDE.unpack_from(paquet)
+    if signature != SIGNATURE_COMMANDE or code not in ARGUMENTS_COMMANDE:
+        raise ValueError("Paquet de commande invalide.")
+    format_arguments = ARGUMENTS_COMMANDE[code]
+    if len(paquet) != ENTETE_COMMANDE.size + format_arguments.size:
+        raise ValueError("Taille de paquet de commande invalide.")
+    arguments = format_arguments.unpack_from(paquet, ENTETE_COMMANDE.size)
+    if not all(math.isfinite(valeur) for valeur in arguments):
+        raise ValueError("Valeur non finie dans un paquet de commande.")
+    return code, arguments
+
+
+class _ProtocoleCommandes(asyncio.DatagramProtocol):
+    """Recoit les paquets de commande et les transmet a l'InterfaceReseau."""
+
+    def __init__(self, interface: "InterfaceReseau") -> None:
+        self.interface = interface
+
+    def datagram_received(self, paquet: bytes, adresse) -> None:
+        self.interface.traiter_commande(paquet)
+
+
+class InterfaceReseau:
+    """Publie l'etat du simulateur en UDP et recoit ses commandes, sur une boucle asyncio dediee.
+
+    `simulateur` fournit `instantane` (dernier Instantane publie), `fixer_consigne`,
+    `pid_actif` et `fixer_vitesse_helice` : un Simulateur, dont les commandes sont
+    mises en file pour le fil de simulation. La boucle tourne sur son propre fil
+    et n'envoie qu'en mode non bloquant : la simulation n'attend jamais le reseau.
+    """
+
+    def __init__(
+        self,
+        simulateur: Any,
+        hote: str = spec_res["HOTE"],
+        port_telemetrie: int = spec_res["PORT_TELEMETRIE"],
+        port_commandes: int = spec_res["PORT_COMMANDES"],
+        frequence: float = spec_res["FREQUENCE_TELEMETRIE"]
+    ) -> None:
+        """Configure l'interface ; rien n'est ouvert avant demarrer()."""
+        self.simulateur = simulateur
+        self.hote: str = hote
+        self.port_telemetrie: int = int(port_telemetrie)
+        self.port_commandes: int = int(port_commandes)
+        self.periode: float = 1.0 / frequence
+
+        self.nb_paquets_envoyes: int = 0
+        self.nb_commandes: int = 0
+        self.nb_paquets_invalides: int = 0
+        self.erreur: Optional[BaseException] = None
+
+        self._boucle: Optional[asyncio.AbstractEventLoop] = None
+        self._arret: Optional[asyncio.Event] = None
+        self._pret = threading.Event()
+        self._fil = threading.Thread(target=self._executer, name="InterfaceReseau", daemon=True)
+
+    def demarrer(self) -> None:
+        """Demarre le fil reseau et attend que les sockets soient ouvertes (OSError si un port est pris)."""
+        self._fil.start()
+        self._pret.wait()
+        if self.erreur is not None:
+            raise self.erreur
+
+    def arreter(self, delai: float = 1.0) -> None:
+        """Ferme les sockets et arrete le fil reseau."""
+        if self._boucle is not None and self._fil.is_alive():
+            self._boucle.call_soon_threadsafe(self._arret.set)
+            self._fil.join(delai)
+
+    def traiter_commande(self, paquet: bytes) -> None:
+        """Applique un paquet de commande au simulateur ; les paquets invalides sont comptes et ignores."""
+        try:
+            code, arguments = decoder_commande(paquet)
+        except ValueError:
+            self.nb_paquets_invalides += 1
+            return
+
+        if code == CONSIGNE:
+            self.simulateur.fixer_consigne(list(arguments))
+        elif code == PID_ACTIF:
+            self.simulateur.pid_actif = bool(arguments[0])
+        elif code == MOTEUR:
+            indice, vitesse = arguments
+            if not 0 <= indice < 4:
+                self.nb_paquets_invalides += 1
+                return
+            self.simulateur.fixer_vitesse_helice(indice, vitesse)
+        self.nb_commandes += 1
+
+    def _executer(self) -> None:
+        asyncio.run(self._principal())
+
+    async def _principal(self) -> None:
+        self._boucle = asyncio.get_running_loop()
+        self._arret = asyncio.Event()
+        commandes = None
+        try:
+            commandes, _ = await self._boucle.create_datagram_endpoint(
+                lambda: _ProtocoleCommandes(self), local_addr=(self.hote, self.port_commandes)
+            )
+            telemetrie, _ = await self._boucle.create_datagram_endpoint(
+                asyncio.DatagramProtocol, remote_addr=(self.hote, self.port_telemetrie)
+            )
+        except OSError as err:
+            self.erreur = err
+            if commandes is not None:
+                commandes.close()
+            return
+        finally:
+            self._pret.set()
+
+        dernier = -1
+        try:
+            while not self._arret.is_set():
+                instantane = self.simulateur.instantane
+                if instantane.numero != dernier:
+                    dernier = instantane.numero
+                    telemetrie.sendto(coder_etat(instantane))
+                    self.nb_paquets_envoyes += 1
+                try:
+                    await asyncio.wait_for(self._arret.wait(), self.periode)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            commandes.close()
+            telemetrie.close()
+
+
+class ClientReseau:
+    """Client de test en boucle locale : recoit les paquets d'etat et envoie des commandes."""
+
+    def __init__(
+        self,
+        hote: str = spec_res["HOTE"],
+        port_telemetrie: int = spec_res["PORT_TELEMETRIE"],
+        port_commandes: int = spec_res["PORT_COMMANDES"]
+    ) -> None:
+        """Ecoute sur port_telemetrie ; les commandes partent vers port_commandes."""
+        self.adresse_commandes = (hote, int(port_commandes))
+        self.reception = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.reception.bind((hote, int(port_telemetrie)))
+        self.envoi = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def recevoir(self, delai: float = 1.0) -> Optional[Dict[str, Any]]:
+        """Prochain paquet d'etat decode, ou None apres `delai` secondes."""
+        self.reception.settimeout(delai)
+        try:
+            paquet, _ = self.reception.recvfrom(PAQUET_ETAT.size)
+        except socket.timeout:
+            return None
+        return decoder_etat(paquet)
+
+    def envoyer_consigne(self, x: float, y: float, z: float) -> None:
+        self.envoi.sendto(coder_commande(CONSIGNE, x, y, z), self.adresse_commandes)
+
+    def envoyer_pid(self, actif: bool) -> None:
+        self.envoi.sendto(coder_commande(PID_ACTIF, int(bool(actif))), self.adresse_commandes)
+
+    def envoyer_moteur(self, indice: int, vitesse: float) -> None:
+        self.envoi.sendto(coder_commande(MOTEUR, indice, vitesse), self.adresse_commandes)
+
+    def fermer(self) -> None:
+        self.reception.close()
+        self.envoi.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Client UDP de test : affiche l'etat publie et envoie des commandes")
+    parser.add_argument("--duree", type=float, default=5.0, help="duree d'ecoute (s)")
+    parser.add_argument("--consigne", type=float, nargs=3, metavar=("X", "Y", "Z"), help="envoie une consigne de position")
+    parser.add_argument("--pid", choices=("on", "off"), help="active ou coupe le PID")
+    parser.add_argument("--moteur", nargs=2, metavar=("INDICE", "VITESSE"), help="force la vitesse d'un moteur")
+    args = parser.parse_args()
+
+    client = ClientReseau()
+    if args.consigne is not None:
+        client.envoyer_consigne(*args.consigne)
+    if args.pid is not None:
+        client.envoyer_pid(args.pid == "on")
+    if args.moteur is not None:
+        client.envoyer_moteur(int(args.moteur[0]), float(args.moteur[1]))
+
+    fin = time.monotonic() + args.duree
+    nb = 0
+    while time.monotonic() < fin:
+        etat = client.recevoir(max(0.0, fin - time.monotonic()))
+        if etat is None:
+            break
+        nb += 1
+        x, y, z = etat["position_xyz"]
+        print(f"t = {etat['t']:7.3f} s  x = {x:6.3f}  y = {y:6.3f}  z = {z:6.3f}  consigne z = {etat['consigne']:.2f}")
+    client.fermer()
+    print(f"{nb} paquets recus")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,6 +1,37 @@
 import numpy as np
 import math
-from typing import Tuple
+from typing import Optional, Tuple
+
+
+def produits_vectoriels_gyroscopiques(
+    omega: np.ndarray,
+    inerties: np.ndarray,
+    out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Version vectorisee du terme gyroscopique omega x (I * omega), pour N drones.
+
+    omega : vitesses angulaires, de forme (N, 3) (ou (3,))
+    inerties : (Ix, Iy, Iz) communs, ou de forme (N, 3)
+    out : tampon de sortie de meme forme que omega, optionnel
+
+    Avec I diagonale : omega x (I omega) = ((Iz - Iy) wy wz, (Ix - Iz) wz wx, (Iy - Ix) wx wy).
+    """
+    omega = np.asarray(omega, dtype=float)
+    inerties = np.asarray(inerties, dtype=float)
+    if out is None:
+        out = np.empty(np.broadcast_shapes(omega.shape, inerties.shape))
+
+    wx, wy, wz = omega[..., 0], omega[..., 1], omega[..., 2]
+    Ix, Iy, Iz = inerties[..., 0], inerties[..., 1], inerties[..., 2]
+
+    np.multiply(wy, wz, out=out[..., 0])
+    out[..., 0] *= Iz - Iy
+    np.multiply(wz, wx, out=out[..., 1])
+    out[..., 1] *= Ix - Iz
+    np.multiply(wx, wy, out=out[..., 2])
+    out[..., 2] *= Iy - Ix
+    return out
 
 
 def produit_vectoriel_gyroscopique(
@@ -13,15 +44,41 @@ def produit_vectoriel_gyroscopique(
     omega : vitesse angulaire (wx, wy, wz)
     inerties : (Ix, Iy, Iz)
     """
-    Ix, Iy, Iz = inerties
+    return produits_vectoriels_gyroscopiques(omega, inerties)
+
 
-    # I * omega
-    Iomega = np.array([Ix * omega[0],
-                       Iy * omega[1],
-                       Iz * omega[2]])
+def matrices_rotation(angles: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Version vectorisee de matrice_rotation, pour N jeux d'angles d'Euler.
 
-    # Produit vectoriel
-    return np.cross(omega, Iomega)
+    angles : (roll, pitch, yaw) de forme (N, 3) (ou (3,))
+    out : tampon de sortie de forme (N, 3, 3) (ou (3, 3)), optionnel
+
+    Les produits R = Rz(yaw) * Ry(pitch) * Rx(roll) sont developpes terme a terme :
+    un seul appel a cos et un seul a sin pour tous les angles.
+    """
+    angles = np.asarray(angles, dtype=float)
+    if out is None:
+        out = np.empty(angles.shape[:-1] + (3, 3))
+
+    c = np.cos(angles)
+    s = np.sin(angles)
+    cr, cp, cy = c[..., 0], c[..., 1], c[..., 2]
+    sr, sp, sy = s[..., 0], s[..., 1], s[..., 2]
+
+    cy_sp = cy * sp
+    sy_sp = sy * sp
+
+    out[..., 0, 0] = cy * cp
+    out[..., 0, 1] = cy_sp * sr - sy * cr
+    out[..., 0, 2] = cy_sp * cr + sy * sr
+    out[..., 1, 0] = sy * cp
+    out[..., 1, 1] = sy_sp * sr + cy * cr
+    out[..., 1, 2] = sy_sp * cr - cy * sr
+    out[..., 2, 0] = -sp
+    out[..., 2, 1] = cp * sr
+    out[..., 2, 2] = cp * cr
+    return out
 
 
 def matrice_rotation(angles: np.ndarray) -> np.ndarray:
@@ -36,31 +93,69 @@ def matrice_rotation(angles: np.ndarray) -> np.ndarray:
 
     Cette matrice permet de convertir un vecteur exprime dans le repere drone vers le repere monde.
     """
+    return matrices_rotation(angles)
+
+
+def quaternion_depuis_euler(angles: np.ndarray) -> np.ndarray:
+    """
+    Retourne le quaternion unitaire (w, x, y, z) equivalent aux angles d'Euler
+    (roll, pitch, yaw), pour la meme composition R = Rz(yaw) * Ry(pitch) * Rx(roll).
+    """
     roll, pitch, yaw = angles
 
-    cr = math.cos(roll)
-    sr = math.sin(roll)
-    cp = math.cos(pitch)
-    sp = math.sin(pitch)
-    cy = math.cos(yaw)
-    sy = math.sin(yaw)
-
-    Rz = np.array([
-        [cy, -sy, 0.0],
-        [sy,  cy, 0.0],
-        [0.0, 0.0, 1.0]
-    ])
+    cr, sr = math.cos(0.5 * roll), math.sin(0.5 * roll)
+    cp, sp = math.cos(0.5 * pitch), math.sin(0.5 * pitch)
+    cy, sy = math.cos(0.5 * yaw), math.sin(0.5 * yaw)
 
-    Ry = np.array([
-        [cp, 0.0, sp],
-        [0.0, 1.0, 0.0],
-        [-sp, 0.0, cp]
+    return np.array([
+        cr * cp * cy + sr * sp * sy,
+        sr * cp * cy - cr * sp * sy,
+        cr * sp * cy + sr * cp * sy,
+        cr * cp * sy - sr * sp * cy
     ])
 
-    Rx = np.array([
-        [1.0, 0.0, 0.0],
-        [0.0, cr, -sr],
-        [0.0, sr,  cr]
+
+def euler_depuis_quaternion(q: np.ndarray) -> np.ndarray:
+    """
+    Retourne les angles d'Euler (roll, pitch, yaw) d'un quaternion unitaire (w, x, y, z).
+
+    Le yaw est ramene dans ]-pi, pi], le pitch dans [-pi/2, pi/2].
+    """
+    w, x, y, z = q
+
+    roll = math.atan2(2.0 * (w * x + y * z), 1.0 - 2.0 * (x * x + y * y))
+    pitch = math.asin(max(-1.0, min(1.0, 2.0 * (w * y - z * x))))
+    yaw = math.atan2(2.0 * (w * z + x * y), 1.0 - 2.0 * (y * y + z * z))
+
+    return np.array([roll, pitch, yaw])
+
+
+def produit_quaternion(q: np.ndarray, r: np.ndarray) -> np.ndarray:
+    """Retourne le produit de Hamilton q * r, quaternions (w, x, y, z)."""
+    w1, x1, y1, z1 = q
+    w2, x2, y2, z2 = r
+
+    return np.array([
+        w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2,
+        w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2,
+        w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2,
+        w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2
     ])
 
-    return Rz @ Ry @ Rx
+
+def matrice_rotation_quaternion(q: np.ndarray) -> np.ndarray:
+    """
+    Genere la matrice de rotation 3x3 (repere drone -> repere monde) d'un quaternion
+    unitaire (w, x, y, z), sous forme fermee : aucun appel trigonometrique.
+    """
+    w, x, y, z = q
+
+    xx, yy, zz = x * x, y * y, z * z
+    xy, xz, yz = x * y, x * z, y * z
+    wx, wy, wz = w * x, w * y, w * z
+
+    return np.array([
+        [1.0 - 2.0 * (yy + zz), 2.0 * (xy - wz),       2.0 * (xz + wy)],
+        [2.0 * (xy + wz),       1.0 - 2.0 * (xx + zz), 2.0 * (yz - wx)],
+        [2.0 * (xz - wy),       2.0 * (yz + wx),       1.0 - 2.0 * (xx + yy)]
+    ])
\ No newline at end of file